@@ -12,6 +12,7 @@ import numpy as np
 
 from src.equine_webapp.graphql.query_resolvers import resolve_get_protonet_support_embeddings, resolve_dimensionality_reduction
 from src.equine_webapp.graphql.mutation_resolvers import resolve_run_inference
+from src.equine_webapp.run_results import SAMPLE_CONDITIONS, get_sample_conditions
 
 # limit the number of samples we get per condition to avoid skewing our metrics too much
 NUM_SAMPLES_PER_CONDITION=10
@@ -37,15 +38,16 @@ def get_metrics_for_method(samples, uq_viz_data, method, outlier_tolerance, clas
         "confused_class": [],
     }
 
-    for sample in samples: # loop through all the samples
-        # determine which condition this sample falls under
-        condition = "" # refers to whether the sample is in the OOD, confident, or class confusion use case
-        if sample["ood"] > outlier_tolerance: # if this is an OOD sample
-            condition = "ood"
-        elif any(l["confidence"]>class_confidence_threshold for l in sample["labels"]): # if this is a confident sample
-            condition = "confident"
-        else: # else the model is confused about which class
-            condition = "confused_class"
+    # determine which condition each sample falls under, ie whether the sample is in the OOD, confident, or class confusion use case
+    conditions = get_sample_conditions(
+        np.array([sample["ood"] for sample in samples]),
+        np.array([[l["confidence"] for l in sample["labels"]] for sample in samples]),
+        outlier_tolerance,
+        class_confidence_threshold,
+    )
+
+    for sample, condition_idx in zip(samples, conditions): # loop through all the samples
+        condition = SAMPLE_CONDITIONS[condition_idx]
 
         # if we have too many samples in this condition, skip this sample
         if len(metrics_dict[condition]) >= NUM_SAMPLES_PER_CONDITION:
@@ -1,7 +1,36 @@
+import argparse
+
 from waitress import serve
 from equine_webapp.flask_server import app
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.warm_up import start_warm_up_thread
+from equine_webapp.model_catalog import start_model_catalog_watcher
+from equine_webapp.server_profile import apply_server_profile, resolve_server_profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the EQUINE webapp. Unset thread counts are balanced against the number of cores")
+    parser.add_argument("--port", type=int, default=SERVER_CONFIG.PORT)
+    parser.add_argument("--threads", type=int, dest="server_threads", help="waitress threads (SERVER_THREADS)")
+    parser.add_argument("--torch-threads", type=int, help="torch intra-op threads (TORCH_NUM_THREADS)")
+    parser.add_argument("--torch-interop-threads", type=int, help="torch inter-op threads (TORCH_NUM_INTEROP_THREADS)")
+    parser.add_argument("--dr-jobs", type=int, dest="dr_n_jobs", help="cores that one large UMAP fit runs on (UMAP_N_JOBS)")
+    parser.add_argument("--inference-max-concurrent", type=int, help="inference computations that run at once (INFERENCE_MAX_CONCURRENT)")
+    parser.add_argument("--calibrate", action="store_true", default=SERVER_CONFIG.SERVER_PROFILE_CALIBRATE,
+                        help="measure a model's throughput at startup to pick the torch threads (SERVER_PROFILE_CALIBRATE)")
+    parser.add_argument("--calibration-model", default=SERVER_CONFIG.SERVER_PROFILE_CALIBRATION_MODEL,
+                        help="the model to calibrate on, by default the first model (SERVER_PROFILE_CALIBRATION_MODEL)")
+    args = parser.parse_args(argv)
 
+    profile = resolve_server_profile(
+        {field: getattr(args, field) for field in ["server_threads", "torch_threads", "torch_interop_threads", "dr_n_jobs", "inference_max_concurrent"]},
+        calibrate=args.calibrate,
+        calibration_model=args.calibration_model,
+    )
+    apply_server_profile(profile)
 
-def main():
-    print("Starting equine_webapp server on localhost:8080")
-    serve(app, host='0.0.0.0', port=8080)
+    print(f"Starting equine_webapp server on localhost:{args.port}")
+    if SERVER_CONFIG.WARM_UP or SERVER_CONFIG.UMAP_WARM_UP:
+        start_warm_up_thread()
+    start_model_catalog_watcher()
+    serve(app, host='0.0.0.0', port=args.port, threads=profile["server_threads"])
@@ -0,0 +1,155 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from equine_webapp.utils import SERVER_CONFIG
+
+OPERATION_CLASSES = ["inference", "dr", "training"]
+
+# the weight of the latest hold time in each limiter's moving average, which estimates Retry-After
+HOLD_TIME_SMOOTHING = 0.2
+MAX_RETRY_AFTER_SECONDS = 60
+
+
+class AdmissionRejected(Exception):
+    """The server is saturated. The client should retry the request after retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Lets at most max_concurrent callers hold a slot at once (0 for no limit).
+    Other callers wait in a queue of at most max_queued callers, for at most queue_timeout seconds,
+    and are rejected with AdmissionRejected when the queue is full or their wait times out.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queued: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._num_active = 0
+        self._num_queued = 0
+        self._average_hold_seconds = None
+
+    def get_retry_after(self) -> int:
+        """Estimate the seconds until a slot frees up for a new caller, from how long slots have been held"""
+        if self._average_hold_seconds is None:
+            return 1
+        seconds = self._average_hold_seconds * (self._num_queued + 1) / self.max_concurrent
+        return min(max(math.ceil(seconds), 1), MAX_RETRY_AFTER_SECONDS)
+
+    def _reject(self, reason: str):
+        raise AdmissionRejected(f"Too many {self.name} requests: {reason}", self.get_retry_after())
+
+    @contextlib.contextmanager
+    def acquire(self):
+        if self.max_concurrent <= 0:
+            yield
+            return
+
+        with self._condition:
+            if self._num_active >= self.max_concurrent:
+                if self._num_queued >= self.max_queued:
+                    self._reject(f"{self._num_active} running and {self._num_queued} waiting")
+                self._num_queued += 1
+                try:
+                    deadline = time.monotonic() + self.queue_timeout
+                    while self._num_active >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._reject(f"waited {self.queue_timeout:g}s for one of {self.max_concurrent} slots")
+                        self._condition.wait(remaining)
+                finally:
+                    self._num_queued -= 1
+            self._num_active += 1
+
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            hold_seconds = time.monotonic() - start_time
+            with self._condition:
+                self._num_active -= 1
+                self._average_hold_seconds = hold_seconds if self._average_hold_seconds is None else \
+                    HOLD_TIME_SMOOTHING*hold_seconds + (1 - HOLD_TIME_SMOOTHING)*self._average_hold_seconds
+                self._condition.notify()
+
+
+class AdmissionControl:
+    """
+    Limits how many computations of each operation class, and on each model, run at once,
+    so that a burst of requests queues (or is turned away) instead of oversubscribing the CPU
+    """
+
+    def __init__(
+        self,
+        operation_limits: Dict[str, int],
+        model_max_concurrent: int,
+        model_limits: Dict[str, int],
+        max_queued: int,
+        queue_timeout: float,
+    ):
+        self._max_queued = max_queued
+        self._queue_timeout = queue_timeout
+        self._operation_limiters = {
+            operation: ConcurrencyLimiter(operation, max_concurrent, max_queued, queue_timeout)
+            for operation, max_concurrent in operation_limits.items()
+        }
+        self._model_max_concurrent = model_max_concurrent
+        self._model_limits = model_limits
+        self._model_limiters: Dict[str, ConcurrencyLimiter] = {}
+        self._model_limiters_lock = threading.Lock()
+
+    def set_operation_limit(self, operation: str, max_concurrent: int):
+        """Change an operation class's limit, ex to the server profile's. Callers that the new limit admits stop waiting"""
+        limiter = self._operation_limiters[operation]
+        with limiter._condition:
+            limiter.max_concurrent = max_concurrent
+            limiter._condition.notify_all()
+
+    def _get_model_limiter(self, model_path: str) -> ConcurrencyLimiter:
+        model_file = os.path.basename(model_path)
+        with self._model_limiters_lock:
+            if model_file not in self._model_limiters:
+                max_concurrent = self._model_limits.get(model_file, self._model_max_concurrent)
+                self._model_limiters[model_file] = ConcurrencyLimiter(model_file, max_concurrent, self._max_queued, self._queue_timeout)
+            return self._model_limiters[model_file]
+
+    @contextlib.contextmanager
+    def limit(self, operation: str, model_path: Optional[str] = None):
+        """
+        Hold a slot of the operation class, and of the model if one is given, while running a computation.
+        Don't nest these: a computation that waits for a second slot while holding one can deadlock.
+        """
+        if operation not in self._operation_limiters:
+            raise ValueError(f"Unknown operation class '{operation}'. The operation classes are {OPERATION_CLASSES}")
+        # wait for the model first, so that requests queued on a busy model don't hold slots that other models could use
+        with contextlib.ExitStack() as stack:
+            if model_path is not None:
+                stack.enter_context(self._get_model_limiter(model_path).acquire())
+            stack.enter_context(self._operation_limiters[operation].acquire())
+            yield
+
+
+admission_control = AdmissionControl(
+    {
+        "inference": SERVER_CONFIG.INFERENCE_MAX_CONCURRENT,
+        "dr": SERVER_CONFIG.DR_MAX_CONCURRENT,
+        "training": SERVER_CONFIG.TRAINING_MAX_CONCURRENT,
+    },
+    SERVER_CONFIG.MODEL_MAX_CONCURRENT,
+    SERVER_CONFIG.MODEL_CONCURRENCY_LIMITS,
+    SERVER_CONFIG.ADMISSION_MAX_QUEUED,
+    SERVER_CONFIG.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
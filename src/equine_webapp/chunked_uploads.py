@@ -0,0 +1,182 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+from equine_webapp.content_store import UPLOAD_CHUNK_BYTES, content_store, hash_file
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_metadata import write_model_metadata
+from equine_webapp.utils import SERVER_CONFIG
+
+UPLOAD_KINDS = ["file", "model"]
+
+
+class UploadError(Exception):
+    """A chunked upload request that can't be applied, with the HTTP status code to respond with"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ChunkedUploads:
+    """
+    Resumable uploads: a client initiates an upload, PUTs its chunks at byte offsets, and finalizes it.
+    Each chunk is written straight into a part file in the content store, which becomes the stored object
+    when the upload is finalized, so the data is written to disk once.
+    The state of each upload is saved next to it, so an upload can be resumed after the server restarts.
+    """
+
+    def __init__(self, sessions_folder: str):
+        self._sessions_folder = sessions_folder
+        self._locks_lock = threading.Lock()
+        self._locks = {}
+        # the running SHA-256 of each upload whose chunks have arrived in order
+        self._hashers = {}
+        Path(sessions_folder).mkdir(parents=True, exist_ok=True)
+
+    def _get_lock(self, upload_id: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def _get_session_path(self, upload_id: str) -> str:
+        return os.path.join(self._sessions_folder, f"{upload_id}.json")
+
+    def _get_part_path(self, upload_id: str) -> str:
+        return os.path.join(SERVER_CONFIG.CONTENT_STORE_PATH, f"{upload_id}.part")
+
+    def _read_session(self, upload_id: str) -> dict:
+        try:
+            uuid.UUID(upload_id)
+            with open(self._get_session_path(upload_id)) as f:
+                return json.load(f)
+        except (ValueError, FileNotFoundError):
+            raise UploadError(f"Upload '{upload_id}' not found", 404)
+
+    def _write_session(self, session: dict):
+        session_path = self._get_session_path(session["upload_id"])
+        with open(session_path + ".tmp", "w") as f:
+            json.dump(session, f)
+        os.replace(session_path + ".tmp", session_path)
+
+    def initiate(self, filename: str, size: int, kind: str = "file", sha256: str = None) -> dict:
+        """Start an upload of size bytes that will be saved as filename in the upload (kind "file") or model folder"""
+        if kind not in UPLOAD_KINDS:
+            raise UploadError(f"kind must be one of {UPLOAD_KINDS}")
+        if not filename or os.path.basename(filename) != filename:
+            raise UploadError(f"Invalid filename '{filename}'")
+        if size < 0:
+            raise UploadError("size must not be negative")
+
+        session = {
+            "upload_id": str(uuid.uuid4()),
+            "filename": filename,
+            "kind": kind,
+            "size": size,
+            "sha256": sha256.lower() if sha256 is not None else None,
+            "offset": 0, # every byte before this offset has been received
+        }
+        open(self._get_part_path(session["upload_id"]), "wb").close()
+        self._write_session(session)
+        self._hashers[session["upload_id"]] = (0, hashlib.sha256())
+        return session
+
+    def get_status(self, upload_id: str) -> dict:
+        return self._read_session(upload_id)
+
+    def write_chunk(self, upload_id: str, offset: int, stream, chunk_sha256: str = None) -> dict:
+        """
+        Write a chunk at offset, which must not leave a gap after the bytes received so far.
+        Re-sending a chunk that was already received (ex after a dropped connection) overwrites it.
+        When chunk_sha256 is given, a chunk that doesn't match it is rejected and not counted as received.
+        """
+        with self._get_lock(upload_id):
+            session = self._read_session(upload_id)
+            if offset < 0 or offset > session["offset"]:
+                raise UploadError(f"Chunk offset {offset} is not between 0 and the {session['offset']} bytes received so far", 409)
+
+            # the running hash of the whole upload can be continued while the chunks arrive in order.
+            # a chunk that rewrites bytes that were already hashed means the upload has to be hashed again when it is finalized
+            hashed_bytes, hasher = self._hashers.pop(upload_id, (None, None))
+            if hashed_bytes != offset:
+                hasher = None
+
+            # new bytes are written straight into the part file, since nothing counts them until the chunk is accepted.
+            # a chunk that rewrites bytes that were already received is buffered and checked first, so that a bad chunk
+            # can't overwrite good bytes
+            rewrites_received_bytes = offset < session["offset"]
+            sha256 = hashlib.sha256()
+            num_bytes = 0
+            with open(self._get_part_path(upload_id), "r+b") as f:
+                buffer = content_store.new_temp_file() if rewrites_received_bytes else f
+                try:
+                    f.seek(offset)
+                    for data in iter(lambda: stream.read(UPLOAD_CHUNK_BYTES), b""):
+                        if offset + num_bytes + len(data) > session["size"]:
+                            raise UploadError(f"The chunk extends past the upload's size of {session['size']} bytes")
+                        buffer.write(data)
+                        sha256.update(data)
+                        if hasher is not None:
+                            hasher.update(data)
+                        num_bytes += len(data)
+                    if chunk_sha256 is not None and sha256.hexdigest() != chunk_sha256.lower():
+                        raise UploadError("The chunk's SHA-256 does not match", 422)
+                    if rewrites_received_bytes:
+                        buffer.seek(0)
+                        shutil.copyfileobj(buffer, f, UPLOAD_CHUNK_BYTES)
+                finally:
+                    if rewrites_received_bytes:
+                        buffer.close()
+                        os.remove(buffer.name)
+
+            if hasher is not None:
+                self._hashers[upload_id] = (offset + num_bytes, hasher)
+            session["offset"] = max(session["offset"], offset + num_bytes)
+            self._write_session(session)
+            return session
+
+    def finalize(self, upload_id: str) -> dict:
+        """Check the upload's size and SHA-256, then store it and link it into its folder"""
+        with self._get_lock(upload_id):
+            session = self._read_session(upload_id)
+            if session["offset"] != session["size"]:
+                raise UploadError(f"Only {session['offset']} of {session['size']} bytes have been received", 409)
+
+            part_path = self._get_part_path(upload_id)
+            hashed_bytes, hasher = self._hashers.pop(upload_id, (None, None))
+            sha256 = hasher.hexdigest() if hashed_bytes == session["size"] else hash_file(part_path)
+            if session["sha256"] is not None and sha256 != session["sha256"]:
+                self._remove(upload_id)
+                raise UploadError(f"The upload's SHA-256 {sha256} does not match the expected {session['sha256']}", 422)
+
+            folder = SERVER_CONFIG.MODEL_FOLDER_PATH if session["kind"] == "model" else SERVER_CONFIG.UPLOAD_FOLDER_PATH
+            alias_path = os.path.join(os.getcwd(), folder, session["filename"])
+            sha256, size, deduplicated = content_store.store_file(part_path, alias_path, sha256, session["size"])
+            if session["kind"] == "model" and alias_path.endswith(SERVER_CONFIG.MODEL_EXT):
+                write_model_metadata(alias_path)
+                model_catalog.upsert_model(alias_path)
+            os.remove(self._get_session_path(upload_id))
+
+        with self._locks_lock:
+            self._locks.pop(upload_id, None)
+        return {**session, "content_hash": sha256, "deduplicated": deduplicated}
+
+    def abort(self, upload_id: str):
+        with self._get_lock(upload_id):
+            self._read_session(upload_id)
+            self._remove(upload_id)
+
+    def _remove(self, upload_id: str):
+        self._hashers.pop(upload_id, None)
+        for path in [self._get_part_path(upload_id), self._get_session_path(upload_id)]:
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+chunked_uploads = ChunkedUploads(os.path.join(SERVER_CONFIG.OUTPUT_FOLDER, "upload_sessions"))
@@ -0,0 +1,182 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from equine_webapp.utils import SERVER_CONFIG
+
+CONTENT_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS aliases (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    inode INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS aliases_sha256 ON aliases (sha256);
+"""
+
+# uploads are read, hashed, and written this many bytes at a time
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+
+def hash_file(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ContentStore:
+    """
+    Uploads stored once per distinct content, by their SHA-256.
+    The files in the upload and model folders are hard links (aliases) to the stored objects, so the rest of the
+    server reads them by name as before, while uploading the same content again under any name writes nothing new.
+    The SHA-256 of an alias is a stable key for caches of anything derived from the file's content.
+    """
+
+    def __init__(self, db_path: str, store_folder: str):
+        self._db_path = db_path
+        self._store_folder = store_folder
+        self._write_lock = threading.Lock()
+        Path(store_folder).mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(CONTENT_STORE_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection for one transaction, which is committed on success"""
+        connection = sqlite3.connect(self._db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_object_path(self, sha256: str) -> str:
+        return os.path.join(self._store_folder, sha256[:2], sha256)
+
+    def new_temp_file(self):
+        """Open a temporary file in the store folder, which is on the same file system as the objects"""
+        return tempfile.NamedTemporaryFile(dir=self._store_folder, suffix=".tmp", delete=False)
+
+    def store_stream(self, stream, alias_path: str):
+        """
+        Write a stream to alias_path through the store, hashing it as it is written.
+        Returns the SHA-256, the size in bytes, and whether the content was already stored.
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        with self.new_temp_file() as f:
+            for chunk in iter(lambda: stream.read(UPLOAD_CHUNK_BYTES), b""):
+                sha256.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        return self.store_file(f.name, alias_path, sha256.hexdigest(), size)
+
+    def store_file(self, file_path: str, alias_path: str, sha256: Optional[str] = None, size: Optional[int] = None):
+        """
+        Move a complete file (in the store folder or on the same file system) into the store and alias it as alias_path.
+        The file is hashed unless its SHA-256 is given. Returns the SHA-256, the size, and whether the content was already stored.
+        """
+        sha256 = sha256 if sha256 is not None else hash_file(file_path)
+        size = size if size is not None else os.path.getsize(file_path)
+        object_path = self.get_object_path(sha256)
+
+        with self._write_lock:
+            deduplicated = os.path.isfile(object_path)
+            if deduplicated:
+                os.remove(file_path)
+            else:
+                Path(os.path.dirname(object_path)).mkdir(exist_ok=True)
+                os.replace(file_path, object_path)
+            replaced_sha256 = self._link_alias(object_path, alias_path, sha256, size)
+        if replaced_sha256 is not None and replaced_sha256 != sha256:
+            self.remove_unreferenced(replaced_sha256)
+        return sha256, size, deduplicated
+
+    def _link_alias(self, object_path: str, alias_path: str, sha256: str, size: int) -> Optional[str]:
+        """Point alias_path at the object, replacing any file there, and return the SHA-256 that the alias had before"""
+        alias_path = os.path.abspath(alias_path)
+        temp_alias_path = f"{alias_path}.{threading.get_ident()}.tmp"
+        try:
+            os.link(object_path, temp_alias_path)
+        except OSError: # ex the alias folder is on another file system, which can't hard link to the store
+            shutil.copyfile(object_path, temp_alias_path)
+        os.replace(temp_alias_path, alias_path)
+
+        with self._connect() as connection:
+            row = connection.execute("SELECT sha256 FROM aliases WHERE path = ?", (alias_path,)).fetchone()
+            connection.execute(
+                "INSERT OR REPLACE INTO aliases VALUES (?, ?, ?, ?)",
+                (alias_path, sha256, size, os.stat(alias_path).st_ino)
+            )
+        return row["sha256"] if row is not None else None
+
+    def remove_unreferenced(self, sha256: str):
+        """Delete an object once no alias links to it"""
+        object_path = self.get_object_path(sha256)
+        with self._write_lock:
+            if os.path.isfile(object_path) and os.stat(object_path).st_nlink <= 1:
+                with self._connect() as connection:
+                    referenced = connection.execute("SELECT 1 FROM aliases WHERE sha256 = ? LIMIT 1", (sha256,)).fetchone()
+                if referenced is None:
+                    os.remove(object_path)
+
+    def get_content_hash(self, file_path: str) -> Optional[str]:
+        """
+        The SHA-256 of a file that was stored through the store, or None if it wasn't,
+        or if the file has been replaced by other means since then
+        """
+        file_path = os.path.abspath(file_path)
+        with self._connect() as connection:
+            row = connection.execute("SELECT sha256, size, inode FROM aliases WHERE path = ?", (file_path,)).fetchone()
+        if row is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        if stat.st_ino != row["inode"] or stat.st_size != row["size"]:
+            return None
+        return row["sha256"]
+
+
+# the SHA-256 of files that weren't uploaded through the store, with the inode, size, and mtime they were hashed at
+_hashed_files = {}
+_hashed_files_lock = threading.Lock()
+
+def get_content_hash(file_path: str) -> str:
+    """
+    A stable key for the content of a file, for the caches of anything derived from it (ex compiled inference engines).
+    Files that weren't uploaded through the store are hashed once, and again only after they change
+    """
+    sha256 = content_store.get_content_hash(file_path)
+    if sha256 is not None:
+        return sha256
+
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    file_version = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    with _hashed_files_lock:
+        hashed_version, sha256 = _hashed_files.get(file_path, (None, None))
+    if hashed_version != file_version:
+        sha256 = hash_file(file_path)
+        with _hashed_files_lock:
+            _hashed_files[file_path] = (file_version, sha256)
+    return sha256
+
+
+content_store = ContentStore(
+    os.path.join(SERVER_CONFIG.OUTPUT_FOLDER, "content_store.sqlite3"),
+    SERVER_CONFIG.CONTENT_STORE_PATH
+)
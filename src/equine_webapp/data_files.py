@@ -0,0 +1,135 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import torch
+from torch.utils.data import TensorDataset
+
+from equine_webapp.model_loading import load_mmap
+from equine_webapp.utils import SERVER_CONFIG, SampleDataset
+
+# a .npy file keeps its labels in a second file, ex train.npy -> train.labels.npy
+NPY_LABELS_EXT = ".labels.npy"
+
+
+def get_npy_labels_path(file_path: str) -> str:
+    return os.path.splitext(file_path)[0] + NPY_LABELS_EXT
+
+def get_data_file_path(filename: str) -> str:
+    file_path = os.path.join(os.getcwd(), SERVER_CONFIG.UPLOAD_FOLDER_PATH, filename)
+    if not os.path.isfile(file_path):
+        raise ValueError(f"Data File '{file_path}' not found")
+    return file_path
+
+def count_csv_rows(file_path: str) -> int:
+    """The non-blank lines after a CSV file's header, which is much faster than parsing them"""
+    with open(file_path, "rb") as f:
+        return sum(1 for line in f if not line.isspace()) - 1
+
+def read_data_file_header(filename: str, is_train: bool = False) -> dict:
+    """
+    Get the number of rows, the shape and dtype of a row, and the column headers of a sample file without reading its samples.
+    .pt and .npy files are memory mapped, and a CSV file's lines are counted without being parsed.
+    CSV samples are read as float64, and the labels of training files (the CSV "labels" column) as int64.
+    """
+    file_path = get_data_file_path(filename)
+    file_ext = os.path.splitext(filename)[1]
+    if file_ext == ".csv":
+        column_headers = list(pd.read_csv(file_path, nrows=0).columns)
+        if is_train:
+            column_headers.remove("labels")
+        return {"file_path": file_path, "num_rows": count_csv_rows(file_path), "row_shape": (len(column_headers),), "dtype": torch.float64,
+                "label_dtype": torch.int64, "column_headers": column_headers, "tensors": None}
+    if file_ext == ".npy":
+        tensors = (torch.from_numpy(np.load(file_path, mmap_mode="c")),)
+        if is_train:
+            tensors += (torch.from_numpy(np.load(get_npy_labels_path(file_path), mmap_mode="c")),)
+    elif file_ext == ".pt":
+        data = load_mmap(file_path)
+        if isinstance(data, TensorDataset):
+            tensors = data.tensors
+        elif isinstance(data, torch.Tensor): # this is a Tensor
+            tensors = (data,)
+        else:
+            raise ValueError(f"We do not support data type {type(data)}. Please package your data as a Tensor or TensorDataset")
+    else:
+        raise ValueError(f"Given file '{filename} has unsupported file type '{file_ext}'")
+    if is_train and len(tensors) < 2:
+        raise ValueError(f"Training data file '{filename}' must be a TensorDataset of samples and labels")
+    return {"file_path": file_path, "num_rows": len(tensors[0]), "row_shape": tuple(tensors[0].shape[1:]), "dtype": tensors[0].dtype,
+            "label_dtype": tensors[1].dtype if is_train else None, "column_headers": None, "tensors": tensors}
+
+def read_data_file_into(header: dict, X: torch.Tensor, Y: Optional[torch.Tensor], chunk_rows: int = None):
+    """
+    Copy a sample file's rows into X (and its labels into Y), the slices of the combined tensors that belong to the file,
+    at most chunk_rows rows at a time. Each chunk is cast to the dtype of X and Y.
+    """
+    chunk_rows = chunk_rows if chunk_rows is not None else SERVER_CONFIG.TRAIN_CHUNK_ROWS
+    if header["tensors"] is not None:
+        for start in range(0, len(X), chunk_rows):
+            X[start:start + chunk_rows].copy_(header["tensors"][0][start:start + chunk_rows])
+            if Y is not None:
+                Y[start:start + chunk_rows].copy_(header["tensors"][1][start:start + chunk_rows])
+        return
+    row = 0
+    for chunk in pd.read_csv(header["file_path"], chunksize=chunk_rows):
+        if row + len(chunk) > len(X):
+            break
+        if Y is not None:
+            Y[row:row + len(chunk)] = torch.from_numpy(chunk.pop("labels").to_numpy(copy=True))
+        X[row:row + len(chunk)] = torch.from_numpy(chunk.to_numpy(dtype=np.float64, copy=True))
+        row += len(chunk)
+    if row != len(X): # ex a quoted value with a line break
+        raise ValueError(f"Data file '{os.path.basename(header['file_path'])}' has a different number of rows than lines")
+
+def check_row_shapes(filename_list, headers):
+    row_shape = headers[0]["row_shape"]
+    for filename, header in zip(filename_list, headers):
+        if header["row_shape"] != row_shape:
+            raise ValueError(f"Data file '{os.path.basename(filename)}' has rows of shape {list(header['row_shape'])} but expected {list(row_shape)}")
+    return row_shape
+
+def combine_data_files(filename_list, is_train=False):
+    """
+    Combine sample files (.csv, .npy, or a saved Tensor or TensorDataset .pt) into one SampleDataset.
+    The files are sized first, then read at once by a thread pool straight into their slices of one preallocated tensor,
+    so the samples are only copied once and the peak memory is about the size of the combined samples plus TRAIN_CHUNK_ROWS rows.
+    Files with different dtypes are combined in their promoted dtype, like torch.concat.
+    """
+    if len(filename_list) == 0:
+        raise ValueError("At least one data file is required")
+
+    # more threads than cores can't parse faster, and every thread holds its own chunk
+    num_workers = min(len(filename_list), SERVER_CONFIG.DATA_LOAD_MAX_WORKERS, os.cpu_count() or 1)
+    chunk_rows = max(1, SERVER_CONFIG.TRAIN_CHUNK_ROWS // num_workers)
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        headers = list(executor.map(lambda filename: read_data_file_header(filename, is_train), filename_list))
+
+        row_shape = check_row_shapes(filename_list, headers)
+        num_rows = sum(header["num_rows"] for header in headers)
+        X = torch.empty((num_rows, *row_shape), dtype=functools.reduce(torch.promote_types, [header["dtype"] for header in headers]))
+        Y = torch.empty(num_rows, dtype=functools.reduce(torch.promote_types, [header["label_dtype"] for header in headers])) if is_train else None
+
+        file_offsets = []
+        futures = []
+        start_row = 0
+        for filename, header in zip(filename_list, headers):
+            end_row = start_row + header["num_rows"]
+            file_offsets.append([filename, start_row])
+            futures.append(executor.submit(read_data_file_into, header, X[start_row:end_row], Y[start_row:end_row] if is_train else None, chunk_rows))
+            start_row = end_row
+        for future in futures:
+            future.result()
+
+    tensor_dataset = TensorDataset(X, Y) if is_train else TensorDataset(X)
+    column_headers = next((header["column_headers"] for header in reversed(headers) if header["column_headers"] is not None), None)
+    if column_headers is None:
+        column_headers = [x for x in range(0, X.shape[1])]
+
+    return SampleDataset(tensor_dataset, file_offsets, column_headers)
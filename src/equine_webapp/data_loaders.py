@@ -0,0 +1,77 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.run_results import load_run_predictions
+from equine_webapp.utils import get_model_path, get_support_position_from_data_index, load_run_dataset
+
+
+class RequestDataLoader:
+    """
+    Request-scoped loader for the run data, run predictions, and models needed to render feature data.
+    Each run's SampleDataset and each model are loaded at most once per request,
+    no matter how many data indices the request asks for.
+    """
+
+    def __init__(self):
+        self._run_datasets = {}
+        self._run_predictions = {}
+        self._models = {}
+
+    def load_run_dataset(self, run_id):
+        run_id = int(run_id)
+        if run_id not in self._run_datasets:
+            self._run_datasets[run_id] = load_run_dataset(run_id)
+        return self._run_datasets[run_id]
+
+    def load_run_predictions(self, run_id):
+        run_id = int(run_id)
+        if run_id not in self._run_predictions:
+            self._run_predictions[run_id] = load_run_predictions(run_id)
+        return self._run_predictions[run_id]
+
+    def load_model(self, model_name:str):
+        if model_name not in self._models:
+            self._models[model_name] = model_manager.get_model(
+                get_model_path(model_name),
+                load_equine_model
+            )
+        return self._models[model_name]
+
+    def get_num_inference_samples(self, run_id) -> int:
+        return len(self.load_run_dataset(run_id).dataset)
+
+    def get_num_support_examples(self, model_name:str) -> int:
+        return sum(len(support_examples) for support_examples in self.load_model(model_name).get_support().values())
+
+    def load_inference_samples(self, run_id, data_indices):
+        """Return the input tensors of the given inference samples, in the order requested"""
+        sample_dataset = self.load_run_dataset(run_id)
+        num_samples = len(sample_dataset.dataset)
+        for data_index in data_indices:
+            if data_index < 0 or data_index >= num_samples:
+                raise ValueError(f"Data index {data_index} is out of range for run {run_id} with {num_samples} samples")
+        return [sample_dataset.dataset[data_index][0] for data_index in data_indices]
+
+    def load_support_examples(self, model_name:str, data_indices):
+        """Return the support example tensors of the given data indices, in the order requested"""
+        support = self.load_model(model_name).get_support()
+        support_examples = []
+        for data_index in data_indices:
+            class_idx, support_idx = get_support_position_from_data_index(support, data_index)
+            support_examples.append(support[class_idx][support_idx])
+        return support_examples
+
+
+def get_data_loader(info) -> RequestDataLoader:
+    """
+    Get the RequestDataLoader for this GraphQL request.
+    Falls back to a new loader when the resolver is called outside of the Flask server (ex evaluate_dr_metrics.py)
+    """
+    context = getattr(info, "context", None)
+    if isinstance(context, dict):
+        if "data_loader" not in context:
+            context["data_loader"] = RequestDataLoader()
+        return context["data_loader"]
+    return RequestDataLoader()
@@ -0,0 +1,63 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from equine_webapp.utils import SERVER_CONFIG
+
+# the methods that scale quadratically (or worse) with the number of points and so are fit on landmarks for large point sets
+LANDMARK_METHODS = ["tsne", "mds"]
+
+# the number of nearest landmarks that each non-landmark point is interpolated from
+NUM_INTERPOLATION_NEIGHBORS = 5
+
+# the landmarks and the metric sample are drawn from independent random streams of the same seed,
+# so that the metrics aren't mostly measured on the landmarks, which were fit exactly
+LANDMARK_STREAM = 0
+METRIC_STREAM = 1
+
+
+def use_landmarks(method: str, num_samples: int) -> bool:
+    return method in LANDMARK_METHODS and num_samples > SERVER_CONFIG.DR_LANDMARK_THRESHOLD
+
+def get_rng(random_state, stream: int) -> np.random.Generator:
+    """A generator for one of the random streams spawned from the seed"""
+    return np.random.default_rng(np.random.SeedSequence(random_state).spawn(METRIC_STREAM + 1)[stream])
+
+def select_subset(num_samples: int, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Pick a random, sorted subset of point indices"""
+    return np.sort(rng.choice(num_samples, size=min(num_samples, size), replace=False))
+
+def select_landmarks(num_samples: int, num_landmarks: int, random_state) -> np.ndarray:
+    return select_subset(num_samples, num_landmarks, get_rng(random_state, LANDMARK_STREAM))
+
+def interpolate_from_landmarks(data: np.ndarray, landmark_idxs: np.ndarray, landmark_embeddings: np.ndarray) -> np.ndarray:
+    """
+    Place every point at the inverse distance weighted average of the low dimensional
+    coordinates of its nearest landmarks in the high dimensional space
+    """
+    from sklearn.neighbors import NearestNeighbors
+
+    embeddings = np.zeros((len(data), landmark_embeddings.shape[1]))
+    embeddings[landmark_idxs] = landmark_embeddings
+
+    other_idxs = np.setdiff1d(np.arange(len(data)), landmark_idxs)
+    if len(other_idxs) > 0:
+        num_neighbors = min(NUM_INTERPOLATION_NEIGHBORS, len(landmark_idxs))
+        distances, neighbors = NearestNeighbors(n_neighbors=num_neighbors).fit(data[landmark_idxs]).kneighbors(data[other_idxs])
+        weights = 1.0 / np.maximum(distances, 1e-12)
+        weights /= weights.sum(axis=1, keepdims=True)
+        embeddings[other_idxs] = np.einsum("ij,ijk->ik", weights, landmark_embeddings[neighbors])
+    return embeddings
+
+def fit_transform_with_landmarks(technique, data: np.ndarray, random_state):
+    """Fit the technique on landmarks only and interpolate the rest. Returns the embeddings and the number of landmarks"""
+    landmark_idxs = select_landmarks(len(data), SERVER_CONFIG.DR_NUM_LANDMARKS, random_state)
+    landmark_embeddings = technique.fit_transform(data[landmark_idxs])
+    return interpolate_from_landmarks(data, landmark_idxs, landmark_embeddings), len(landmark_idxs)
+
+def sample_for_metrics(num_samples: int, random_state) -> np.ndarray:
+    """The point indices that the quality metrics are computed on, a random subset for large point sets"""
+    if num_samples <= SERVER_CONFIG.DR_METRIC_SAMPLE_SIZE:
+        return np.arange(num_samples)
+    return select_subset(num_samples, SERVER_CONFIG.DR_METRIC_SAMPLE_SIZE, get_rng(random_state, METRIC_STREAM))
@@ -6,16 +6,21 @@ import io
 from pathlib import Path
 import json
 
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
 from ariadne.explorer import ExplorerGraphiQL
-from ariadne import combine_multipart_data, graphql_sync
+from ariadne import combine_multipart_data, format_error, graphql_sync
 
 import torch
-from torchvision.transforms import ToPILImage
 
 from equine_webapp.utils import SERVER_CONFIG, get_support_example_from_data_index, get_sample_from_data_index, sanitize_path
 from equine_webapp.graphql.graphql_config import schema
+from equine_webapp.admission import AdmissionRejected
+from equine_webapp.data_loaders import RequestDataLoader
+from equine_webapp.chunked_uploads import UploadError, chunked_uploads
+from equine_webapp.inference_stream import DEFAULT_STREAM_BATCH_SIZE, stream_inference, to_camel_case
+from equine_webapp.warm_up import start_warm_up_thread
+from equine_webapp.model_catalog import start_model_catalog_watcher
 
 # Flask App Setup ################################
 app = Flask(__name__)
@@ -27,8 +32,22 @@ explorer_html = ExplorerGraphiQL().html(None)
 
 
 # Helper Functions ###############################
+def format_graphql_error(error, debug=False):
+    formatted = format_error(error, debug)
+    if isinstance(error.original_error, AdmissionRejected):
+        formatted["extensions"] = {**formatted.get("extensions", {}), "code": "TOO_MANY_REQUESTS", "retryAfter": error.original_error.retry_after}
+    return formatted
+
+def get_retry_after(result) -> int:
+    """The longest retryAfter of the GraphQL errors from requests that the server was too busy to admit, or None"""
+    retry_afters = [error["extensions"]["retryAfter"] for error in result.get("errors") or [] if error.get("extensions", {}).get("code") == "TOO_MANY_REQUESTS"]
+    return max(retry_afters) if len(retry_afters) > 0 else None
+
 def start_dev_server():
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() in ['true', '1', 't']
+    if SERVER_CONFIG.WARM_UP or SERVER_CONFIG.UMAP_WARM_UP:
+        start_warm_up_thread()
+    start_model_catalog_watcher()
     app.run(port=8080, debug=debug_mode)
 
 
@@ -51,9 +70,14 @@ def graphql_server():
     success, result = graphql_sync(
         schema,
         data,
-        context_value=request,
-        debug=app.debug
+        context_value={"request": request, "data_loader": RequestDataLoader()},
+        debug=app.debug,
+        error_formatter=format_graphql_error
     )
+    # a request that the server is too saturated to run is turned away quickly, with when to retry it
+    retry_after = get_retry_after(result)
+    if retry_after is not None:
+        return jsonify(result), 429, {"Retry-After": str(retry_after)}
     status_code = 200 if success else 400
     return jsonify(result), status_code
 
@@ -61,6 +85,67 @@ def graphql_server():
 def handle_api_route():
     return "This is the EQUINE webapp API. <a href='/'>Click here</a> to use the webapp. <a href='/graphql'>Click here</a> to view the GraphQL API."
 
+@app.route("/api/stream/inference/<model_name>", methods=["GET"])
+def handle_stream_inference(model_name):
+    # a GET route so that browsers can consume it with EventSource, ex
+    # /api/stream/inference/my_model.eq?sampleFilenames=a.csv&sampleFilenames=b.csv&batchSize=256
+    sample_filenames = request.args.getlist("sampleFilenames")
+    if len(sample_filenames) == 0:
+        return jsonify({"error": "At least one sampleFilenames is required"}), 400
+    try:
+        # a bad request (ex a missing model or file) is answered here, before the event stream starts
+        events = stream_inference(
+            model_name,
+            sample_filenames,
+            batch_size=request.args.get("batchSize", DEFAULT_STREAM_BATCH_SIZE, type=int),
+            inference_profile=request.args.get("inferenceProfile"),
+            inference_engine=request.args.get("inferenceEngine"),
+        )
+    except (ValueError, FileNotFoundError) as e:
+        return jsonify({"error": str(e)}), 400
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Resumable uploads: POST /api/uploads {filename, size, kind, sha256} -> PUT each chunk's bytes to
+# /api/uploads/<uploadId>?offset=<byte offset> (optionally with an X-Chunk-SHA256 header) -> POST /api/uploads/<uploadId>/finalize.
+# GET /api/uploads/<uploadId> reports how many bytes have been received, which is where an interrupted upload resumes
+@app.errorhandler(UploadError)
+def handle_upload_error(e):
+    return jsonify({"error": str(e)}), e.status_code
+
+@app.route("/api/uploads", methods=["POST"])
+def handle_initiate_upload():
+    body = request.get_json()
+    if body is None or "filename" not in body or "size" not in body:
+        raise UploadError("filename and size are required")
+    session = chunked_uploads.initiate(body["filename"], int(body["size"]), body.get("kind", "file"), body.get("sha256"))
+    return jsonify(to_camel_case(session)), 201
+
+@app.route("/api/uploads/<upload_id>", methods=["GET"])
+def handle_upload_status(upload_id):
+    return jsonify(to_camel_case(chunked_uploads.get_status(upload_id)))
+
+@app.route("/api/uploads/<upload_id>", methods=["PUT"])
+def handle_upload_chunk(upload_id):
+    offset = request.args.get("offset", type=int)
+    if offset is None:
+        raise UploadError("offset is required")
+    # the raw request body is streamed into the upload, so Werkzeug never buffers the chunk
+    session = chunked_uploads.write_chunk(upload_id, offset, request.stream, request.headers.get("X-Chunk-SHA256"))
+    return jsonify(to_camel_case(session))
+
+@app.route("/api/uploads/<upload_id>/finalize", methods=["POST"])
+def handle_finalize_upload(upload_id):
+    return jsonify(to_camel_case(chunked_uploads.finalize(upload_id)))
+
+@app.route("/api/uploads/<upload_id>", methods=["DELETE"])
+def handle_abort_upload(upload_id):
+    chunked_uploads.abort(upload_id)
+    return "", 204
+
 @app.route("/api/render-image/inference/<run_id>/<data_index>", methods=["GET"])
 def handle_render_inference_image(run_id, data_index):
     sample, _, _ = get_sample_from_data_index(run_id, data_index)
@@ -74,6 +159,9 @@ def handle_render_support_image(model_name, data_index):
     return send_img_tensor_as_file(support_example, f"{model_name}_{data_index}")
 
 def send_img_tensor_as_file(img_tensor, filename):
+    # torchvision is only needed to render images, so it is imported on first use
+    from torchvision.transforms import ToPILImage
+
     img = ToPILImage()(img_tensor.to(torch.uint8))
     img_buf = io.BytesIO()
     img.save(img_buf, format="png")
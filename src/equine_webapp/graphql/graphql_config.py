@@ -9,16 +9,25 @@ type_defs = load_schema_from_path(SERVER_CONFIG.SCHEMA_PATH)
 
 query = QueryType()
 query.set_field("models", equine_webapp.graphql.query_resolvers.resolve_available_models)
+query.set_field("modelCatalog", equine_webapp.graphql.query_resolvers.resolve_model_catalog)
 query.set_field("modelSummary", equine_webapp.graphql.query_resolvers.resolve_model_summary)
 query.set_field("getPrototypeSupportEmbeddings", equine_webapp.graphql.query_resolvers.resolve_get_protonet_support_embeddings)
+query.set_field("nearestSupportExamples", equine_webapp.graphql.query_resolvers.resolve_nearest_support_examples)
+query.set_field("projectSupportLayout", equine_webapp.graphql.query_resolvers.resolve_project_support_layout)
 query.set_field("dimensionalityReduction", equine_webapp.graphql.query_resolvers.resolve_dimensionality_reduction)
+query.set_field("scatterUQView", equine_webapp.graphql.query_resolvers.resolve_scatteruq_view)
 query.set_field("renderInferenceFeatureData", equine_webapp.graphql.query_resolvers.resolve_render_inference_feature_data)
 query.set_field("renderSupportFeatureData", equine_webapp.graphql.query_resolvers.resolve_render_support_feature_data)
+query.set_field("renderInferenceFeatureDataBatch", equine_webapp.graphql.query_resolvers.resolve_render_inference_feature_data_batch)
+query.set_field("renderSupportFeatureDataBatch", equine_webapp.graphql.query_resolvers.resolve_render_support_feature_data_batch)
+query.set_field("getRun", equine_webapp.graphql.query_resolvers.resolve_get_run)
+query.set_field("inferenceProfileReport", equine_webapp.graphql.query_resolvers.resolve_inference_profile_report)
 
 mutation = MutationType()
 mutation.set_field("uploadFile", equine_webapp.graphql.mutation_resolvers.resolve_upload_file)
 mutation.set_field("uploadModel", equine_webapp.graphql.mutation_resolvers.resolve_upload_model)
 mutation.set_field("runInference", equine_webapp.graphql.mutation_resolvers.resolve_run_inference)
 mutation.set_field("startTraining", equine_webapp.graphql.mutation_resolvers.resolve_train_model)
+mutation.set_field("startTrainingSweep", equine_webapp.graphql.mutation_resolvers.resolve_train_sweep)
 
 schema = make_executable_schema(type_defs, query, mutation, convert_names_case=True)
\ No newline at end of file
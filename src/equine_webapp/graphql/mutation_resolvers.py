@@ -2,73 +2,68 @@
 # SPDX-License-Identifier: MIT
 import os
 
-import time
 import torch
 import equine as eq
 
-from equine_webapp.utils import SERVER_CONFIG, combine_data_files, get_model_path, use_label_names
-from equine_webapp.model_manager import model_manager
+from equine_webapp.data_files import combine_data_files
+from equine_webapp.utils import SERVER_CONFIG, get_model_path, new_run_id, save_run_dataset, use_label_names
+from equine_webapp.admission import admission_control
+from equine_webapp.content_store import content_store
+from equine_webapp.inference_batcher import get_inference_batcher
+from equine_webapp.inference_profiles import get_profiled_model
+from equine_webapp.inference_stream import format_inference_samples
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_metadata import write_model_metadata
+from equine_webapp.run_results import save_run_predictions
+from equine_webapp.training import get_embed_model_path, get_trained_model_path, save_trained_model, train_equine_model, train_sweep
+from equine_webapp.training_data import load_training_dataset
 
 def resolve_upload_model(_, info, model_file):
     model_save_path = os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, model_file.filename)
-    model_file.save(model_save_path)
+    sha256, size, deduplicated = content_store.store_stream(model_file.stream, model_save_path)
 
     if os.path.isfile(model_save_path):
-        return {"success" : True}
+        if model_save_path.endswith(SERVER_CONFIG.MODEL_EXT):
+            write_model_metadata(model_save_path)
+            model_catalog.upsert_model(model_save_path)
+        return {"success" : True, "content_hash": sha256, "size": size, "deduplicated": deduplicated}
     else:
         raise OSError("File not saved")
     
-def resolve_upload_file(_, info, file): #TODO Deduplicate code from upload model endpoint
+def resolve_upload_file(_, info, file):
     save_path = os.path.join(os.getcwd(), SERVER_CONFIG.UPLOAD_FOLDER_PATH, file.name)
-    file.save(save_path)
+    # hash the upload while it is written, and skip storing content that the server already has
+    sha256, size, deduplicated = content_store.store_stream(file.stream, save_path)
 
     if os.path.isfile(save_path):
-        return {"success" : True}
+        return {"success" : True, "content_hash": sha256, "size": size, "deduplicated": deduplicated}
     else:
         raise OSError("File not saved")
 
-def resolve_run_inference(_, info, model_name, sample_filenames):
-    run_id = int(time.time()) #TODO Better way to generate ID?
+def resolve_run_inference(_, info, model_name, sample_filenames, inference_profile=None, inference_engine=None):
+    run_id = new_run_id()
     
-    # load the model
+    # load the model, optimized for the inference profile and engine
     model_path = get_model_path(model_name)
-    # model = eq.load_equine_model(model_path)
-    model = model_manager.get_model(
-        model_path,
-        eq.load_equine_model
-    )
-    input_dtype = next(model.embedding_model.parameters()).dtype
+    model = get_profiled_model(model_path, inference_profile, inference_engine)
     
     # run inference on the samples
     sample_dataset = combine_data_files(sample_filenames)
     # transform sample_dataset.dataset.tensors[0] if necessary here
-    predictions = model.predict(sample_dataset.dataset.tensors[0].to(input_dtype))
+    # concurrent calls on this model are coalesced into one forward pass
+    batcher = get_inference_batcher(f"{model_path}::{model.variant_name}", model)
+    with admission_control.limit("inference", model_path):
+        predictions = batcher.predict(sample_dataset.dataset.tensors[0].to(model.input_dtype))
 
     # get the string names of the labels that the model was trained on
     label_names = use_label_names(model, predictions.classes.shape[-1])
     
-    # this list will hold all the samples data to send back to the client
-    samples_json = []
+    # the samples data to send back to the client
+    samples_json = format_inference_samples(predictions, sample_dataset.get_filenames(0, len(sample_dataset.dataset)), label_names)
 
-    # loop through all the samples
-    for sample_idx in range(len(sample_dataset.dataset)):
-        json_data = {
-            "coordinates": predictions.embeddings[sample_idx],
-            "input_data": {
-                "file": sample_dataset.filenames[sample_idx],
-                "data_index" : sample_idx
-            },
-            "labels": [{
-                "label": label_names[label_idx] if label_names is not None else str(label_idx),
-                "confidence": d,
-            } for label_idx,d in enumerate(predictions.classes[sample_idx])],
-            "ood": predictions.ood_scores[sample_idx]
-        }
-
-        samples_json.append(json_data)
-
-    save_filename = f"{run_id}_run_data.pt"
-    torch.save(sample_dataset, os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, save_filename))
+    save_run_dataset(run_id, sample_dataset)
+    # revisiting the run with getRun reads these instead of running the model again
+    save_run_predictions(run_id, model_name, predictions, sample_dataset.file_offsets, label_names, eq.__version__)
 
     return {
         "samples": samples_json,
@@ -78,37 +73,31 @@ def resolve_run_inference(_, info, model_name, sample_filenames):
 
 
 def resolve_train_model(_, info, episodes, sample_filenames, embed_model_name, new_model_name, train_model_type, emb_out_dim = 0):
-    model_file = embed_model_name if ".jit" in embed_model_name else embed_model_name + ".jit"
-    model_path = os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, model_file)
-    embed_model = torch.jit.load(model_path)
+    embed_model = torch.jit.load(get_embed_model_path(embed_model_name))
     input_dtype = next(embed_model.parameters()).dtype
 
-    sample_dataset = combine_data_files(sample_filenames, is_train=True)
+    with admission_control.limit("training"):
+        # the training files are streamed into a disk backed dataset of the embedding model's input dtype
+        dataset = load_training_dataset(sample_filenames, input_dtype)
+        model = train_equine_model(embed_model, dataset, train_model_type, episodes, emb_out_dim)
 
-    X = sample_dataset.dataset.tensors[0].to(input_dtype)
-    Y = sample_dataset.dataset.tensors[1]
+    model_save_path = save_trained_model(model, get_trained_model_path(new_model_name))
+    model_catalog.upsert_model(model_save_path)
 
-    dataset = torch.utils.data.TensorDataset(X, Y)
-    num_classes = len(torch.unique(Y))
-    if emb_out_dim == 0: emb_out_dim = num_classes
-
-    if train_model_type == "EquineProtonet":
-        model = eq.EquineProtonet(embed_model, emb_out_dim)
-        model.train_model(dataset, num_episodes=episodes)
-    elif train_model_type == "EquineGP":
-        model = eq.EquineGP(embed_model, emb_out_dim, num_classes)
+    return {"success": True}
 
-        loss_fn = torch.nn.CrossEntropyLoss()
-        optimizer = torch.optim.SGD(
-            model.parameters(),
-            lr=0.001,
-            momentum=0.9,
-            weight_decay=0.0001,
+def resolve_train_sweep(_, info, sample_filenames, embed_model_name, new_model_name, train_model_types, episodes, emb_out_dims=None, support_sizes=None, learning_rates=None, max_workers=None):
+    # an empty or missing list keeps the default for that setting
+    with admission_control.limit("training"):
+        results, table_path = train_sweep(
+            sample_filenames,
+            embed_model_name,
+            new_model_name,
+            train_model_types,
+            episodes,
+            emb_out_dims=emb_out_dims or [0],
+            support_sizes=support_sizes or [None],
+            learning_rates=learning_rates or [None],
+            max_workers=max_workers,
         )
-        model.train_model(dataset, num_epochs=episodes, loss_fn=loss_fn, opt=optimizer, vis_support=True, support_size=10)
-    else:
-        raise ValueError(f"Given train_model_type '{train_model_type}' is not valid.")
-    
-    model.save(os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, new_model_name+SERVER_CONFIG.MODEL_EXT))
-
-    return {"success": True}
+    return {"success": True, "comparison_file": os.path.basename(table_path), "variants": results}
@@ -1,22 +1,30 @@
 # Copyright (c) 2026 Massachusetts Institute of Technology
 # SPDX-License-Identifier: MIT
-from zadu import zadu
-
-
-# dimensionality reduction
+# the dimensionality reduction stack (umap, zadu, sklearn) is imported lazily in
+# resolve_dimensionality_reduction so that the server can start answering requests sooner.
+# see equine_webapp.warm_up to load these modules in the background at startup
 import numpy as np
-from sklearn.manifold import MDS, TSNE
-from sklearn.decomposition import PCA
-import umap
-
 
 import equine as eq
 import torch
 import os
+import json
 
-from equine_webapp.utils import SERVER_CONFIG, get_support_example_from_data_index, get_sample_from_data_index, get_model_path, use_label_names
+from equine_webapp.admission import admission_control
+from equine_webapp.data_files import combine_data_files
+from equine_webapp.data_loaders import get_data_loader
+from equine_webapp.dr_approximation import fit_transform_with_landmarks, sample_for_metrics, use_landmarks
+from equine_webapp.inference_profiles import compare_inference_profile, get_input_dtype, get_profiled_model
+from equine_webapp.model_catalog import decode_cursor, encode_cursor, model_catalog
+from equine_webapp.model_metadata import read_model_metadata
+from equine_webapp.run_results import filter_run_samples, get_histogram, sort_run_samples
+from equine_webapp.scatteruq_view import gather_scatteruq_view_points
+from equine_webapp.support_index import get_support_index
+from equine_webapp.support_projection import get_support_projection
+from equine_webapp.umap_runtime import make_umap
+from equine_webapp.utils import SERVER_CONFIG, get_support_example_from_data_index, get_sample_from_data_index, get_model_path, use_label_names, get_data_indices
 
-def resolve_available_models(_, info, extension):
+def resolve_available_models(_, info, extension=None):
     model_folder = os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH)
 
     filter_extension = extension if extension else SERVER_CONFIG.MODEL_EXT
@@ -29,16 +37,123 @@ def resolve_available_models(_, info, extension):
         request_data.append({"name": file_name, "last_modified" : last_mod_time})
     return request_data
 
+def resolve_model_catalog(_, info, first=50, after=None, model_type=None, name_contains=None, modified_after=None, modified_before=None):
+    if first < 0:
+        raise ValueError("first must not be negative")
+    entries, has_next_page, total_count = model_catalog.query(
+        first=first,
+        after=after,
+        model_type=model_type,
+        name_contains=name_contains,
+        modified_after=modified_after,
+        modified_before=modified_before,
+    )
+
+    edges = [{
+        "cursor": encode_cursor(entry["name"]),
+        "node": {
+            "name": entry["name"],
+            "last_modified": entry["last_modified"],
+            "model_type": entry["model_type"],
+            "date_trained": entry["date_trained"],
+            "num_classes": entry["num_classes"],
+            "num_features": entry["num_features"],
+            "emb_out_dim": entry["emb_out_dim"],
+            "num_train_examples": [{
+                "label": label["label"],
+                "num_examples": label["numExamples"],
+            } for label in json.loads(entry["num_train_examples"] or "[]")],
+        },
+    } for entry in entries]
+
+    return {
+        "edges": edges,
+        "page_info": {
+            "end_cursor": edges[-1]["cursor"] if len(edges) > 0 else None,
+            "has_next_page": has_next_page,
+        },
+        "total_count": total_count,
+    }
+
+def resolve_get_run(
+    _,
+    info,
+    run_id,
+    first=1000,
+    after=None,
+    min_ood=None,
+    max_ood=None,
+    predicted_labels=None,
+    min_confidence=None,
+    max_confidence=None,
+    condition=None,
+    outlier_tolerance=0.5,
+    class_confidence_threshold=0.5,
+    sort_by="dataIndex",
+    descending=False,
+    histogram_bins=10,
+):
+    if first < 0:
+        raise ValueError("first must not be negative")
+    run = get_data_loader(info).load_run_predictions(run_id)
+
+    # filter, sort, and count over the whole prediction arrays, then serialize only this page
+    matching_indices = filter_run_samples(
+        run,
+        min_ood=min_ood,
+        max_ood=max_ood,
+        predicted_labels=predicted_labels,
+        min_confidence=min_confidence,
+        max_confidence=max_confidence,
+        condition=condition,
+        outlier_tolerance=outlier_tolerance,
+        class_confidence_threshold=class_confidence_threshold,
+    )
+    # the cursor is the position of a sample in the filtered and sorted order
+    start_position = int(decode_cursor(after)) + 1 if after is not None else 0
+    end_position = min(start_position + first, len(matching_indices))
+    ordered_indices = sort_run_samples(run, matching_indices, sort_by=sort_by, descending=descending, limit=end_position)
+    data_indices = ordered_indices[start_position:end_position]
+
+    return {
+        "run_id": run.run_id,
+        "model_name": run.model_name,
+        "version": run.version,
+        "labels": run.get_labels(),
+        "total_count": len(matching_indices),
+        "samples": run.format_samples(data_indices),
+        "page_info": {
+            "end_cursor": encode_cursor(str(end_position - 1)) if len(data_indices) > 0 else None,
+            "has_next_page": end_position < len(matching_indices),
+        },
+        "ood_histogram": get_histogram(run.ood_scores[matching_indices], histogram_bins),
+        "confidence_histogram": get_histogram(run.confidences[matching_indices], histogram_bins),
+    }
+
 def resolve_model_summary(_, info, model_name):
     model_path = get_model_path(model_name)
-    model_save = torch.load(model_path)
-    summary = model_save["train_summary"]
-    summary["lastModified"] = os.path.getmtime(model_path)
-    return summary
+    # answer from the metadata sidecar so that we don't need to load the whole model
+    metadata = read_model_metadata(model_path)
+    train_summary = metadata["train_summary"]
+    return {
+        "date_trained": train_summary["dateTrained"],
+        "emb_out_dim": metadata["emb_out_dim"],
+        "feature_names": metadata["feature_names"],
+        "feature_shape": metadata["feature_shape"],
+        "label_names": metadata["label_names"],
+        "last_modified": metadata["model_mtime"],
+        "model_type": train_summary["modelType"],
+        "num_features": metadata["num_features"],
+        "num_train_examples": [{
+            "label": label["label"],
+            "num_examples": label["numExamples"],
+        } for label in train_summary["numTrainExamples"]],
+    }
 
 def resolve_get_protonet_support_embeddings(_, info, model_name):
     model_path = get_model_path(model_name)
-    model = eq.load_equine_model(model_path)
+    # use the cached model with the server's default inference profile and engine
+    model = get_profiled_model(model_path)
     support_examples = model.get_support()
     prototypes = model.get_prototypes()
     
@@ -61,7 +176,8 @@ def resolve_get_protonet_support_embeddings(_, info, model_name):
         }
 
         # run inference on all the support examples to get the embedding data
-        support_example_predictions = model.predict(support_examples[label_idx])
+        with admission_control.limit("inference", model_path):
+            support_example_predictions = model.predict(support_examples[label_idx])
         
         # loop over all the support examples
         for support_idx in range(len(support_example_predictions.embeddings)):
@@ -84,7 +200,65 @@ def resolve_get_protonet_support_embeddings(_, info, model_name):
 
     return embedding_data
 
+def resolve_nearest_support_examples(_, info, model_name, k=5, run_id=None, data_index=None, embedding=None):
+    if embedding is None:
+        if run_id is None or data_index is None:
+            raise ValueError("Either an embedding or both a runId and a dataIndex are required")
+        # embed the inference sample with the same model that embedded the support examples
+        embedding = embed_inference_samples(info, run_id, model_name, [data_index])[0]
+
+    # the index is built the first time that this model is queried and reused after that
+    support_index = get_support_index(get_model_path(model_name))
+    return support_index.query(embedding, k)
+
+def resolve_project_support_layout(_, info, model_name, method, labels, run_id=None, data_indices=None, start_index=None, end_index=None, embeddings=None, n_neighbors=15, random_state=42):
+    # the layout is fit on the support set once per (model, class set) and reused for every later request
+    model_path = get_model_path(model_name)
+    with admission_control.limit("dr", model_path):
+        projection = get_support_projection(model_path, method, labels, n_neighbors, random_state)
+
+    sample_data_indices = []
+    sample_embeddings = []
+    if run_id is not None:
+        num_samples = get_data_loader(info).get_num_inference_samples(run_id)
+        sample_data_indices = get_data_indices(num_samples, data_indices, start_index, end_index)
+        sample_embeddings = embed_inference_samples(info, run_id, model_name, sample_data_indices)
+    elif embeddings is not None:
+        sample_data_indices = list(range(len(embeddings)))
+        sample_embeddings = embeddings
+
+    return {
+        "method": projection.method,
+        "labels": projection.labels,
+        "prototypes": projection.prototypes.tolist(),
+        "support_examples": [{
+            "data_index": int(data_index),
+            "label": label,
+            "coordinates": coordinates,
+        } for data_index, label, coordinates in zip(projection.support_data_indices, projection.support_labels, projection.support_examples.tolist())],
+        "samples": [{
+            "data_index": data_index,
+            "label": None,
+            "coordinates": coordinates,
+        } for data_index, coordinates in zip(sample_data_indices, projection.transform(sample_embeddings).tolist())],
+        "scree": projection.scree,
+        "reproducible": projection.reproducible,
+    }
+
+def embed_inference_samples(info, run_id, model_name, data_indices):
+    """Get the embeddings of inference samples from the same model that embedded the support examples"""
+    data_loader = get_data_loader(info)
+    model = data_loader.load_model(model_name)
+    samples = torch.stack(data_loader.load_inference_samples(run_id, data_indices))
+    with admission_control.limit("inference", get_model_path(model_name)), torch.no_grad():
+        return model.predict(samples.to(get_input_dtype(model))).embeddings.float().numpy()
+
 def resolve_dimensionality_reduction(_, info, method, data, n_neighbors, random_state=42):
+    from sklearn.manifold import MDS, TSNE
+    from sklearn.decomposition import PCA
+    # torch has already been imported by equine_webapp.utils, which avoids the faiss seg fault described in evaluate_dr_metrics.py
+    from zadu import zadu
+
     high_dimensions = len(data[0])
     num_samples = len(data)
 
@@ -97,21 +271,30 @@ def resolve_dimensionality_reduction(_, info, method, data, n_neighbors, random_
     elif method == "mds":
         technique = MDS(n_components=2, normalized_stress=True, metric=False, random_state=random_state)
     else:
-        technique = umap.UMAP(densmap=True, n_neighbors=min(high_dimensions, num_samples, n_neighbors), random_state=random_state, n_jobs=1) #densmap=True,
+        # large point sets run unseeded on UMAP_N_JOBS cores (see equine_webapp.umap_runtime)
+        technique = make_umap(num_samples, random_state=random_state, densmap=True, n_neighbors=min(high_dimensions, num_samples, n_neighbors))
     data = np.array(data).astype(float)
-    embeddings = technique.fit_transform(data)
+    num_landmarks = None
+    with admission_control.limit("dr"):
+        if use_landmarks(method, num_samples):
+            # fit on a subset of landmarks and interpolate the rest to avoid the quadratic cost of the full fit
+            embeddings, num_landmarks = fit_transform_with_landmarks(technique, data, random_state)
+        else:
+            embeddings = technique.fit_transform(data)
 
-    scree = None
-    if isinstance(technique, PCA):
-        scree = technique.explained_variance_ratio_.tolist()
-        embeddings = embeddings[:,0:2] # slice off dimensions 3+ that we don't need
+        scree = None
+        if isinstance(technique, PCA):
+            scree = technique.explained_variance_ratio_.tolist()
+            embeddings = embeddings[:,0:2] # slice off dimensions 3+ that we don't need
 
-    zadu_obj = zadu.ZADU([
-        { "id": "tnc", "params": {"k": n_neighbors} },
-        { "id": "stress" },
-        { "id": "srho" }
-    ], data)
-    scores = zadu_obj.measure(embeddings)
+        # the metrics are also quadratic, so they are computed on a sample of the points for large point sets
+        metric_idxs = sample_for_metrics(num_samples, random_state)
+        zadu_obj = zadu.ZADU([
+            { "id": "tnc", "params": {"k": n_neighbors} },
+            { "id": "stress" },
+            { "id": "srho" }
+        ], data[metric_idxs])
+        scores = zadu_obj.measure(embeddings[metric_idxs])
 
     trustworthiness = scores[0]["trustworthiness"]
     continuity = scores[0]["continuity"]
@@ -119,20 +302,44 @@ def resolve_dimensionality_reduction(_, info, method, data, n_neighbors, random_
     srho = scores[2]["spearman_rho"]
 
     return {
+        "approximation": "landmark" if num_landmarks is not None else "exact",
         "continuity": continuity,
         "embeddings": embeddings,
+        "metric_sample_size": len(metric_idxs),
+        "num_landmarks": num_landmarks,
+        "reproducible": method == "pca" or technique.random_state is not None,
         "stress": stress,
         "scree": scree,
         "srho": srho,
         "trustworthiness": trustworthiness,
     }
 
+def resolve_scatteruq_view(_, info, run_id, data_index, method, outlier_tolerance=0.5, class_confidence_threshold=0.5, n_neighbors=5, random_state=42):
+    # gather the high dimensional points on the server so that only the 2D layout is sent to the client
+    data_loader = get_data_loader(info)
+    run = data_loader.load_run_predictions(run_id)
+    support_index = get_support_index(get_model_path(run.model_name))
+    prototypes = data_loader.load_model(run.model_name).get_prototypes()
+    condition, labels, points, data = gather_scatteruq_view_points(run, data_index, support_index, prototypes, outlier_tolerance, class_confidence_threshold)
+
+    reduction = resolve_dimensionality_reduction(None, info, method, data, n_neighbors, random_state)
+    for point, coordinates in zip(points, np.asarray(reduction["embeddings"]).tolist()):
+        point["coordinates"] = coordinates
+
+    return {
+        "condition": condition,
+        "labels": labels,
+        "points": points,
+        "reduction": reduction,
+    }
+
 def resolve_render_inference_feature_data(_, info, run_id, model_name, data_index):
-    featureData, _, feature_names = get_sample_from_data_index(run_id, data_index, model_name=model_name)
-    columnHeaders = feature_names if feature_names is not None else list(range(len(featureData)))
-    assert len(featureData) == len(columnHeaders)
+    sample, _, feature_names = get_sample_from_data_index(run_id, data_index, model_name=model_name)
+    feature_data = sample.tolist()
+    column_headers = feature_names if feature_names is not None else list(range(len(feature_data)))
+    assert len(feature_data) == len(column_headers)
     
-    return {"featureData": featureData, "columnHeaders": columnHeaders}
+    return {"feature_data": feature_data, "column_headers": column_headers}
 
 def resolve_render_support_feature_data(_, info, model_name, data_index):
     support_example, _, feature_names = get_support_example_from_data_index(model_name, data_index)
@@ -142,6 +349,39 @@ def resolve_render_support_feature_data(_, info, model_name, data_index):
     
     return {"feature_data": feature_data, "column_headers": column_headers}
 
+def resolve_render_inference_feature_data_batch(_, info, run_id, model_name, data_indices=None, start_index=None, end_index=None):
+    data_loader = get_data_loader(info)
+    data_indices = get_data_indices(data_loader.get_num_inference_samples(run_id), data_indices, start_index, end_index)
+
+    # the run data and the model are each loaded once for the whole batch
+    samples = data_loader.load_inference_samples(run_id, data_indices)
+    feature_names = data_loader.load_model(model_name).get_feature_names()
+
+    return format_feature_data_batch(samples, feature_names, data_indices)
+
+def resolve_render_support_feature_data_batch(_, info, model_name, data_indices=None, start_index=None, end_index=None):
+    data_loader = get_data_loader(info)
+    data_indices = get_data_indices(data_loader.get_num_support_examples(model_name), data_indices, start_index, end_index)
+
+    support_examples = data_loader.load_support_examples(model_name, data_indices)
+    feature_names = data_loader.load_model(model_name).get_feature_names()
+
+    return format_feature_data_batch(support_examples, feature_names, data_indices)
+
+def format_feature_data_batch(samples, feature_names, data_indices):
+    feature_data = torch.stack(samples).tolist()
+    num_features = len(feature_data[0])
+    column_headers = feature_names if feature_names is not None else list(range(num_features))
+    assert num_features == len(column_headers)
+
+    return {"column_headers": column_headers, "data_indices": data_indices, "feature_data": feature_data}
+
+def resolve_inference_profile_report(_, info, model_name, sample_filenames, inference_profile):
+    model_path = get_model_path(model_name)
+    sample_dataset = combine_data_files(sample_filenames)
+    with admission_control.limit("inference", model_path):
+        return compare_inference_profile(model_path, sample_dataset.dataset.tensors[0], inference_profile)
+
 def resolve_training_progress(_, info):
     pass
 
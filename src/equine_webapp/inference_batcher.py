@@ -0,0 +1,137 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import torch
+from equine import EquineOutput
+
+from equine_webapp.utils import SERVER_CONFIG
+
+
+class _PendingPredict:
+    """A predict call waiting for the batcher thread to run it"""
+
+    def __init__(self, X: torch.Tensor):
+        self.X = X
+        self.result: Optional[EquineOutput] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class InferenceBatcher:
+    """
+    Dynamic micro-batcher for one model.
+    Concurrent predict calls that arrive within max_delay seconds of each other are
+    concatenated into a single model.predict call (up to max_batch_size rows),
+    then the predictions are scattered back to each caller.
+    """
+
+    def __init__(self, model: Any, max_batch_size: int, max_delay: float):
+        self.model = model
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._queue: "queue.Queue[Optional[_PendingPredict]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="equine-webapp-inference-batcher", daemon=True)
+        self._thread.start()
+
+    def predict(self, X: torch.Tensor) -> EquineOutput:
+        """Blocking predict call. The predictions are identical to model.predict(X)"""
+        pending = _PendingPredict(X)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def close(self):
+        """Stop the batcher thread after it finishes the calls that are already queued"""
+        self._queue.put(None)
+
+    def _run(self):
+        # a call that didn't fit in the previous batch starts the next one
+        carried = None
+        while True:
+            first = carried if carried is not None else self._queue.get()
+            carried = None
+            if first is None:
+                return
+
+            # wait up to max_delay for more calls to coalesce with the first one.
+            # a call that arrives alone runs by itself even if it is larger than max_batch_size
+            batch = [first]
+            num_rows = len(first.X)
+            deadline = time.monotonic() + self._max_delay
+            while num_rows < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if pending is None: # finish this batch, then stop
+                    self._predict_groups(batch)
+                    return
+                if num_rows + len(pending.X) > self._max_batch_size:
+                    carried = pending
+                    break
+                batch.append(pending)
+                num_rows += len(pending.X)
+
+            self._predict_groups(batch)
+
+    def _predict_groups(self, batch):
+        # only calls with the same feature shape and dtype can be concatenated
+        groups: Dict[Any, list] = {}
+        for pending in batch:
+            groups.setdefault((tuple(pending.X.shape[1:]), pending.X.dtype), []).append(pending)
+        for group in groups.values():
+            self._predict_group(group)
+
+    def _predict_group(self, group):
+        try:
+            if len(group) == 1:
+                group[0].result = self.model.predict(group[0].X)
+            else:
+                predictions = self.model.predict(torch.cat([pending.X for pending in group], dim=0))
+                start = 0
+                for pending in group:
+                    end = start + len(pending.X)
+                    pending.result = EquineOutput(
+                        classes=predictions.classes[start:end],
+                        ood_scores=predictions.ood_scores[start:end],
+                        embeddings=predictions.embeddings[start:end],
+                    )
+                    start = end
+        except BaseException as error: # the error is raised in every caller's thread
+            for pending in group:
+                pending.error = error
+        finally:
+            for pending in group:
+                pending.done.set()
+
+
+_batchers: Dict[str, InferenceBatcher] = {}
+_batchers_lock = threading.Lock()
+
+def get_inference_batcher(model_key: str, model: Any) -> InferenceBatcher:
+    """
+    Get the InferenceBatcher for a model, creating it on first use.
+    A new batcher replaces the old one if the model has been reloaded since.
+    """
+    with _batchers_lock:
+        batcher = _batchers.get(model_key)
+        if batcher is None or batcher.model is not model:
+            if batcher is not None:
+                batcher.close()
+            batcher = InferenceBatcher(
+                model,
+                max_batch_size=SERVER_CONFIG.INFERENCE_MAX_BATCH_SIZE,
+                max_delay=SERVER_CONFIG.INFERENCE_MAX_DELAY_MS / 1000,
+            )
+            _batchers[model_key] = batcher
+        return batcher
@@ -0,0 +1,97 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+from pathlib import Path
+
+import torch
+
+from equine_webapp.content_store import get_content_hash
+from equine_webapp.utils import SERVER_CONFIG
+
+# eager: run the embedding model as saved in the .eq file
+# torchscript: a frozen TorchScript module optimized for inference
+# onnx: an ONNX export run with ONNX Runtime on the CPU (requires the onnx extra, pip install equine-webapp[onnx])
+INFERENCE_ENGINES = ["eager", "torchscript", "onnx"]
+
+# compiled artifacts are cached in the engine cache folder, named by the SHA-256 of the .eq file, with these extensions.
+# every file with the same content shares its artifacts, and a file whose content is replaced never gets the old ones
+ENGINE_FILE_EXTS = {
+    "torchscript": ".torchscript.pt",
+    "onnx": ".onnx",
+}
+
+
+class _OnnxEmbedding(torch.nn.Module):
+    """Runs an exported embedding model with ONNX Runtime, returning torch tensors"""
+
+    def __init__(self, onnx_path: str, output_dtype: torch.dtype):
+        super().__init__()
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(onnx_path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.output_dtype = output_dtype
+
+    def forward(self, X: torch.Tensor) -> torch.Tensor:
+        (embeddings,) = self.session.run(None, {self.input_name: X.detach().cpu().numpy()})
+        return torch.from_numpy(embeddings).to(self.output_dtype)
+
+
+def get_inference_engine_name(inference_engine=None) -> str:
+    engine_name = inference_engine if inference_engine is not None else SERVER_CONFIG.INFERENCE_ENGINE
+    if engine_name not in INFERENCE_ENGINES:
+        raise ValueError(f"Given inference engine '{engine_name}' is not valid. Valid engines are {INFERENCE_ENGINES}")
+    return engine_name
+
+def get_engine_path(model_path: str, engine_name: str) -> str:
+    return os.path.join(SERVER_CONFIG.ENGINE_CACHE_PATH, get_content_hash(model_path) + ENGINE_FILE_EXTS[engine_name])
+
+def get_example_input(model) -> torch.Tensor:
+    """Get one input example from the model's support set to export the embedding model with"""
+    support = model.get_support()
+    if support is None or len(support) == 0:
+        raise ValueError("The model needs support examples to export its embedding model")
+    return next(iter(support.values()))[:1]
+
+def export_torchscript(embedding_model: torch.nn.Module, engine_path: str):
+    if not isinstance(embedding_model, torch.jit.ScriptModule):
+        embedding_model = torch.jit.script(embedding_model)
+    frozen_model = torch.jit.optimize_for_inference(torch.jit.freeze(embedding_model.eval()))
+    torch.jit.save(frozen_model, engine_path)
+
+def export_onnx(embedding_model: torch.nn.Module, example_input: torch.Tensor, engine_path: str):
+    torch.onnx.export(
+        embedding_model.eval(),
+        (example_input,),
+        engine_path,
+        input_names=["input"],
+        output_names=["embeddings"],
+        dynamic_axes={"input": {0: "batch"}, "embeddings": {0: "batch"}},
+    )
+
+def load_compiled_embedding_model(model_path: str, model, engine_name: str) -> torch.nn.Module:
+    """
+    Get the compiled embedding model of an EQUINE model for the given engine.
+    The embedding model is exported the first time and the artifact is reused
+    for as long as the .eq file has the same content.
+    """
+    engine_path = get_engine_path(model_path, engine_name)
+    if not os.path.isfile(engine_path):
+        print(f"Exporting {engine_name} inference engine to: {engine_path}")
+        Path(SERVER_CONFIG.ENGINE_CACHE_PATH).mkdir(parents=True, exist_ok=True)
+        # export to a temporary file first so that other processes never load a partial artifact
+        temp_path = f"{engine_path}.{os.getpid()}.tmp"
+        with torch.no_grad():
+            if engine_name == "torchscript":
+                export_torchscript(model.embedding_model, temp_path)
+            elif engine_name == "onnx":
+                export_onnx(model.embedding_model, get_example_input(model), temp_path)
+            else:
+                raise ValueError(f"Inference engine '{engine_name}' can't be exported")
+        os.replace(temp_path, engine_path)
+
+    if engine_name == "torchscript":
+        return torch.jit.load(engine_path)
+    output_dtype = next(model.embedding_model.parameters()).dtype
+    return _OnnxEmbedding(engine_path, output_dtype)
@@ -0,0 +1,189 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import contextlib
+import time
+from typing import Any
+
+import torch
+import equine as eq
+
+from equine_webapp.inference_engines import get_inference_engine_name, load_compiled_embedding_model
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.utils import SERVER_CONFIG
+
+# inference_mode: run predict under torch.inference_mode, which skips autograd bookkeeping
+# precision: "fp32" uses the original model, "int8" dynamically quantizes the embedding model's
+#   linear layers, "bf16" runs the embedding model in bfloat16
+INFERENCE_PROFILES = {
+    "default": {"inference_mode": False, "precision": "fp32"},
+    "fast": {"inference_mode": True, "precision": "fp32"},
+    "int8": {"inference_mode": True, "precision": "int8"},
+    "bf16": {"inference_mode": True, "precision": "bf16"},
+}
+
+
+class ProfiledModel:
+    """
+    An EQUINE model paired with the inference profile it should be run with.
+    Exposes the same predict function as the EQUINE model.
+    """
+
+    def __init__(self, model: Any, profile_name: str, input_dtype: torch.dtype, variant_name: str):
+        self.model = model
+        self.profile_name = profile_name
+        # the name the variant is cached under, which includes the inference engine
+        self.variant_name = variant_name
+        self.profile = INFERENCE_PROFILES[profile_name]
+        # the dtype that the original embedding model expects its inputs in
+        self.input_dtype = input_dtype
+
+    def predict(self, X: torch.Tensor) -> eq.EquineOutput:
+        context = torch.inference_mode() if self.profile["inference_mode"] else contextlib.nullcontext()
+        with context:
+            return self.model.predict(X.to(self.input_dtype))
+
+    def __getattr__(self, name):
+        # everything else (ex get_support, get_label_names) comes from the EQUINE model
+        return getattr(self.model, name)
+
+
+class _ReducedPrecisionEmbedding(torch.nn.Module):
+    """Runs an embedding model in a reduced precision dtype, returning embeddings in the original dtype"""
+
+    def __init__(self, embedding_model: torch.nn.Module, dtype: torch.dtype, output_dtype: torch.dtype):
+        super().__init__()
+        self.embedding_model = embedding_model.to(dtype)
+        self.dtype = dtype
+        self.output_dtype = output_dtype
+
+    def forward(self, X: torch.Tensor) -> torch.Tensor:
+        return self.embedding_model(X.to(self.dtype)).to(self.output_dtype)
+
+
+def get_input_dtype(model) -> torch.dtype:
+    return next(model.embedding_model.parameters()).dtype
+
+def get_inference_profile_name(inference_profile=None) -> str:
+    profile_name = inference_profile if inference_profile is not None else SERVER_CONFIG.INFERENCE_PROFILE
+    if profile_name not in INFERENCE_PROFILES:
+        raise ValueError(f"Given inference profile '{profile_name}' is not valid. Valid profiles are {list(INFERENCE_PROFILES.keys())}")
+    return profile_name
+
+def set_embedding_model(model, embedding_model: torch.nn.Module):
+    """Replace the embedding model everywhere the EQUINE model references it"""
+    model.embedding_model = embedding_model
+    if hasattr(model.model, "embedding_model"): # EquineProtonet
+        model.model.embedding_model = embedding_model
+    if hasattr(model.model, "feature_extractor"): # EquineGP
+        model.model.feature_extractor = embedding_model
+    if isinstance(model, eq.EquineProtonet):
+        # recompute the support embeddings and prototypes with the new embedding model
+        # so that samples and prototypes are embedded the same way
+        model.model.update_support(model.model.support)
+
+def quantize_embedding_model(embedding_model: torch.nn.Module) -> torch.nn.Module:
+    if isinstance(embedding_model, torch.jit.ScriptModule): # EQUINE saves embedding models with TorchScript
+        return torch.ao.quantization.quantize_dynamic_jit(
+            embedding_model.eval(),
+            {"": torch.ao.quantization.default_dynamic_qconfig}
+        )
+    return torch.ao.quantization.quantize_dynamic(embedding_model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+def build_profile_variant(model_path: str, model, profile_name: str, engine_name: str = "eager"):
+    """
+    Build a copy of the EQUINE model whose embedding model has the precision of the inference profile
+    and runs on the given inference engine
+    """
+    profile = INFERENCE_PROFILES[profile_name]
+    precision = profile["precision"]
+    if engine_name != "eager":
+        if precision != "fp32":
+            raise ValueError(f"The {engine_name} inference engine only supports fp32 inference profiles")
+        # load a fresh copy of the model to modify, since EQUINE models can't be deep copied
+        variant = load_equine_model(model_path)
+        with torch.no_grad():
+            set_embedding_model(variant, load_compiled_embedding_model(model_path, variant, engine_name))
+        variant.eval()
+        variant.requires_grad_(False)
+        return variant
+
+    if precision == "fp32":
+        if profile["inference_mode"]:
+            # TorchScript embedding models fail under inference_mode while their parameters require grad.
+            # the server never trains the models it has loaded, so this doesn't change the default profile
+            model.requires_grad_(False)
+        return model # no need to copy the model
+
+    input_dtype = get_input_dtype(model)
+    # load a fresh copy of the model to modify, since EQUINE models can't be deep copied
+    variant = load_equine_model(model_path)
+    with torch.no_grad():
+        if precision == "int8":
+            set_embedding_model(variant, quantize_embedding_model(variant.embedding_model))
+        elif precision == "bf16":
+            set_embedding_model(variant, _ReducedPrecisionEmbedding(variant.embedding_model, torch.bfloat16, input_dtype))
+        else:
+            raise ValueError(f"Unknown precision '{precision}'")
+    variant.eval()
+    variant.requires_grad_(False)
+    return variant
+
+def get_profiled_model(model_path: str, inference_profile=None, inference_engine=None) -> ProfiledModel:
+    """
+    Get the model at model_path optimized for the given inference profile and engine.
+    Optimized variants are cached alongside the original model in the ModelManager.
+    """
+    profile_name = get_inference_profile_name(inference_profile)
+    engine_name = get_inference_engine_name(inference_engine)
+    variant_name = profile_name if engine_name == "eager" else f"{profile_name}+{engine_name}"
+    return model_manager.get_model_variant(
+        model_path,
+        variant_name,
+        lambda model: ProfiledModel(
+            build_profile_variant(model_path, model, profile_name, engine_name),
+            profile_name,
+            get_input_dtype(model),
+            variant_name
+        ),
+        load_equine_model
+    )
+
+def compare_inference_profile(model_path: str, X: torch.Tensor, inference_profile: str):
+    """
+    Compare the predictions of an inference profile against the original fp32 model
+    and report how much precision and speed the profile trades
+    """
+    reference = get_profiled_model(model_path, "default")
+    candidate = get_profiled_model(model_path, inference_profile)
+
+    # warm up both models so that the timings don't include one-time setup costs
+    reference.predict(X[:1])
+    candidate.predict(X[:1])
+
+    start_time = time.perf_counter()
+    reference_predictions = reference.predict(X)
+    reference_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    candidate_predictions = candidate.predict(X)
+    profile_seconds = time.perf_counter() - start_time
+
+    confidence_delta = (candidate_predictions.classes.float() - reference_predictions.classes.float()).abs()
+    ood_delta = (candidate_predictions.ood_scores.float() - reference_predictions.ood_scores.float()).abs()
+    label_agreement = (
+        candidate_predictions.classes.argmax(dim=1) == reference_predictions.classes.argmax(dim=1)
+    ).float().mean()
+
+    return {
+        "inference_profile": candidate.profile_name,
+        "num_samples": len(X),
+        "max_confidence_delta": confidence_delta.max().item(),
+        "mean_confidence_delta": confidence_delta.mean().item(),
+        "max_ood_delta": ood_delta.max().item(),
+        "mean_ood_delta": ood_delta.mean().item(),
+        "predicted_label_agreement": label_agreement.item(),
+        "reference_seconds": reference_seconds,
+        "profile_seconds": profile_seconds,
+    }
@@ -0,0 +1,102 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import json
+import re
+
+import equine as eq
+
+from equine_webapp.admission import AdmissionRejected, admission_control
+from equine_webapp.data_files import combine_data_files
+from equine_webapp.inference_batcher import get_inference_batcher
+from equine_webapp.inference_profiles import get_profiled_model
+from equine_webapp.run_results import RunPredictionsWriter
+from equine_webapp.utils import get_model_path, new_run_id, save_run_dataset, use_label_names
+
+DEFAULT_STREAM_BATCH_SIZE = 256
+
+
+def format_inference_samples(predictions, filenames, label_names, start_index: int = 0):
+    """
+    Serialize the predictions of a batch of samples, whose first sample has the data index start_index.
+    filenames has the filename of each sample in the batch (see SampleDataset.get_filenames)
+    """
+    classes = predictions.classes.tolist()
+    embeddings = predictions.embeddings.tolist()
+    ood_scores = predictions.ood_scores.tolist()
+    return [{
+        "coordinates": embeddings[idx],
+        "input_data": {
+            "file": filenames[idx],
+            "data_index": start_index + idx,
+        },
+        "labels": [{
+            "label": label_names[label_idx] if label_names is not None else str(label_idx),
+            "confidence": d,
+        } for label_idx, d in enumerate(classes[idx])],
+        "ood": ood_scores[idx],
+    } for idx in range(len(embeddings))]
+
+def to_camel_case(data):
+    """Convert the snake_case keys that the GraphQL resolvers return to the camelCase names that clients see"""
+    if isinstance(data, dict):
+        return {re.sub(r"_([a-z])", lambda m: m.group(1).upper(), key): to_camel_case(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [to_camel_case(value) for value in data]
+    return data
+
+def format_server_sent_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(to_camel_case(data))}\n\n"
+
+def stream_inference(model_name, sample_filenames, batch_size=DEFAULT_STREAM_BATCH_SIZE, inference_profile=None, inference_engine=None):
+    """
+    Run inference batch by batch, returning a generator that yields each batch of samples as a server-sent event as soon as it is predicted.
+    The events are "start" (runId, numSamples, version), "samples" (one batch), "done", or "error"
+    (with retryAfter seconds when the server is too busy to run a batch).
+    The request is validated, and the model and data loaded, before this returns, so that bad requests raise here
+    instead of after the response has started.
+    The run data is saved before the first batch so that the client can request feature data while the run streams.
+    Only one batch is serialized at a time, and closing the generator (ex the client disconnected) stops the run.
+    """
+    if batch_size <= 0:
+        raise ValueError("batchSize must be positive")
+    run_id = new_run_id()
+
+    model_path = get_model_path(model_name)
+    model = get_profiled_model(model_path, inference_profile, inference_engine)
+    sample_dataset = combine_data_files(sample_filenames)
+    save_run_dataset(run_id, sample_dataset)
+    return _stream_batches(run_id, model_name, model_path, model, sample_dataset, batch_size)
+
+def _stream_batches(run_id, model_name, model_path, model, sample_dataset, batch_size):
+    X = sample_dataset.dataset.tensors[0]
+    num_samples = len(X)
+    yield format_server_sent_event("start", {"run_id": run_id, "num_samples": num_samples, "version": eq.__version__})
+
+    # the predictions are saved as they stream, and the run can be revisited with getRun once it is done
+    writer = RunPredictionsWriter(run_id, model_name, num_samples, sample_dataset.file_offsets, eq.__version__)
+    try:
+        batcher = get_inference_batcher(f"{model_path}::{model.variant_name}", model)
+        label_names = None
+        for start_index in range(0, num_samples, batch_size):
+            # each batch is admitted on its own, so that a long stream doesn't hold a slot between batches
+            with admission_control.limit("inference", model_path):
+                predictions = batcher.predict(X[start_index:start_index + batch_size].to(model.input_dtype))
+            if start_index == 0:
+                label_names = use_label_names(model, predictions.classes.shape[-1])
+            writer.write(start_index, predictions, label_names)
+            filenames = sample_dataset.get_filenames(start_index, start_index + len(predictions.classes))
+            samples = format_inference_samples(predictions, filenames, label_names, start_index)
+            yield format_server_sent_event("samples", {"start_index": start_index, "samples": samples})
+        writer.close()
+    except Exception as e:
+        writer.abort()
+        error = {"message": str(e)}
+        if isinstance(e, AdmissionRejected): # the server is saturated, and the client can retry the run later
+            error["retry_after"] = e.retry_after
+        yield format_server_sent_event("error", error)
+        return
+    except GeneratorExit: # the client disconnected
+        writer.abort()
+        raise
+    yield format_server_sent_event("done", {"run_id": run_id})
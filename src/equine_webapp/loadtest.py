@@ -0,0 +1,322 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+"""
+Load testing harness that launches the server with equine_webapp.main (waitress) on localhost and replays
+the requests of analysts using the UI: list the models, open a model's summary and support embeddings,
+run inference, then hover over many samples (feature data and images) and request dimensionality reductions.
+The number of concurrent analysts is ramped through stages, and each stage reports the throughput,
+the p50/p95/p99 latency of each operation, and the server's memory use, ex
+
+    equine-webapp-loadtest --model-name my_model.eq --sample-file my_samples.csv --concurrency 1,4,16
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+import numpy as np
+
+from equine_webapp.utils import SERVER_CONFIG
+
+MODELS_QUERY = "query { models { name lastModified } }"
+MODEL_SUMMARY_QUERY = """
+    query ModelSummary($modelName: String!) {
+      modelSummary(modelName: $modelName) { dateTrained modelType numTrainExamples { label numExamples } }
+    }
+"""
+SUPPORT_EMBEDDINGS_QUERY = """
+    query GetPrototypeSupportEmbeddings($modelName: String!) {
+      getPrototypeSupportEmbeddings(modelName: $modelName) {
+        label
+        prototype
+        trainingExamples { coordinates ood labels { label confidence } inputData { dataIndex } }
+      }
+    }
+"""
+RUN_INFERENCE_QUERY = """
+    mutation RunInference($modelName: String!, $sampleFilenames: [String]!) {
+      runInference(modelName: $modelName, sampleFilenames: $sampleFilenames) {
+        runId
+        samples { coordinates ood labels { label confidence } inputData { dataIndex } }
+      }
+    }
+"""
+FEATURE_DATA_QUERY = """
+    query RenderInferenceFeatureData($runId: Int!, $modelName: String!, $dataIndex: Int!) {
+      renderInferenceFeatureData(runId: $runId, modelName: $modelName, dataIndex: $dataIndex) { featureData columnHeaders }
+    }
+"""
+DIMENSIONALITY_REDUCTION_QUERY = """
+    query DimensionalityReduction($method: String!, $data: [[Float!]!]!, $nNeighbors: Int!) {
+      dimensionalityReduction(method: $method, data: $data, nNeighbors: $nNeighbors) { embeddings trustworthiness }
+    }
+"""
+
+
+class LoadTestClient:
+    """Sends requests to the server and records the latency of each operation"""
+
+    def __init__(self, base_url: str, timeout: float = 300):
+        self.base_url = base_url
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latencies = defaultdict(list)
+            self.errors = defaultdict(list)
+
+    def _record(self, operation: str, seconds: float, error: str = None):
+        with self._lock:
+            if error is not None:
+                self.errors[operation].append(error)
+            else:
+                self.latencies[operation].append(seconds)
+
+    def request(self, operation: str, path: str, payload=None):
+        """Send a request and return its body (or the GraphQL data), or None if it failed"""
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, headers={"Content-Type": "application/json"})
+        start_time = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+        except urllib.error.HTTPError as e:
+            body = e.read()
+            error = f"HTTP {e.code}"
+            if path == "/graphql" and body:
+                error = "; ".join(graphql_error["message"] for graphql_error in json.loads(body).get("errors", [])) or error
+            self._record(operation, time.perf_counter() - start_time, error=error)
+            return None
+        except (urllib.error.URLError, OSError) as e:
+            self._record(operation, time.perf_counter() - start_time, error=repr(e))
+            return None
+        seconds = time.perf_counter() - start_time
+
+        if path != "/graphql":
+            self._record(operation, seconds)
+            return body
+        result = json.loads(body)
+        if result.get("errors"):
+            self._record(operation, seconds, error="; ".join(graphql_error["message"] for graphql_error in result["errors"]))
+            return None
+        self._record(operation, seconds)
+        return result["data"]
+
+    def graphql(self, operation: str, query: str, variables=None):
+        return self.request(operation, "/graphql", {"query": query, "variables": variables or {}})
+
+
+def run_session(client: LoadTestClient, model_name: str, sample_filenames, num_hovers: int, dr_methods, render_images: bool, rng: random.Random):
+    """Replay one analyst session"""
+    client.graphql("models", MODELS_QUERY)
+    client.graphql("modelSummary", MODEL_SUMMARY_QUERY, {"modelName": model_name})
+    support = client.graphql("getPrototypeSupportEmbeddings", SUPPORT_EMBEDDINGS_QUERY, {"modelName": model_name})
+    run = client.graphql("runInference", RUN_INFERENCE_QUERY, {"modelName": model_name, "sampleFilenames": sample_filenames})
+    if run is None:
+        return
+    run_id = run["runInference"]["runId"]
+    samples = run["runInference"]["samples"]
+
+    # hovering over a sample shows its feature data or image
+    for _ in range(num_hovers):
+        data_index = rng.randrange(len(samples))
+        if render_images:
+            client.request("renderInferenceImage", f"/api/render-image/inference/{run_id}/{data_index}")
+        else:
+            client.graphql("renderInferenceFeatureData", FEATURE_DATA_QUERY, {"runId": run_id, "modelName": model_name, "dataIndex": data_index})
+
+    # selecting a sample lays it out with the prototypes and support examples of its most confident classes
+    if support is not None:
+        sample = samples[rng.randrange(len(samples))]
+        top_labels = {label["label"] for label in sorted(sample["labels"], key=lambda label: -label["confidence"])[:2]}
+        data = [sample["coordinates"]]
+        for label_points in support["getPrototypeSupportEmbeddings"]:
+            if label_points["label"] in top_labels:
+                data.append(label_points["prototype"])
+                data += [example["coordinates"] for example in label_points["trainingExamples"]]
+        for method in dr_methods:
+            client.graphql(f"dimensionalityReduction/{method}", DIMENSIONALITY_REDUCTION_QUERY, {"method": method, "data": data, "nNeighbors": 15})
+
+
+def get_rss_bytes(pid: int):
+    """The resident set size of a process, or None if it can't be read on this platform"""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def run_stage(client: LoadTestClient, concurrency: int, stage_seconds: float, server_pid: int, session_kwargs: dict, seed: int):
+    """Run concurrency analysts for stage_seconds. Sessions that are running at the end are allowed to finish"""
+    client.reset()
+    stop_time = time.time() + stage_seconds
+    peak_rss = [get_rss_bytes(server_pid)]
+
+    def analyst(analyst_idx: int):
+        rng = random.Random(seed + analyst_idx)
+        while time.time() < stop_time:
+            run_session(client, rng=rng, **session_kwargs)
+
+    def sample_rss():
+        while any(thread.is_alive() for thread in threads):
+            peak_rss.append(get_rss_bytes(server_pid))
+            time.sleep(0.5)
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=analyst, args=(analyst_idx,), daemon=True) for analyst_idx in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    rss_thread = threading.Thread(target=sample_rss, daemon=True)
+    rss_thread.start()
+    for thread in threads:
+        thread.join()
+    rss_thread.join()
+    elapsed_seconds = time.perf_counter() - start_time
+
+    operations = {}
+    for operation in sorted(set(client.latencies) | set(client.errors)):
+        latencies = np.array(client.latencies.get(operation, []))
+        operations[operation] = {
+            "count": len(latencies),
+            "errors": len(client.errors.get(operation, [])),
+            "error_messages": sorted(set(client.errors.get(operation, []))),
+            "p50": float(np.percentile(latencies, 50)) if len(latencies) > 0 else None,
+            "p95": float(np.percentile(latencies, 95)) if len(latencies) > 0 else None,
+            "p99": float(np.percentile(latencies, 99)) if len(latencies) > 0 else None,
+        }
+    num_requests = sum(operation["count"] + operation["errors"] for operation in operations.values())
+    rss_values = [rss for rss in peak_rss if rss is not None]
+    return {
+        "concurrency": concurrency,
+        "seconds": elapsed_seconds,
+        "requests_per_second": num_requests / elapsed_seconds,
+        "peak_rss_bytes": max(rss_values) if rss_values else None,
+        "operations": operations,
+    }
+
+
+def start_server(port: int, server_env=None) -> subprocess.Popen:
+    env = {**os.environ, "PORT": str(port), **(server_env or {})}
+    return subprocess.Popen([sys.executable, "-c", "import equine_webapp; equine_webapp.main()"], env=env)
+
+def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 120):
+    stop_time = time.time() + timeout
+    while time.time() < stop_time:
+        if process.poll() is not None:
+            raise RuntimeError(f"The server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(base_url + "/api", timeout=5):
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    raise TimeoutError(f"The server did not start within {timeout}s")
+
+
+def run_load_test(
+    model_name: str,
+    sample_file: str,
+    concurrency_stages=(1, 2, 4, 8),
+    stage_seconds: float = 30,
+    num_hovers: int = 200,
+    dr_methods=("pca", "umap"),
+    render_images: bool = False,
+    port: int = 8089,
+    server_env=None,
+    seed: int = 0,
+):
+    """
+    Launch the server, run each concurrency stage, stop the server, and return the stage reports.
+    sample_file is copied into the upload folder if it isn't already there.
+    """
+    sample_filename = os.path.basename(sample_file)
+    upload_path = os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, sample_filename)
+    if os.path.abspath(sample_file) != os.path.abspath(upload_path):
+        shutil.copy(sample_file, upload_path)
+
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(port, server_env)
+    try:
+        wait_for_server(base_url, process)
+        client = LoadTestClient(base_url)
+        session_kwargs = {
+            "model_name": model_name,
+            "sample_filenames": [sample_filename],
+            "num_hovers": num_hovers,
+            "dr_methods": list(dr_methods),
+            "render_images": render_images,
+        }
+        # one untimed session loads the model and the lazily imported modules
+        run_session(client, rng=random.Random(seed), **session_kwargs)
+
+        stages = []
+        for concurrency in concurrency_stages:
+            stage = run_stage(client, concurrency, stage_seconds, process.pid, session_kwargs, seed)
+            print_stage(stage)
+            stages.append(stage)
+        return stages
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def print_stage(stage: dict):
+    rss = f"{stage['peak_rss_bytes'] / 2**20:.0f} MiB" if stage["peak_rss_bytes"] is not None else "unknown"
+    print(f"\nConcurrency {stage['concurrency']}: {stage['requests_per_second']:.1f} requests/s over {stage['seconds']:.1f}s, peak server RSS {rss}")
+    print(f"{'operation':<40}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, operation in stage["operations"].items():
+        percentiles = "".join(f"{operation[p]*1000:>10.1f}" if operation[p] is not None else f"{'-':>10}" for p in ["p50", "p95", "p99"])
+        print(f"{name:<40}{operation['count']:>8}{operation['errors']:>8}{percentiles}")
+    for name, operation in stage["operations"].items():
+        for message in operation["error_messages"]:
+            print(f"{name} error: {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay UI traffic against a local equine_webapp server with increasing concurrency")
+    parser.add_argument("--model-name", required=True, help="a model in the server's model folder")
+    parser.add_argument("--sample-file", required=True, help="a .csv or .pt file of samples to run inference on")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="comma separated number of concurrent analysts in each stage")
+    parser.add_argument("--stage-seconds", type=float, default=30)
+    parser.add_argument("--hovers", type=int, default=200, help="feature data or image requests per session")
+    parser.add_argument("--dr-methods", default="pca,umap", help="comma separated dimensionality reduction methods per session")
+    parser.add_argument("--images", action="store_true", help="request sample images instead of feature data")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--output", help="save the stage reports to this json file")
+    args = parser.parse_args()
+
+    stages = run_load_test(
+        args.model_name,
+        args.sample_file,
+        concurrency_stages=[int(c) for c in args.concurrency.split(",")],
+        stage_seconds=args.stage_seconds,
+        num_hovers=args.hovers,
+        dr_methods=[m for m in args.dr_methods.split(",") if m],
+        render_images=args.images,
+        port=args.port,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(stages, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
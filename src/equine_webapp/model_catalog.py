@@ -0,0 +1,215 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import base64
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from equine_webapp.model_manager import model_manager
+from equine_webapp.model_metadata import METADATA_VERSION, read_model_metadata
+from equine_webapp.utils import SERVER_CONFIG
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    name TEXT PRIMARY KEY,
+    last_modified REAL NOT NULL,
+    model_type TEXT,
+    date_trained TEXT,
+    num_classes INTEGER,
+    num_features INTEGER,
+    emb_out_dim INTEGER,
+    num_train_examples TEXT
+);
+CREATE INDEX IF NOT EXISTS models_last_modified ON models (last_modified);
+CREATE INDEX IF NOT EXISTS models_model_type ON models (model_type);
+"""
+
+
+def encode_cursor(name: str) -> str:
+    return base64.urlsafe_b64encode(name.encode()).decode()
+
+def decode_cursor(cursor: str) -> str:
+    return base64.urlsafe_b64decode(cursor.encode()).decode()
+
+
+class ModelCatalog:
+    """
+    Persistent SQLite index of the models in the model folder and their summary fields.
+    It is updated when models are uploaded or trained, and by a background watcher
+    that picks up files that were added, changed, or removed by other means.
+    """
+
+    def __init__(self, db_path: str, model_folder: str):
+        self._db_path = db_path
+        self._model_folder = model_folder
+        self._write_lock = threading.Lock()
+        # syncs run one at a time, so that the first queries after startup don't each scan the folder
+        self._sync_lock = threading.Lock()
+        self._synced = False
+        # the mtime of each model file that could not be added, so that it isn't loaded again until it changes
+        self._failed = {}
+        with self._connect() as connection:
+            connection.executescript(CATALOG_SCHEMA)
+            # entries extracted with an older metadata version are dropped, and the first sync adds them back
+            if connection.execute("PRAGMA user_version").fetchone()[0] != METADATA_VERSION:
+                connection.execute("DELETE FROM models")
+                connection.execute(f"PRAGMA user_version = {METADATA_VERSION}")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """Open a connection for one transaction, which is committed on success"""
+        connection = sqlite3.connect(self._db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def upsert_model(self, model_path: str):
+        """
+        Add or update the catalog entry of one model.
+        A loaded copy of the file's previous content is unloaded, so that the model and its variants
+        (ex the support index and compiled engines) are rebuilt from the new content
+        """
+        model_manager.unload_model_file(model_path)
+        metadata = read_model_metadata(model_path)
+        train_summary = metadata["train_summary"]
+        with self._write_lock, self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO models VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.basename(model_path),
+                    metadata["model_mtime"],
+                    metadata["model_type"],
+                    metadata["date_trained"],
+                    metadata["num_classes"],
+                    metadata["num_features"],
+                    metadata["emb_out_dim"],
+                    json.dumps(train_summary.get("numTrainExamples", [])),
+                )
+            )
+
+    def remove_model(self, model_name: str):
+        with self._write_lock, self._connect() as connection:
+            connection.execute("DELETE FROM models WHERE name = ?", (model_name,))
+
+    def sync(self, only_if_unsynced: bool = False):
+        """
+        Bring the catalog up to date with the model folder.
+        With only_if_unsynced, nothing is done if the catalog has already been synced (ex by a concurrent query)
+        """
+        with self._sync_lock:
+            if only_if_unsynced and self._synced:
+                return
+            model_files = {}
+            with os.scandir(self._model_folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(SERVER_CONFIG.MODEL_EXT):
+                        model_files[entry.name] = entry.stat().st_mtime
+
+            with self._connect() as connection:
+                catalog_files = {row["name"]: row["last_modified"] for row in connection.execute("SELECT name, last_modified FROM models")}
+
+            for model_name, last_modified in model_files.items():
+                if catalog_files.get(model_name) != last_modified and self._failed.get(model_name) != last_modified:
+                    try:
+                        self.upsert_model(os.path.join(self._model_folder, model_name))
+                        self._failed.pop(model_name, None)
+                    except Exception as e: # a bad file shouldn't stop the rest of the catalog from updating
+                        print(f"Could not add '{model_name}' to the model catalog: {e}")
+                        self._failed[model_name] = last_modified
+            for model_name in catalog_files.keys() - model_files.keys():
+                self.remove_model(model_name)
+            for model_name in self._failed.keys() - model_files.keys():
+                del self._failed[model_name]
+            self._synced = True
+
+    def query(
+        self,
+        first: int = 50,
+        after: Optional[str] = None,
+        model_type: Optional[str] = None,
+        name_contains: Optional[str] = None,
+        modified_after: Optional[float] = None,
+        modified_before: Optional[float] = None,
+    ):
+        """
+        Get one page of catalog entries ordered by name, after the given cursor.
+        Returns the entries, whether there is a next page, and the total count matching the filters.
+        """
+        if not self._synced: # make sure that the first query after startup sees every model
+            self.sync(only_if_unsynced=True)
+
+        conditions = []
+        params = []
+        if model_type is not None:
+            conditions.append("model_type = ?")
+            params.append(model_type)
+        if name_contains is not None:
+            conditions.append("instr(name, ?) > 0")
+            params.append(name_contains)
+        if modified_after is not None:
+            conditions.append("last_modified >= ?")
+            params.append(modified_after)
+        if modified_before is not None:
+            conditions.append("last_modified <= ?")
+            params.append(modified_before)
+        where = " AND ".join(conditions) if conditions else "1"
+
+        with self._connect() as connection:
+            total_count = connection.execute(f"SELECT COUNT(*) FROM models WHERE {where}", params).fetchone()[0]
+            page_conditions = where
+            page_params = list(params)
+            if after is not None:
+                page_conditions += " AND name > ?"
+                page_params.append(decode_cursor(after))
+            rows = connection.execute(
+                f"SELECT * FROM models WHERE {page_conditions} ORDER BY name LIMIT ?",
+                page_params + [first + 1]
+            ).fetchall()
+
+        has_next_page = len(rows) > first
+        return [dict(row) for row in rows[:first]], has_next_page, total_count
+
+
+class ModelCatalogWatcher:
+    """Background thread that periodically syncs the catalog with the model folder"""
+
+    def __init__(self, catalog: ModelCatalog, interval: float):
+        self._catalog = catalog
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="equine-webapp-catalog-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self._catalog.sync()
+            except Exception as e:
+                print(f"Model catalog sync failed: {e}")
+            self._stop_event.wait(self._interval)
+
+
+def start_model_catalog_watcher() -> Optional[ModelCatalogWatcher]:
+    if SERVER_CONFIG.CATALOG_POLL_SECONDS <= 0:
+        return None
+    return ModelCatalogWatcher(model_catalog, SERVER_CONFIG.CATALOG_POLL_SECONDS).start()
+
+
+# Global catalog instance
+model_catalog = ModelCatalog(
+    os.path.join(SERVER_CONFIG.OUTPUT_FOLDER, "model_catalog.sqlite3"),
+    SERVER_CONFIG.MODEL_FOLDER_PATH
+)
@@ -0,0 +1,78 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import torch
+import equine as eq
+
+
+def load_mmap(file_path: str):
+    """
+    torch.load a file, memory-mapping its tensor storages instead of reading them into private memory.
+    The mapped pages are read lazily and shared through the page cache by every process that loads the same file.
+    Files in torch's legacy (non-zip) format can't be memory-mapped and are read normally.
+    """
+    try:
+        return torch.load(file_path, map_location="cpu", mmap=True, weights_only=False)
+    except RuntimeError as e:
+        if "mmap can only be used" not in str(e):
+            raise
+        return torch.load(file_path, map_location="cpu", weights_only=False)
+
+def load_model_save(model_path: str) -> dict:
+    """Unpickle a saved EQUINE model file, with its tensors memory-mapped (see load_mmap)"""
+    return load_mmap(model_path)
+
+def _build_equine_protonet(model_save: dict) -> eq.EquineProtonet:
+    """EquineProtonet.load, from an already unpickled model file"""
+    buffer = model_save.get("embed_jit_save")
+    buffer.seek(0)
+    eq_model = eq.EquineProtonet(torch.jit.load(buffer, map_location="cpu"), **model_save.get("settings"))
+
+    # assign the mapped tensors to the model instead of copying them into its parameters
+    eq_model.model.model_head.load_state_dict(model_save.get("model_head_save"), assign=True)
+    eq_model.eval()
+    eq_model.model.update_support(model_save.get("support"))
+
+    eq_model.feature_names = model_save.get("feature_names")
+    eq_model.label_names = model_save.get("label_names")
+    eq_model.outlier_score_kde = model_save.get("outlier_kde")
+    eq_model.train_summary = model_save.get("train_summary")
+    return eq_model
+
+def _build_equine_gp(model_save: dict) -> eq.EquineGP:
+    """EquineGP.load, from an already unpickled model file"""
+    buffer = model_save.get("embed_jit_save")
+    buffer.seek(0)
+    eq_model = eq.EquineGP(torch.jit.load(buffer, map_location="cpu"), **model_save.get("settings"))
+
+    eq_model.feature_names = model_save.get("feature_names")
+    eq_model.label_names = model_save.get("label_names")
+    eq_model.train_summary = model_save.get("train_summary")
+
+    laplace_model_save = model_save.get("laplace_model_save")
+    eq_model.model.load_state_dict(laplace_model_save, strict=False)
+    eq_model.model.seen_data = laplace_model_save.get("seen_data")
+    eq_model.model.set_training_params(model_save.get("num_data"), model_save.get("train_batch_size"))
+    eq_model.eval()
+
+    support = model_save.get("support")
+    if len(support) > 0:
+        eq_model.support = support
+        eq_model.prototypes = eq_model.compute_prototypes()
+    return eq_model
+
+MODEL_BUILDERS = {
+    "EquineProtonet": _build_equine_protonet,
+    "EquineGP": _build_equine_gp,
+}
+
+def load_equine_model(model_path: str) -> eq.Equine:
+    """
+    Load an EQUINE model like eq.load_equine_model, which unpickles the whole file once to read the model type
+    and again to build the model. This unpickles the file once, memory-mapped (see load_model_save).
+    """
+    model_save = load_model_save(model_path)
+    model_type = model_save["train_summary"]["modelType"]
+    if model_type not in MODEL_BUILDERS:
+        raise ValueError(f"Unknown model type '{model_type}'")
+    return MODEL_BUILDERS[model_type](model_save)
@@ -1,11 +1,58 @@
 # Copyright (c) 2026 Massachusetts Institute of Technology
 # SPDX-License-Identifier: MIT
 
+import contextlib
 import threading
-from typing import Dict, Callable, Any
+from collections import OrderedDict
+from typing import Dict, Callable, Any, Optional
 from pathlib import Path
 
 
+class ReadWriteLock:
+    """
+    A lock that any number of readers can hold at once, or one writer.
+    Waiting writers go before new readers, so a steady stream of readers can't starve them.
+    Not reentrant: a thread must not acquire it again while holding it.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._num_readers = 0
+        self._num_writers_waiting = 0
+        self._writing = False
+
+    @contextlib.contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._num_writers_waiting > 0:
+                self._condition.wait()
+            self._num_readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._num_readers -= 1
+                if self._num_readers == 0:
+                    self._condition.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        with self._condition:
+            self._num_writers_waiting += 1
+            try:
+                while self._writing or self._num_readers > 0:
+                    self._condition.wait()
+            finally:
+                self._num_writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
 class ModelManager:
     """
     Thread-safe singleton model manager for lazy loading and caching models.
@@ -30,7 +77,15 @@ class ModelManager:
             return
             
         self._models: Dict[str, Any] = {}
+        # optimized variants of the loaded models (ex quantized), keyed by model path then variant name
+        self._variants: Dict[str, Dict[str, Any]] = {}
+        # serializes loading (and building the variants of) each model
         self._model_locks: Dict[str, threading.Lock] = {}
+        # guards _models and _variants, which are read by every request and only written when a model is (un)loaded
+        self._cache_lock = ReadWriteLock()
+        # the variants of bounded groups in least to most recently used order, keyed by model path then group
+        self._variant_usage: Dict[str, Dict[str, OrderedDict]] = {}
+        self._variant_usage_lock = threading.Lock()
         self._initialized = True
 
         file_dir = Path(__file__).parent.resolve()
@@ -98,14 +153,20 @@ class ModelManager:
                     self._model_locks[model_path] = threading.Lock()
         
         # Check if model is already loaded (unless force_reload)
-        if not force_reload and model_path in self._models:
-            return self._models[model_path]
+        if not force_reload:
+            with self._cache_lock.read():
+                model = self._models.get(model_path)
+            if model is not None:
+                return model
         
         # Load the model (thread-safe per model path)
         with self._model_locks[model_path]:
             # Double-check after acquiring lock
-            if not force_reload and model_path in self._models:
-                return self._models[model_path]
+            if not force_reload:
+                with self._cache_lock.read():
+                    model = self._models.get(model_path)
+                if model is not None:
+                    return model
             
             print(f"Loading model from: {model_path}")
             
@@ -117,11 +178,77 @@ class ModelManager:
             model = load_function(model_path)
             
             # Cache the model
-            self._models[model_path] = model
+            with self._cache_lock.write():
+                self._models[model_path] = model
+                if force_reload:
+                    self._variants.pop(model_path, None)
+                    with self._variant_usage_lock:
+                        self._variant_usage.pop(model_path, None)
             print(f"Model loaded successfully: {model_path}")
             
             return model
     
+    def get_model_variant(
+        self,
+        model_path: str,
+        variant_name: str,
+        build_function: Callable[[Any], Any],
+        load_function: Callable[[str], Any],
+        max_group_size: Optional[int] = None
+    ) -> Any:
+        """
+        Get an optimized variant of a model (ex quantized). Builds it from the original model if not already cached.
+        Variants are cached alongside the original model and are unloaded with it.
+        
+        Args:
+            model_path: Path to the model file
+            variant_name: Name of the variant (ex the inference profile)
+            build_function: Function to build the variant (takes the original model as argument)
+            load_function: Function to load the original model (takes model_path as argument)
+            max_group_size: If given, at most this many of the model's variants in the same group (the variant
+                name up to the first ':') are cached, and the least recently used one is evicted
+            
+        Returns:
+            The model variant
+        """
+        model = self.get_model(model_path, load_function)
+        group = variant_name.split(":", 1)[0] if max_group_size is not None else None
+        
+        with self._cache_lock.read():
+            variant = self._variants.get(model_path, {}).get(variant_name)
+        if variant is not None:
+            if group is not None:
+                self._use_variant(model_path, group, variant_name, max_group_size)
+            return variant
+        
+        with self._model_locks[model_path]:
+            # Double-check after acquiring lock
+            with self._cache_lock.read():
+                variant = self._variants.get(model_path, {}).get(variant_name)
+            if variant is None:
+                print(f"Building model variant '{variant_name}' for: {model_path}")
+                variant = build_function(model)
+                with self._cache_lock.write():
+                    self._variants.setdefault(model_path, {})[variant_name] = variant
+            if group is not None:
+                self._use_variant(model_path, group, variant_name, max_group_size)
+            return variant
+
+    def _use_variant(self, model_path: str, group: str, variant_name: str, max_group_size: int):
+        """Mark a variant of a bounded group as the most recently used, and evict the variants that no longer fit"""
+        with self._variant_usage_lock:
+            usage = self._variant_usage.setdefault(model_path, {}).setdefault(group, OrderedDict())
+            usage[variant_name] = None
+            usage.move_to_end(variant_name)
+            evicted_names = []
+            while len(usage) > max_group_size:
+                evicted_names.append(usage.popitem(last=False)[0])
+        if len(evicted_names) > 0:
+            with self._cache_lock.write():
+                variants = self._variants.get(model_path, {})
+                for evicted_name in evicted_names:
+                    variants.pop(evicted_name, None)
+    
     def unload_model(self, model_path: str) -> bool:
         """
         Unload a model from cache to free memory.
@@ -132,34 +259,48 @@ class ModelManager:
         Returns:
             True if model was unloaded, False if not found
         """
-        if model_path not in self._models:
-            return False
+        with self._cache_lock.read():
+            if model_path not in self._models:
+                return False
         
         with self._model_locks.get(model_path, self._lock):
-            if model_path in self._models:
+            with self._cache_lock.write():
+                if model_path not in self._models:
+                    return False
                 del self._models[model_path]
-                print(f"Model unloaded: {model_path}")
-                return True
-        return False
+                self._variants.pop(model_path, None)
+                with self._variant_usage_lock:
+                    self._variant_usage.pop(model_path, None)
+            print(f"Model unloaded: {model_path}")
+            return True
+    
+    def unload_model_file(self, file_path: str):
+        """Unload the models that were loaded from a file, under any path that resolves to it (ex after the file was replaced)"""
+        resolved_path = Path(file_path).resolve()
+        with self._cache_lock.read():
+            model_paths = [model_path for model_path in self._models.keys() if Path(model_path).resolve() == resolved_path]
+        for model_path in model_paths:
+            self.unload_model(model_path)
     
     def clear_all(self):
         """Unload all models from cache"""
-        with self._lock:
-            model_paths = list(self._models.keys())
-            for path in model_paths:
-                self.unload_model(path)
-            print("All models cleared from cache")
+        for path in self.list_loaded_models():
+            self.unload_model(path)
+        print("All models cleared from cache")
     
     def list_loaded_models(self) -> list:
         """Return list of currently loaded model paths"""
-        return list(self._models.keys())
+        with self._cache_lock.read():
+            return list(self._models.keys())
     
     def get_cache_info(self) -> dict:
         """Get information about cached models"""
-        return {
-            'num_models_loaded': len(self._models),
-            'model_paths': self.list_loaded_models()
-        }
+        with self._cache_lock.read():
+            return {
+                'num_models_loaded': len(self._models),
+                'num_variants_loaded': sum(len(variants) for variants in self._variants.values()),
+                'model_paths': list(self._models.keys())
+            }
 
 
 # Global singleton instance
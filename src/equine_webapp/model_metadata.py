@@ -0,0 +1,86 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import json
+import math
+import os
+
+from equine_webapp.content_store import get_content_hash
+from equine_webapp.model_loading import load_model_save
+
+# the metadata sidecar is saved next to the model file, ex my_model.eq -> my_model.meta.json
+METADATA_FILE_EXT = ".meta.json"
+# sidecars written with an older version are rebuilt when they are read
+METADATA_VERSION = 2
+
+
+def get_metadata_path(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + METADATA_FILE_EXT
+
+def extract_model_metadata(model_path: str) -> dict:
+    """
+    Load a saved EQUINE model file once and extract the small amount of metadata
+    that the server needs to describe the model without loading it again
+    """
+    # the tensors are memory-mapped, so only the support's shapes are read, not its data
+    model_save = load_model_save(model_path)
+    train_summary = model_save.get("train_summary") or {}
+    settings = model_save.get("settings") or {}
+    support = model_save.get("support")
+
+    num_features = None
+    feature_shape = None
+    support_sizes = []
+    if support is not None and len(support) > 0:
+        # every dimension after the examples one, ex [1, 28, 28] for images, which have 784 features
+        feature_shape = list(next(iter(support.values())).shape[1:])
+        num_features = math.prod(feature_shape)
+        support_sizes = [{"label": label, "num_examples": len(examples)} for label, examples in support.items()]
+
+    feature_names = model_save.get("feature_names")
+    if num_features is None and feature_names is not None:
+        num_features = len(feature_names)
+
+    return {
+        "version": METADATA_VERSION,
+        "model_file": os.path.basename(model_path),
+        "model_mtime": os.path.getmtime(model_path),
+        "content_hash": get_content_hash(model_path),
+        "model_size": os.path.getsize(model_path),
+        "model_type": train_summary.get("modelType"),
+        "date_trained": train_summary.get("dateTrained"),
+        "train_summary": train_summary,
+        "label_names": model_save.get("label_names"),
+        "feature_names": feature_names,
+        "num_features": num_features,
+        "feature_shape": feature_shape,
+        "emb_out_dim": settings.get("emb_out_dim"),
+        "num_classes": settings.get("num_classes", len(support_sizes) if support_sizes else None),
+        "support_sizes": support_sizes,
+    }
+
+def write_model_metadata(model_path: str) -> dict:
+    """Extract the model's metadata and save it to the sidecar file"""
+    metadata = extract_model_metadata(model_path)
+    metadata_path = get_metadata_path(model_path)
+    # write to a temporary file first so that readers never see a partial sidecar
+    temp_path = f"{metadata_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(metadata, f)
+    os.replace(temp_path, metadata_path)
+    return metadata
+
+def read_model_metadata(model_path: str) -> dict:
+    """
+    Read the model's metadata from its sidecar file.
+    The sidecar is (re)built if it is missing, was written by an older version, or the model file's content has changed since it was written.
+    The content hash is checked rather than the mtime, because a deduplicated upload links to stored content that can be older than the sidecar.
+    """
+    metadata_path = get_metadata_path(model_path)
+    if os.path.isfile(metadata_path):
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        if metadata.get("version") == METADATA_VERSION and metadata.get("content_hash") == get_content_hash(model_path):
+            return metadata
+    print(f"Extracting model metadata for: {model_path}")
+    return write_model_metadata(model_path)
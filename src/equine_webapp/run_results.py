@@ -0,0 +1,213 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import functools
+import json
+import os
+import shutil
+
+import numpy as np
+
+from equine_webapp.utils import SERVER_CONFIG
+
+# the predictions are stored as one .npy column per field so that each can be memory mapped and sliced on its own
+RUN_COLUMNS = ["embeddings", "classes", "ood_scores"]
+RUN_META_FILENAME = "meta.json"
+RUN_SORT_KEYS = ["dataIndex", "ood", "confidence"]
+SAMPLE_CONDITIONS = ["ood", "confident", "confused_class"]
+
+
+def get_run_folder(run_id) -> str:
+    return os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, f"{int(run_id)}_run")
+
+class RunPredictionsWriter:
+    """
+    Write the predictions of a run, batch by batch, into .npy columns in a temporary folder.
+    close() renames the folder into place, so readers only ever see complete runs.
+    """
+
+    def __init__(self, run_id, model_name: str, num_samples: int, file_offsets, version: str):
+        self.run_folder = get_run_folder(run_id)
+        self.temp_folder = self.run_folder + ".tmp"
+        shutil.rmtree(self.temp_folder, ignore_errors=True)
+        os.makedirs(self.temp_folder)
+        self.num_samples = num_samples
+        self.columns = {}
+        self.meta = {
+            "run_id": int(run_id),
+            "model_name": model_name,
+            "num_samples": num_samples,
+            "version": version,
+            "label_names": None,
+            "file_offsets": [[filename, int(start)] for filename, start in file_offsets],
+        }
+
+    def write(self, start_index: int, predictions, label_names):
+        for column in RUN_COLUMNS:
+            # float32 also covers the bf16 and fp16 inference profiles, which numpy can't store
+            values = getattr(predictions, column).detach().float().numpy()
+            if column not in self.columns:
+                self.columns[column] = np.lib.format.open_memmap(
+                    os.path.join(self.temp_folder, f"{column}.npy"),
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(self.num_samples, *values.shape[1:]),
+                )
+            self.columns[column][start_index:start_index + len(values)] = values
+        self.meta["label_names"] = label_names
+
+    def close(self):
+        for values in self.columns.values():
+            values.flush()
+        self.columns = {}
+        with open(os.path.join(self.temp_folder, RUN_META_FILENAME), "w") as f:
+            json.dump(self.meta, f)
+        shutil.rmtree(self.run_folder, ignore_errors=True)
+        os.replace(self.temp_folder, self.run_folder)
+
+    def abort(self):
+        self.columns = {}
+        shutil.rmtree(self.temp_folder, ignore_errors=True)
+
+
+def save_run_predictions(run_id, model_name: str, predictions, file_offsets, label_names, version: str):
+    writer = RunPredictionsWriter(run_id, model_name, len(predictions.classes), file_offsets, version)
+    writer.write(0, predictions, label_names)
+    writer.close()
+
+
+class RunPredictions:
+    """The saved predictions of a run. The columns are memory mapped, so only the rows that are used are read"""
+
+    def __init__(self, run_id):
+        run_folder = get_run_folder(run_id)
+        meta_path = os.path.join(run_folder, RUN_META_FILENAME)
+        if not os.path.isfile(meta_path):
+            raise ValueError(f"Run {run_id} has no saved predictions")
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        self.run_id = self.meta["run_id"]
+        self.model_name = self.meta["model_name"]
+        self.num_samples = self.meta["num_samples"]
+        self.version = self.meta["version"]
+        self.label_names = self.meta["label_names"]
+        self.embeddings = np.load(os.path.join(run_folder, "embeddings.npy"), mmap_mode="r")
+        self.classes = np.load(os.path.join(run_folder, "classes.npy"), mmap_mode="r")
+        self.ood_scores = np.load(os.path.join(run_folder, "ood_scores.npy"), mmap_mode="r")
+        self.file_names = [filename for filename, _ in self.meta["file_offsets"]]
+        self.file_starts = np.array([start for _, start in self.meta["file_offsets"]], dtype=np.int64)
+
+    def get_labels(self):
+        return self.label_names if self.label_names is not None else [str(label_idx) for label_idx in range(self.classes.shape[1])]
+
+    @functools.cached_property
+    def predicted_classes(self):
+        return np.argmax(self.classes, axis=1)
+
+    @functools.cached_property
+    def confidences(self):
+        """The confidence of each sample's predicted class"""
+        return np.max(self.classes, axis=1)
+
+    def get_filenames(self, data_indices):
+        return [self.file_names[file_idx] for file_idx in np.searchsorted(self.file_starts, data_indices, side="right") - 1]
+
+    def format_samples(self, data_indices):
+        """Serialize the given samples in the same format as runInference"""
+        data_indices = np.asarray(data_indices, dtype=np.int64)
+        classes = self.classes[data_indices].tolist()
+        embeddings = self.embeddings[data_indices].tolist()
+        ood_scores = self.ood_scores[data_indices].tolist()
+        filenames = self.get_filenames(data_indices)
+        labels = self.get_labels()
+        return [{
+            "coordinates": embeddings[idx],
+            "input_data": {
+                "file": filenames[idx],
+                "data_index": int(data_index),
+            },
+            "labels": [{
+                "label": labels[label_idx],
+                "confidence": d,
+            } for label_idx, d in enumerate(classes[idx])],
+            "ood": ood_scores[idx],
+        } for idx, data_index in enumerate(data_indices)]
+
+
+def get_sample_conditions(ood_scores, classes, outlier_tolerance: float, class_confidence_threshold: float):
+    """
+    The ScatterUQ condition of each sample, as an index into SAMPLE_CONDITIONS:
+    ood if its ood score is above outlier_tolerance, else confident if any class confidence is above
+    class_confidence_threshold, else confused_class
+    """
+    conditions = np.full(len(ood_scores), SAMPLE_CONDITIONS.index("confused_class"))
+    conditions[np.max(classes, axis=1) > class_confidence_threshold] = SAMPLE_CONDITIONS.index("confident")
+    conditions[np.asarray(ood_scores) > outlier_tolerance] = SAMPLE_CONDITIONS.index("ood")
+    return conditions
+
+def filter_run_samples(
+    run: RunPredictions,
+    min_ood=None,
+    max_ood=None,
+    predicted_labels=None,
+    min_confidence=None,
+    max_confidence=None,
+    condition=None,
+    outlier_tolerance=0.5,
+    class_confidence_threshold=0.5,
+):
+    """The data indices of the samples that match every given filter. The confidence is the predicted class's confidence"""
+    mask = np.ones(run.num_samples, dtype=bool)
+    if min_ood is not None:
+        mask &= run.ood_scores >= min_ood
+    if max_ood is not None:
+        mask &= run.ood_scores <= max_ood
+    if predicted_labels is not None:
+        labels = run.get_labels()
+        unknown_labels = set(predicted_labels) - set(labels)
+        if len(unknown_labels) > 0:
+            raise ValueError(f"Run {run.run_id} has no labels {sorted(unknown_labels)}")
+        mask &= np.isin(run.predicted_classes, [labels.index(label) for label in predicted_labels])
+    if min_confidence is not None:
+        mask &= run.confidences >= min_confidence
+    if max_confidence is not None:
+        mask &= run.confidences <= max_confidence
+    if condition is not None:
+        if condition not in SAMPLE_CONDITIONS:
+            raise ValueError(f"condition must be one of {SAMPLE_CONDITIONS}")
+        mask &= get_sample_conditions(run.ood_scores, run.classes, outlier_tolerance, class_confidence_threshold) == SAMPLE_CONDITIONS.index(condition)
+    return np.flatnonzero(mask)
+
+def sort_run_samples(run: RunPredictions, data_indices, sort_by="dataIndex", descending=False, limit=None):
+    """
+    Order the data indices by sort_by, breaking ties by data index, and return the first limit of them.
+    Only the first limit samples are fully sorted, so asking for the top k of a large run is cheap
+    """
+    if sort_by not in RUN_SORT_KEYS:
+        raise ValueError(f"sortBy must be one of {RUN_SORT_KEYS}")
+    data_indices = np.asarray(data_indices, dtype=np.int64)
+    if sort_by == "dataIndex":
+        ordered = data_indices[::-1] if descending else data_indices
+        return ordered[:limit] if limit is not None else ordered
+
+    keys = np.asarray(run.ood_scores if sort_by == "ood" else run.confidences)[data_indices]
+    if descending:
+        keys = -keys
+    if limit is not None and limit < len(data_indices):
+        # every sample at or below the limit'th smallest key, which includes any ties at the boundary
+        kth_key = np.partition(keys, limit - 1)[limit - 1] if limit > 0 else -np.inf
+        candidates = np.flatnonzero(keys <= kth_key)
+        data_indices, keys = data_indices[candidates], keys[candidates]
+    ordered = data_indices[np.lexsort((data_indices, keys))]
+    return ordered[:limit] if limit is not None else ordered
+
+def get_histogram(values, num_bins: int):
+    """Count the values (ood scores or confidences, which are in [0, 1]) in num_bins equal width bins"""
+    if num_bins <= 0:
+        raise ValueError("histogramBins must be positive")
+    counts, bin_edges = np.histogram(values, bins=num_bins, range=(0.0, 1.0))
+    return {"bin_edges": bin_edges.tolist(), "counts": counts.tolist()}
+
+
+def load_run_predictions(run_id) -> RunPredictions:
+    return RunPredictions(run_id)
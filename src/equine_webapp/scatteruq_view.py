@@ -0,0 +1,46 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from equine_webapp.run_results import SAMPLE_CONDITIONS, RunPredictions, get_sample_conditions
+from equine_webapp.support_index import SupportIndex
+
+
+def gather_scatteruq_view_points(
+    run: RunPredictions,
+    data_index: int,
+    support_index: SupportIndex,
+    prototypes,
+    outlier_tolerance: float,
+    class_confidence_threshold: float,
+):
+    """
+    Gather the latent embeddings that ScatterUQ lays out to visualize one inference sample: the sample, then the
+    prototype and support examples of its most confident class, plus those of its second most confident class
+    when the model is confused between classes.
+    Returns the sample's condition, the labels of the gathered classes, the points (in the order of the data rows),
+    and the data to run dimensionality reduction on.
+    """
+    if data_index < 0 or data_index >= run.num_samples:
+        raise ValueError(f"Data index {data_index} is out of range for run {run.run_id} with {run.num_samples} samples")
+    classes = np.asarray(run.classes[data_index:data_index + 1])
+    ood_scores = np.asarray(run.ood_scores[data_index:data_index + 1])
+    condition = SAMPLE_CONDITIONS[get_sample_conditions(ood_scores, classes, outlier_tolerance, class_confidence_threshold)[0]]
+
+    # the classes ordered by decreasing confidence, ties broken by class index
+    num_classes = 1 if condition in ["ood", "confident"] else 2
+    label_idxs = np.lexsort((np.arange(classes.shape[1]), -classes[0]))[:num_classes].tolist()
+
+    data = [run.embeddings[data_index].astype(float)]
+    points = [{"kind": "sample", "label": None, "data_index": data_index}]
+    for label_idx in label_idxs:
+        label = support_index.get_label_name(label_idx)
+        data.append(prototypes[label_idx].detach().double().numpy())
+        points.append({"kind": "prototype", "label": label, "data_index": None})
+
+        support_data_indices = np.flatnonzero(support_index.labels == label_idx)
+        data += list(support_index.embeddings[support_data_indices].astype(float))
+        points += [{"kind": "support", "label": label, "data_index": int(support_data_index)} for support_data_index in support_data_indices]
+
+    return condition, [support_index.get_label_name(label_idx) for label_idx in label_idxs], points, np.stack(data)
@@ -0,0 +1,163 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import math
+import os
+import threading
+import time
+from typing import Optional
+
+import torch
+
+from equine_webapp.admission import admission_control
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.utils import SERVER_CONFIG, get_model_path
+
+SERVER_PROFILE_FIELDS = ["server_threads", "torch_threads", "torch_interop_threads", "dr_n_jobs", "inference_max_concurrent"]
+# waitress's own default, kept free for requests that don't compute (ex feature data, images)
+NON_COMPUTE_SERVER_THREADS = 4
+CALIBRATION_BATCH_SIZE = 256
+CALIBRATION_SECONDS = 1.0
+
+
+def get_num_cores() -> int:
+    """The number of cores that this process may run on, which can be fewer than the machine's (ex in a container)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def get_server_threads(inference_max_concurrent: int) -> int:
+    """
+    Enough waitress threads for every admitted computation, a full admission queue, and the requests that don't compute.
+    With fewer, excess requests would wait in waitress's socket backlog, where admission control can't answer them with 429
+    """
+    return (
+        inference_max_concurrent
+        + SERVER_CONFIG.DR_MAX_CONCURRENT
+        + SERVER_CONFIG.TRAINING_MAX_CONCURRENT
+        + SERVER_CONFIG.ADMISSION_MAX_QUEUED
+        + NON_COMPUTE_SERVER_THREADS
+    )
+
+def get_balanced_server_profile(num_cores: int, torch_threads: Optional[int] = None, inference_max_concurrent: Optional[int] = None) -> dict:
+    """
+    A server profile that keeps the cores busy without oversubscribing them.
+    Each computation runs torch_threads intra-op threads (by default about the square root of the cores, which balances
+    the latency of one request against the throughput of many), and admission control lets num_cores // torch_threads
+    inference computations run at once. Dimensionality reduction fits share the cores between DR_MAX_CONCURRENT fits.
+    """
+    if torch_threads is None:
+        torch_threads = max(1, round(math.sqrt(num_cores)))
+    if inference_max_concurrent is None:
+        inference_max_concurrent = max(1, num_cores // torch_threads)
+    return {
+        "server_threads": get_server_threads(inference_max_concurrent),
+        "torch_threads": torch_threads,
+        # requests are parallelized by the server threads, so torch doesn't need a pool of inter-op threads too
+        "torch_interop_threads": 1,
+        "dr_n_jobs": max(1, num_cores // max(1, SERVER_CONFIG.DR_MAX_CONCURRENT)),
+        "inference_max_concurrent": inference_max_concurrent,
+    }
+
+def get_configured_server_profile() -> dict:
+    """The parts of the server profile that are set in the environment"""
+    configured = {
+        "server_threads": SERVER_CONFIG.SERVER_THREADS,
+        "torch_threads": SERVER_CONFIG.TORCH_NUM_THREADS if SERVER_CONFIG.TORCH_NUM_THREADS is not None else SERVER_CONFIG.INFERENCE_NUM_THREADS,
+        "torch_interop_threads": SERVER_CONFIG.TORCH_NUM_INTEROP_THREADS,
+        "dr_n_jobs": SERVER_CONFIG.UMAP_N_JOBS if "UMAP_N_JOBS" in os.environ else None,
+        "inference_max_concurrent": SERVER_CONFIG.INFERENCE_MAX_CONCURRENT if "INFERENCE_MAX_CONCURRENT" in os.environ else None,
+    }
+    return {field: value for field, value in configured.items() if value is not None}
+
+def measure_throughput(model, X: torch.Tensor, torch_threads: int, num_workers: int, seconds: float) -> float:
+    """The samples per second that num_workers threads predict on the model at once, each with torch_threads intra-op threads"""
+    torch.set_num_threads(torch_threads)
+    num_predicted = [0]*num_workers
+    errors = []
+    end_time = time.monotonic() + seconds
+
+    def predict(worker_idx):
+        try:
+            with torch.no_grad():
+                while time.monotonic() < end_time:
+                    model.predict(X)
+                    num_predicted[worker_idx] += len(X)
+        except Exception as e:
+            errors.append(e)
+
+    start_time = time.monotonic()
+    workers = [threading.Thread(target=predict, args=(worker_idx,)) for worker_idx in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if len(errors) > 0:
+        raise errors[0]
+    return sum(num_predicted) / (time.monotonic() - start_time)
+
+def calibrate_torch_threads(model_path: str, num_cores: int, seconds: float = CALIBRATION_SECONDS):
+    """
+    Measure the model's inference throughput with each power of two torch threads, with num_cores // torch_threads
+    concurrent computations, and return the fastest number of torch threads and every measurement.
+    The inputs are the model's own support examples, so no sample file is needed.
+    """
+    model = model_manager.get_model(model_path, load_equine_model)
+    support = torch.cat(list(model.get_support().values()))
+    X = support.repeat(math.ceil(CALIBRATION_BATCH_SIZE / len(support)), *[1]*(support.dim() - 1))[:CALIBRATION_BATCH_SIZE]
+
+    previous_threads = torch.get_num_threads()
+    measurements = []
+    try:
+        torch_threads = 1
+        while torch_threads <= num_cores:
+            num_workers = max(1, num_cores // torch_threads)
+            samples_per_second = measure_throughput(model, X, torch_threads, num_workers, seconds)
+            measurements.append({"torch_threads": torch_threads, "num_workers": num_workers, "samples_per_second": samples_per_second})
+            torch_threads *= 2
+    finally:
+        torch.set_num_threads(previous_threads)
+    best = max(measurements, key=lambda measurement: measurement["samples_per_second"])
+    return best["torch_threads"], measurements
+
+def get_calibration_model_path(model_name: Optional[str] = None) -> Optional[str]:
+    """The model to calibrate on: the given one, or else the first model in the model folder"""
+    if model_name is not None:
+        return get_model_path(model_name)
+    if not os.path.isdir(SERVER_CONFIG.MODEL_FOLDER_PATH):
+        return None
+    model_files = sorted(name for name in os.listdir(SERVER_CONFIG.MODEL_FOLDER_PATH) if name.endswith(SERVER_CONFIG.MODEL_EXT))
+    return get_model_path(model_files[0]) if len(model_files) > 0 else None
+
+def resolve_server_profile(overrides: dict, calibrate: bool = False, calibration_model: Optional[str] = None, num_cores: Optional[int] = None) -> dict:
+    """
+    Build the server profile: the given overrides (ex from the command line) first, then the environment,
+    then the balanced profile, with its torch threads calibrated on a model if calibrate is set
+    """
+    num_cores = num_cores if num_cores is not None else get_num_cores()
+    configured = {**get_configured_server_profile(), **{field: value for field, value in overrides.items() if value is not None}}
+
+    torch_threads = configured.get("torch_threads")
+    if calibrate and torch_threads is None:
+        model_path = get_calibration_model_path(calibration_model)
+        if model_path is None:
+            print("Skipping the server profile calibration because there are no models to calibrate on")
+        else:
+            print(f"Calibrating the server profile on {os.path.basename(model_path)} with {num_cores} cores")
+            torch_threads, measurements = calibrate_torch_threads(model_path, num_cores)
+            for measurement in measurements:
+                print(f"  {measurement['torch_threads']:>3} torch threads x {measurement['num_workers']:>3} workers: {measurement['samples_per_second']:.0f} samples/s")
+
+    return {**get_balanced_server_profile(num_cores, torch_threads, configured.get("inference_max_concurrent")), **configured}
+
+def apply_server_profile(profile: dict):
+    """Configure torch, dimensionality reduction, and admission control for the profile. The server threads are passed to waitress"""
+    torch.set_num_threads(profile["torch_threads"])
+    try:
+        torch.set_num_interop_threads(profile["torch_interop_threads"])
+    except RuntimeError: # torch only allows this before any inter-op work has started
+        print(f"Keeping {torch.get_num_interop_threads()} torch inter-op threads because inter-op work has already started")
+    SERVER_CONFIG.UMAP_N_JOBS = profile["dr_n_jobs"]
+    admission_control.set_operation_limit("inference", profile["inference_max_concurrent"])
+    print("Server profile: " + ", ".join(f"{field}={profile[field]}" for field in SERVER_PROFILE_FIELDS))
@@ -0,0 +1,67 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+import torch
+
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.utils import use_label_names
+
+
+class SupportIndex:
+    """
+    The embeddings and predictions of a model's support examples, with a nearest neighbour
+    index over the embeddings. Support examples are numbered with the same data indices
+    as getPrototypeSupportEmbeddings (in support order, label by label).
+    """
+
+    def __init__(self, model):
+        from sklearn.neighbors import NearestNeighbors
+
+        support_examples = model.get_support()
+        self.label_names = use_label_names(model, len(support_examples.keys()))
+
+        # the support example predictions for each label, in support order
+        self.predictions = {}
+        embeddings = []
+        labels = []
+        with torch.no_grad():
+            for label_idx in support_examples.keys():
+                predictions = model.predict(support_examples[label_idx])
+                self.predictions[label_idx] = predictions
+                embeddings.append(predictions.embeddings.float().numpy())
+                labels += [label_idx]*len(predictions.embeddings)
+
+        self.embeddings = np.concatenate(embeddings, axis=0)
+        self.labels = np.array(labels)
+        self._neighbors = NearestNeighbors().fit(self.embeddings)
+
+    def get_label_name(self, label_idx) -> str:
+        return self.label_names[label_idx] if self.label_names is not None else str(label_idx)
+
+    def query(self, embedding, k: int):
+        """Get the k nearest support examples to an embedding, ordered by increasing distance"""
+        if k <= 0:
+            raise ValueError("k must be positive")
+        embedding = np.asarray(embedding, dtype=self.embeddings.dtype).reshape(1, -1)
+        if embedding.shape[1] != self.embeddings.shape[1]:
+            raise ValueError(f"Embedding has {embedding.shape[1]} dimensions but the support embeddings have {self.embeddings.shape[1]}")
+
+        distances, data_indices = self._neighbors.kneighbors(embedding, n_neighbors=min(k, len(self.embeddings)))
+        return [{
+            "data_index": int(data_index),
+            "label": self.get_label_name(self.labels[data_index]),
+            "distance": float(distance),
+            "coordinates": self.embeddings[data_index].tolist(),
+        } for distance, data_index in zip(distances[0], data_indices[0])]
+
+
+def get_support_index(model_path: str) -> SupportIndex:
+    """Get the model's SupportIndex, which is built on first use and cached with the model"""
+    return model_manager.get_model_variant(
+        model_path,
+        "support_index",
+        SupportIndex,
+        load_equine_model
+    )
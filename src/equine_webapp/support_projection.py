@@ -0,0 +1,82 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.support_index import SupportIndex, get_support_index
+from equine_webapp.umap_runtime import make_umap
+from equine_webapp.utils import SERVER_CONFIG
+
+# the methods that can place new points into an existing layout with transform()
+PROJECTION_METHODS = ["pca", "umap"]
+
+
+class SupportProjection:
+    """
+    A 2D layout of the prototypes and support examples of a set of classes, with the fitted
+    reducer kept so that new samples can be placed into the same layout with transform().
+    """
+
+    def __init__(self, support_index: SupportIndex, prototypes, method: str, labels, n_neighbors: int, random_state: int):
+        if method not in PROJECTION_METHODS:
+            raise ValueError(f"Given projection method '{method}' is not valid. Valid methods are {PROJECTION_METHODS}")
+
+        label_idxs = {support_index.get_label_name(label_idx): label_idx for label_idx in np.unique(support_index.labels)}
+        for label in labels:
+            if label not in label_idxs:
+                raise ValueError(f"Given label '{label}' is not one of the model's labels {list(label_idxs.keys())}")
+        self.method = method
+        self.labels = list(labels)
+
+        # the support examples of the requested classes keep their data indices from the support index
+        label_idxs = [label_idxs[label] for label in self.labels]
+        self.support_data_indices = np.flatnonzero(np.isin(support_index.labels, label_idxs))
+        self.support_labels = [support_index.get_label_name(label_idx) for label_idx in support_index.labels[self.support_data_indices]]
+        prototypes = np.stack([prototypes[label_idx].detach().double().numpy() for label_idx in label_idxs])
+        support_embeddings = support_index.embeddings[self.support_data_indices].astype(float)
+        data = np.concatenate([prototypes, support_embeddings], axis=0)
+
+        high_dimensions = data.shape[1]
+        num_samples = data.shape[0]
+        self.scree = None
+        self.reproducible = True
+        if method == "pca":
+            from sklearn.decomposition import PCA
+            self._reducer = PCA(n_components=min(high_dimensions, num_samples, 5))
+            layout = self._reducer.fit_transform(data)
+            self.scree = self._reducer.explained_variance_ratio_.tolist()
+        else:
+            # densMAP can't transform new points into an existing embedding, so the cached layout uses plain UMAP
+            self._reducer = make_umap(num_samples, random_state=random_state, n_neighbors=min(high_dimensions, num_samples - 1, n_neighbors))
+            layout = self._reducer.fit_transform(data)
+            # large support sets run unseeded in parallel (see equine_webapp.umap_runtime)
+            self.reproducible = self._reducer.random_state is not None
+
+        layout = layout[:, 0:2]
+        self.prototypes = layout[:len(prototypes)]
+        self.support_examples = layout[len(prototypes):]
+
+    def transform(self, embeddings) -> np.ndarray:
+        """Place new embeddings into the layout"""
+        embeddings = np.asarray(embeddings, dtype=float)
+        if len(embeddings) == 0:
+            return np.zeros((0, 2))
+        return self._reducer.transform(embeddings)[:, 0:2]
+
+
+def get_support_projection(model_path: str, method: str, labels, n_neighbors: int = 15, random_state: int = 42) -> SupportProjection:
+    """Get the model's SupportProjection for this class set, which is fit on first use and cached with the model"""
+    labels = sorted(labels)
+    support_index = get_support_index(model_path)
+    # PCA doesn't depend on n_neighbors or random_state, so every PCA request on a class set shares one layout
+    layout_settings = "" if method == "pca" else f"{n_neighbors}:{random_state}"
+    # the keys come from the client, so only the most recently used layouts of each model are kept
+    return model_manager.get_model_variant(
+        model_path,
+        f"projection:{method}:{layout_settings}:{','.join(labels)}",
+        lambda model: SupportProjection(support_index, model.get_prototypes(), method, labels, n_neighbors, random_state),
+        load_equine_model,
+        max_group_size=SERVER_CONFIG.SUPPORT_PROJECTION_CACHE_SIZE
+    )
@@ -0,0 +1,87 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.datasets import make_blobs
+
+import equine as eq
+from equine_webapp.utils import SERVER_CONFIG
+
+# the scales that the benchmarks are run at. image scales have 1 channel square images of num_features pixels
+BENCHMARK_SCALES = {
+    "small": {"num_features": 8, "num_classes": 4, "support_size": 20, "num_samples": 500, "emb_out_dim": 8, "image": False},
+    "medium": {"num_features": 64, "num_classes": 10, "support_size": 50, "num_samples": 5000, "emb_out_dim": 32, "image": False},
+    "large": {"num_features": 256, "num_classes": 20, "support_size": 100, "num_samples": 20000, "emb_out_dim": 64, "image": False},
+    "xlarge": {"num_features": 1024, "num_classes": 20, "support_size": 250, "num_samples": 5000, "emb_out_dim": 128, "image": False},
+    "image": {"num_features": 28*28, "num_classes": 10, "support_size": 25, "num_samples": 2000, "emb_out_dim": 32, "image": True},
+}
+
+# the models are only trained for a few episodes because the benchmarks measure speed, not accuracy
+NUM_TRAIN_EPISODES = 10
+
+
+def get_benchmark_model_name(scale_name: str) -> str:
+    return f"benchmark_{scale_name}{SERVER_CONFIG.MODEL_EXT}"
+
+def get_benchmark_samples_filename(scale_name: str, image: bool) -> str:
+    return f"benchmark_{scale_name}_samples" + (".pt" if image else ".csv")
+
+def make_synthetic_data(scale: dict, num_samples: int, seed: int):
+    X, Y = make_blobs(n_samples=num_samples, n_features=scale["num_features"], centers=scale["num_classes"], random_state=seed)
+    X = torch.tensor(X, dtype=torch.float32)
+    if scale["image"]:
+        # scale the blobs into pixel values so that the samples can be rendered as images
+        side = int(math.sqrt(scale["num_features"]))
+        X = ((X - X.min()) / (X.max() - X.min()) * 255).reshape(-1, 1, side, side)
+    return X, torch.tensor(Y)
+
+def make_embedding_model(scale: dict) -> torch.nn.Module:
+    hidden_dim = max(scale["emb_out_dim"], 32)
+    return torch.nn.Sequential(
+        torch.nn.Flatten(),
+        torch.nn.Linear(scale["num_features"], hidden_dim),
+        torch.nn.ReLU(),
+        torch.nn.Linear(hidden_dim, scale["emb_out_dim"]),
+    )
+
+def make_synthetic_model(scale_name: str):
+    """
+    Train and save a synthetic EquineProtonet and an unlabelled sample file for this scale, if they don't already exist.
+    Returns the model name and the sample filename.
+    """
+    scale = BENCHMARK_SCALES[scale_name]
+    model_name = get_benchmark_model_name(scale_name)
+    samples_filename = get_benchmark_samples_filename(scale_name, scale["image"])
+    model_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, model_name)
+    samples_path = os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, samples_filename)
+
+    if not os.path.isfile(model_path):
+        torch.manual_seed(52)
+        num_train = scale["num_classes"] * scale["support_size"] * 4
+        train_x, train_y = make_synthetic_data(scale, num_train, seed=52)
+        model = eq.EquineProtonet(make_embedding_model(scale), emb_out_dim=scale["emb_out_dim"])
+        model.train_model(
+            torch.utils.data.TensorDataset(train_x, train_y),
+            way=min(scale["num_classes"], 4),
+            support_size=scale["support_size"],
+            num_episodes=NUM_TRAIN_EPISODES,
+            episode_size=100,
+        )
+        model.save(model_path)
+
+    if not os.path.isfile(samples_path):
+        samples_x, _ = make_synthetic_data(scale, scale["num_samples"], seed=53)
+        if scale["image"]:
+            torch.save(samples_x, samples_path)
+        else:
+            pd.DataFrame(samples_x.numpy()).to_csv(samples_path, index=False)
+
+    return model_name, samples_filename
+
+def make_embedding_points(num_points: int, num_dims: int, seed: int = 0):
+    """Random points for the dimensionality reduction benchmarks"""
+    return np.random.default_rng(seed).normal(size=(num_points, num_dims)).tolist()
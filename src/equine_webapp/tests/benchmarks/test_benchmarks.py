@@ -0,0 +1,236 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+"""
+End to end resolver benchmarks through the Flask test client, at the scales in synthetic_models.BENCHMARK_SCALES.
+They are skipped unless EQUINE_BENCHMARK=True, ex
+
+    EQUINE_BENCHMARK=True pytest src/equine_webapp/tests/benchmarks -s
+
+Each benchmark's median time is compared to the stored baseline (EQUINE_BENCHMARK_BASELINE, by default
+baseline.json next to this file) and fails if it is more than EQUINE_BENCHMARK_THRESHOLD times slower.
+Benchmarks that have no baseline yet are recorded. Set EQUINE_BENCHMARK_UPDATE=True to overwrite the baseline.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import equine as eq
+
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.model_metadata import get_metadata_path
+from equine_webapp.tests.benchmarks.synthetic_models import BENCHMARK_SCALES, get_benchmark_model_name, get_benchmark_samples_filename, make_embedding_points, make_synthetic_model
+from equine_webapp.utils import SERVER_CONFIG
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("EQUINE_BENCHMARK", "False").lower() not in ["true", "1", "t"],
+    reason="set EQUINE_BENCHMARK=True to run the benchmarks"
+)
+
+BASELINE_PATH = os.environ.get("EQUINE_BENCHMARK_BASELINE", os.path.join(os.path.dirname(__file__), "baseline.json"))
+REGRESSION_THRESHOLD = float(os.environ.get("EQUINE_BENCHMARK_THRESHOLD", 1.5))
+UPDATE_BASELINE = os.environ.get("EQUINE_BENCHMARK_UPDATE", "False").lower() in ["true", "1", "t"]
+# regressions smaller than this are timer noise
+MIN_REGRESSION_SECONDS = 0.005
+NUM_REPEATS = 5
+
+DR_METHODS = ["pca", "tsne", "mds", "umap"]
+# equine's own loader, which unpickles the model file twice, and the server's memory-mapped loader
+MODEL_LOADERS = {"equine": eq.load_equine_model, "mmap": load_equine_model}
+# times one load of a model in a new process, which has the libraries imported but nothing else loaded
+COLD_LOAD_SCRIPT = """
+import sys, time
+import equine as eq
+from equine_webapp.model_loading import load_equine_model
+load = {"equine": eq.load_equine_model, "mmap": load_equine_model}[sys.argv[1]]
+start_time = time.perf_counter()
+load(sys.argv[2])
+print(time.perf_counter() - start_time)
+"""
+# times combining sample files in a new process, and reports its peak memory growth in MB.
+# "concat" is how the files were combined before data_files.combine_data_files: each file is read whole, then torch.concat copies them
+COMBINE_SCRIPT = """
+import resource, sys, time
+import pandas as pd
+import torch
+from equine_webapp.data_files import combine_data_files
+def combine_with_concat(file_paths):
+    return torch.concat([torch.from_numpy(pd.read_csv(file_path).to_numpy()) for file_path in file_paths])
+combine = {"preallocated": combine_data_files, "concat": combine_with_concat}[sys.argv[1]]
+# the peak memory is measured from the resident memory after the imports, which can be below the imports' own peak
+with open("/proc/self/statm") as f:
+    start_rss = int(f.read().split()[1])*resource.getpagesize()/1024
+start_time = time.perf_counter()
+combine(sys.argv[2:])
+print(time.perf_counter() - start_time, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss)/1024)
+"""
+COMBINE_NUM_FILES = 8
+COMBINE_FILE_SHAPE = (20000, 64)
+DR_NUM_POINTS = {"small": 100, "medium": 500, "large": 2000}
+
+RUN_INFERENCE_QUERY = """
+    mutation RunInference($modelName: String!, $sampleFilenames: [String]!) {
+      runInference(modelName: $modelName, sampleFilenames: $sampleFilenames) {
+        runId
+        samples { coordinates ood labels { label confidence } inputData { dataIndex } }
+      }
+    }
+"""
+SUPPORT_EMBEDDINGS_QUERY = """
+    query GetPrototypeSupportEmbeddings($modelName: String!) {
+      getPrototypeSupportEmbeddings(modelName: $modelName) {
+        label
+        prototype
+        trainingExamples { coordinates ood labels { label confidence } inputData { dataIndex } }
+      }
+    }
+"""
+MODEL_SUMMARY_QUERY = """
+    query ModelSummary($modelName: String!) {
+      modelSummary(modelName: $modelName) { dateTrained modelType numFeatures numTrainExamples { label numExamples } }
+    }
+"""
+FEATURE_DATA_QUERY = """
+    query RenderInferenceFeatureData($runId: Int!, $modelName: String!, $dataIndex: Int!) {
+      renderInferenceFeatureData(runId: $runId, modelName: $modelName, dataIndex: $dataIndex) { featureData columnHeaders }
+    }
+"""
+DIMENSIONALITY_REDUCTION_QUERY = """
+    query DimensionalityReduction($method: String!, $data: [[Float!]!]!, $nNeighbors: Int!) {
+      dimensionalityReduction(method: $method, data: $data, nNeighbors: $nNeighbors) { embeddings trustworthiness }
+    }
+"""
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline():
+    baseline = {}
+    if os.path.isfile(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    results = {}
+    yield baseline, results
+
+    # record the new benchmarks, and every benchmark when updating
+    new_baseline = {**baseline, **(results if UPDATE_BASELINE else {k: v for k, v in results.items() if k not in baseline})}
+    if new_baseline != baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(new_baseline, f, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def remove_synthetic_models():
+    yield
+    # keep the other tests' view of the model folder unchanged
+    for scale_name, scale in BENCHMARK_SCALES.items():
+        model_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, get_benchmark_model_name(scale_name))
+        model_manager.unload_model(model_path)
+        model_catalog.remove_model(os.path.basename(model_path))
+        for path in [model_path, get_metadata_path(model_path), os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, get_benchmark_samples_filename(scale_name, scale["image"]))]:
+            if os.path.isfile(path):
+                os.remove(path)
+
+
+def post_graphql(client, query, variables):
+    response = client.post("/graphql", json={"query": query, "variables": variables})
+    assert response.status_code == 200, response.json
+    assert "errors" not in response.json, response.json["errors"]
+    return response.json["data"]
+
+def time_request(make_request):
+    """The median seconds of NUM_REPEATS requests, after one untimed request to load models and caches"""
+    make_request()
+    times = []
+    for _ in range(NUM_REPEATS):
+        start_time = time.perf_counter()
+        make_request()
+        times.append(time.perf_counter() - start_time)
+    return statistics.median(times)
+
+def check_benchmark(benchmark_baseline, record_property, name, seconds):
+    baseline, results = benchmark_baseline
+    results[name] = seconds
+    record_property(name, seconds)
+    print(f"{name}: {seconds*1000:.2f}ms")
+    if name in baseline and not UPDATE_BASELINE:
+        limit = max(baseline[name]*REGRESSION_THRESHOLD, baseline[name] + MIN_REGRESSION_SECONDS)
+        assert seconds <= limit, f"{name} took {seconds*1000:.2f}ms, more than {REGRESSION_THRESHOLD}x its baseline of {baseline[name]*1000:.2f}ms"
+
+
+@pytest.mark.parametrize("scale_name", BENCHMARK_SCALES.keys())
+def test_benchmark_model_resolvers(client, benchmark_baseline, record_property, scale_name):
+    model_name, samples_filename = make_synthetic_model(scale_name)
+    variables = {"modelName": model_name}
+
+    seconds = time_request(lambda: post_graphql(client, RUN_INFERENCE_QUERY, {**variables, "sampleFilenames": [samples_filename]}))
+    check_benchmark(benchmark_baseline, record_property, f"{scale_name}/runInference", seconds)
+
+    seconds = time_request(lambda: post_graphql(client, SUPPORT_EMBEDDINGS_QUERY, variables))
+    check_benchmark(benchmark_baseline, record_property, f"{scale_name}/getPrototypeSupportEmbeddings", seconds)
+
+    seconds = time_request(lambda: post_graphql(client, MODEL_SUMMARY_QUERY, variables))
+    check_benchmark(benchmark_baseline, record_property, f"{scale_name}/modelSummary", seconds)
+
+    run_id = post_graphql(client, RUN_INFERENCE_QUERY, {**variables, "sampleFilenames": [samples_filename]})["runInference"]["runId"]
+    if BENCHMARK_SCALES[scale_name]["image"]:
+        def render_image():
+            response = client.get(f"/api/render-image/inference/{run_id}/0")
+            assert response.status_code == 200
+        seconds = time_request(render_image)
+        check_benchmark(benchmark_baseline, record_property, f"{scale_name}/renderInferenceImage", seconds)
+    else:
+        seconds = time_request(lambda: post_graphql(client, FEATURE_DATA_QUERY, {**variables, "runId": run_id, "dataIndex": 0}))
+        check_benchmark(benchmark_baseline, record_property, f"{scale_name}/renderInferenceFeatureData", seconds)
+
+
+@pytest.mark.parametrize("scale_name", DR_NUM_POINTS.keys())
+@pytest.mark.parametrize("method", DR_METHODS)
+def test_benchmark_dimensionality_reduction(client, benchmark_baseline, record_property, scale_name, method):
+    data = make_embedding_points(DR_NUM_POINTS[scale_name], BENCHMARK_SCALES[scale_name]["emb_out_dim"])
+    seconds = time_request(lambda: post_graphql(client, DIMENSIONALITY_REDUCTION_QUERY, {"method": method, "data": data, "nNeighbors": 15}))
+    check_benchmark(benchmark_baseline, record_property, f"{scale_name}/dimensionalityReduction/{method}", seconds)
+
+
+@pytest.mark.parametrize("scale_name", BENCHMARK_SCALES.keys())
+@pytest.mark.parametrize("loader_name", MODEL_LOADERS.keys())
+def test_benchmark_model_loading(benchmark_baseline, record_property, scale_name, loader_name):
+    model_name, _ = make_synthetic_model(scale_name)
+    model_path = os.path.abspath(os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, model_name))
+
+    # a cold load is a model cache miss in a newly started server process
+    cold_times = []
+    for _ in range(NUM_REPEATS):
+        result = subprocess.run([sys.executable, "-c", COLD_LOAD_SCRIPT, loader_name, model_path], capture_output=True, text=True, check=True)
+        cold_times.append(float(result.stdout.strip().splitlines()[-1]))
+    check_benchmark(benchmark_baseline, record_property, f"{scale_name}/loadModel/{loader_name}/cold", statistics.median(cold_times))
+
+    # a warm load is a cache miss in a process that has already loaded models, with the file in the page cache
+    seconds = time_request(lambda: MODEL_LOADERS[loader_name](model_path))
+    check_benchmark(benchmark_baseline, record_property, f"{scale_name}/loadModel/{loader_name}/warm", seconds)
+
+
+def test_benchmark_combine_data_files(benchmark_baseline, record_property):
+    file_paths = [os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, f"benchmark_combine_{file_idx}.csv") for file_idx in range(COMBINE_NUM_FILES)]
+    for file_path in file_paths:
+        pd.DataFrame(np.random.default_rng(0).standard_normal(COMBINE_FILE_SHAPE)).to_csv(file_path, index=False)
+    try:
+        peak_mb = {}
+        for combine_name in ["preallocated", "concat"]:
+            result = subprocess.run([sys.executable, "-c", COMBINE_SCRIPT, combine_name, *file_paths], capture_output=True, text=True, check=True)
+            seconds, peak_mb[combine_name] = map(float, result.stdout.strip().splitlines()[-1].split())
+            record_property(f"combineDataFiles/{combine_name}/peakMB", peak_mb[combine_name])
+            print(f"combineDataFiles/{combine_name}: peak memory +{peak_mb[combine_name]:.0f}MB")
+            check_benchmark(benchmark_baseline, record_property, f"combineDataFiles/{combine_name}", seconds)
+    finally:
+        for file_path in file_paths:
+            os.remove(file_path)
+
+    # the combined samples take COMBINE_NUM_FILES*rows*columns*8 bytes, which concat holds twice
+    assert peak_mb["preallocated"] < peak_mb["concat"]
@@ -0,0 +1,102 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+import threading
+import time
+
+import pytest
+
+from equine_webapp.admission import AdmissionRejected, ConcurrencyLimiter, admission_control
+from equine_webapp.model_manager import ReadWriteLock
+
+DIMENSIONALITY_REDUCTION_QUERY = """
+    query DimensionalityReduction($data: [[Float!]!]!) {
+      dimensionalityReduction(method: "pca", data: $data, nNeighbors: 2) { trustworthiness }
+    }
+"""
+
+
+def hold_slot(limiter, acquired, release):
+    with limiter.acquire():
+        acquired.set()
+        release.wait()
+
+
+def test_concurrency_limiter():
+    limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queued=1, queue_timeout=10)
+    acquired, release = threading.Event(), threading.Event()
+    holder = threading.Thread(target=hold_slot, args=(limiter, acquired, release))
+    holder.start()
+    acquired.wait()
+
+    # the next caller waits in the queue until the slot is released
+    waiter_acquired = threading.Event()
+    waiter = threading.Thread(target=hold_slot, args=(limiter, waiter_acquired, release))
+    waiter.start()
+    time.sleep(0.1)
+    assert not waiter_acquired.is_set()
+
+    # the queue is full, so the caller after that is rejected without waiting
+    with pytest.raises(AdmissionRejected) as rejected:
+        with limiter.acquire():
+            pass
+    assert rejected.value.retry_after >= 1
+
+    release.set()
+    assert waiter_acquired.wait(5)
+    holder.join(5)
+    waiter.join(5)
+
+
+def test_concurrency_limiter_queue_timeout():
+    limiter = ConcurrencyLimiter("test", max_concurrent=1, max_queued=1, queue_timeout=0.1)
+    with limiter.acquire():
+        start_time = time.monotonic()
+        with pytest.raises(AdmissionRejected):
+            with limiter.acquire():
+                pass
+        assert time.monotonic() - start_time >= 0.1
+    # the slot is free again
+    with limiter.acquire():
+        pass
+
+
+def test_graphql_too_many_requests(client, monkeypatch):
+    limiter = ConcurrencyLimiter("dr", max_concurrent=1, max_queued=0, queue_timeout=0)
+    monkeypatch.setitem(admission_control._operation_limiters, "dr", limiter)
+    variables = {"data": [[0, 1, 2], [1, 2, 0], [2, 0, 1], [1, 1, 1]]}
+
+    with limiter.acquire():
+        response = client.post("/graphql", json={"query": DIMENSIONALITY_REDUCTION_QUERY, "variables": variables})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.json["errors"][0]["extensions"]["code"] == "TOO_MANY_REQUESTS"
+
+    response = client.post("/graphql", json={"query": DIMENSIONALITY_REDUCTION_QUERY, "variables": variables})
+    assert response.status_code == 200
+    assert "errors" not in response.json
+
+
+def test_read_write_lock():
+    lock = ReadWriteLock()
+    written = threading.Event()
+
+    def read():
+        with lock.read():
+            pass
+
+    def write():
+        with lock.write():
+            written.set()
+
+    with lock.read():
+        # readers share the lock
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(5)
+        assert not reader.is_alive()
+        # a writer waits for the readers
+        writer = threading.Thread(target=write)
+        writer.start()
+        assert not written.wait(0.1)
+    assert written.wait(5)
+    writer.join(5)
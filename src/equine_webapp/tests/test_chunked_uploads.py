@@ -0,0 +1,107 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import hashlib
+import os
+
+from equine_webapp.chunked_uploads import chunked_uploads
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_manager import model_manager
+from equine_webapp.model_metadata import get_metadata_path
+from equine_webapp.utils import SERVER_CONFIG, get_model_path
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+CHUNK_BYTES = 100_000
+
+
+def put_chunk(client, upload_id, offset, data, chunk_sha256=None):
+    headers = {"Content-Type": "application/octet-stream"}
+    if chunk_sha256 is not None:
+        headers["X-Chunk-SHA256"] = chunk_sha256
+    return client.put(f"/api/uploads/{upload_id}", query_string={"offset": offset}, data=data, headers=headers)
+
+
+def test_chunked_upload_resumes(client):
+    content = os.urandom(5*CHUNK_BYTES + 123)
+    response = client.post("/api/uploads", json={"filename": "chunked_test.bin", "size": len(content), "sha256": hashlib.sha256(content).hexdigest()})
+    assert response.status_code == 201
+    upload_id = response.json["uploadId"]
+
+    # send two chunks, then lose the connection partway through the third
+    for offset in [0, CHUNK_BYTES]:
+        assert put_chunk(client, upload_id, offset, content[offset:offset + CHUNK_BYTES]).json["offset"] == offset + CHUNK_BYTES
+    # a corrupted chunk is rejected and not counted
+    corrupted = bytes(CHUNK_BYTES)
+    response = put_chunk(client, upload_id, 2*CHUNK_BYTES, corrupted, hashlib.sha256(content[2*CHUNK_BYTES:3*CHUNK_BYTES]).hexdigest())
+    assert response.status_code == 422
+    # chunks can't leave a gap, and finalizing early fails
+    assert put_chunk(client, upload_id, 4*CHUNK_BYTES, content[4*CHUNK_BYTES:]).status_code == 409
+    assert client.post(f"/api/uploads/{upload_id}/finalize").status_code == 409
+
+    # resume from the offset that the server reports
+    offset = client.get(f"/api/uploads/{upload_id}").json["offset"]
+    assert offset == 2*CHUNK_BYTES
+    while offset < len(content):
+        chunk = content[offset:offset + CHUNK_BYTES]
+        offset = put_chunk(client, upload_id, offset, chunk, hashlib.sha256(chunk).hexdigest()).json["offset"]
+
+    response = client.post(f"/api/uploads/{upload_id}/finalize")
+    assert response.status_code == 200, response.json
+    assert response.json["contentHash"] == hashlib.sha256(content).hexdigest()
+    upload_path = os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "chunked_test.bin")
+    with open(upload_path, "rb") as f:
+        assert f.read() == content
+    assert client.get(f"/api/uploads/{upload_id}").status_code == 404
+    os.remove(upload_path)
+
+
+def test_chunked_upload_checks_hash(client):
+    content = b"some data that doesn't match its hash"
+    upload_id = client.post("/api/uploads", json={"filename": "bad_hash_test.bin", "size": len(content), "sha256": "0"*64}).json["uploadId"]
+    put_chunk(client, upload_id, 0, content)
+    response = client.post(f"/api/uploads/{upload_id}/finalize")
+    assert response.status_code == 422
+    assert not os.path.exists(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "bad_hash_test.bin"))
+    assert not os.path.exists(chunked_uploads._get_part_path(upload_id))
+
+
+def test_chunked_upload_rejected_resend_keeps_received_bytes(client):
+    # without a whole file sha256, only the chunk hashes protect the upload
+    content = os.urandom(2*CHUNK_BYTES)
+    upload_id = client.post("/api/uploads", json={"filename": "resend_test.bin", "size": len(content)}).json["uploadId"]
+    for offset in [0, CHUNK_BYTES]:
+        put_chunk(client, upload_id, offset, content[offset:offset + CHUNK_BYTES])
+
+    # a corrupted re-send of the first chunk is rejected before it overwrites the bytes that were received
+    response = put_chunk(client, upload_id, 0, bytes(CHUNK_BYTES), hashlib.sha256(content[:CHUNK_BYTES]).hexdigest())
+    assert response.status_code == 422
+
+    response = client.post(f"/api/uploads/{upload_id}/finalize")
+    assert response.json["contentHash"] == hashlib.sha256(content).hexdigest()
+    upload_path = os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "resend_test.bin")
+    with open(upload_path, "rb") as f:
+        assert f.read() == content
+    os.remove(upload_path)
+
+
+def test_chunked_upload_model(client):
+    with open(get_model_path(TEST_MODEL_CONFIG["model_name"]), "rb") as f:
+        content = f.read()
+    model_name = "chunked_upload_test.eq"
+    upload_id = client.post("/api/uploads", json={"filename": model_name, "size": len(content), "kind": "model"}).json["uploadId"]
+    for offset in range(0, len(content), CHUNK_BYTES):
+        put_chunk(client, upload_id, offset, content[offset:offset + CHUNK_BYTES])
+    response = client.post(f"/api/uploads/{upload_id}/finalize")
+    assert response.status_code == 200, response.json
+
+    try:
+        # the model is in the catalog, with its summary, as if it were uploaded with uploadModel
+        response = client.post("/graphql", json={"query": "query { modelSummary(modelName: \"%s\") { modelType } }" % model_name})
+        assert response.json["data"]["modelSummary"]["modelType"] is not None
+    finally:
+        model_path = get_model_path(model_name)
+        model_manager.unload_model(model_path)
+        model_catalog.remove_model(model_name)
+        for path in [model_path, get_metadata_path(model_path)]:
+            if os.path.isfile(path):
+                os.remove(path)
@@ -0,0 +1,85 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+import os
+import pickle
+
+import pandas as pd
+import pytest
+import torch
+from torch.utils.data import TensorDataset
+
+from equine_webapp.data_files import combine_data_files
+from equine_webapp.utils import SERVER_CONFIG, SampleDataset
+
+NUM_FEATURES = 3
+
+
+def save_shards(tmp_name, num_shards):
+    """Save alternating CSV and .pt shards of different sizes, and return their filenames and combined samples and labels"""
+    filenames, samples, labels = [], [], []
+    for shard_idx in range(num_shards):
+        X = torch.randn(10 + 7*shard_idx, NUM_FEATURES, dtype=torch.float64)
+        Y = torch.randint(0, 4, (len(X),))
+        if shard_idx % 2 == 0:
+            filename = f"{tmp_name}_{shard_idx}.csv"
+            dataframe = pd.DataFrame(X.numpy(), columns=[f"feature_{i}" for i in range(NUM_FEATURES)])
+            dataframe["labels"] = Y.numpy()
+            dataframe.to_csv(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, filename), index=False)
+        else:
+            filename = f"{tmp_name}_{shard_idx}.pt"
+            torch.save(TensorDataset(X, Y), os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, filename))
+        filenames.append(filename)
+        samples.append(X)
+        labels.append(Y)
+    return filenames, torch.cat(samples), torch.cat(labels)
+
+def remove_shards(filenames):
+    for filename in filenames:
+        os.remove(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, filename))
+
+
+def test_combine_data_files():
+    filenames, X, Y = save_shards("combine_test", 5)
+    try:
+        sample_dataset = combine_data_files(filenames, is_train=True)
+        combined_X, combined_Y = sample_dataset.dataset.tensors
+        assert torch.allclose(combined_X, X)
+        assert torch.equal(combined_Y, Y)
+        assert sample_dataset.column_headers == [f"feature_{i}" for i in range(NUM_FEATURES)]
+
+        # one offset per file, instead of a filename per row
+        row_counts = [10 + 7*shard_idx for shard_idx in range(len(filenames))]
+        assert sample_dataset.file_offsets == [[filename, sum(row_counts[:idx])] for idx, filename in enumerate(filenames)]
+        expected_filenames = [filename for filename, num_rows in zip(filenames, row_counts) for _ in range(num_rows)]
+        assert sample_dataset.get_filenames(0, len(X)) == expected_filenames
+        assert sample_dataset.get_filenames(5, 30) == expected_filenames[5:30]
+    finally:
+        remove_shards(filenames)
+
+
+def test_combine_data_files_promotes_dtypes():
+    filenames = ["combine_float32_test.pt", "combine_float64_test.pt"]
+    tensors = [torch.randn(4, NUM_FEATURES, dtype=torch.float32), torch.randn(6, NUM_FEATURES, dtype=torch.float64)]
+    for filename, tensor in zip(filenames, tensors):
+        torch.save(tensor, os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, filename))
+    try:
+        combined = combine_data_files(filenames).dataset.tensors[0]
+        assert torch.equal(combined, torch.concat(tensors))
+        assert combined.dtype == torch.float64
+        assert combine_data_files(filenames[:1]).column_headers == list(range(NUM_FEATURES))
+
+        torch.save(torch.randn(2, NUM_FEATURES + 1), os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "combine_mismatch_test.pt"))
+        filenames.append("combine_mismatch_test.pt")
+        with pytest.raises(ValueError, match="combine_mismatch_test.pt"):
+            combine_data_files(filenames)
+    finally:
+        remove_shards(filenames)
+
+
+def test_sample_dataset_with_filenames_per_row():
+    # runs saved before file offsets have a filename per row, which is compressed into offsets when they are loaded
+    sample_dataset = SampleDataset.__new__(SampleDataset)
+    sample_dataset.__dict__.update({"dataset": TensorDataset(torch.zeros(5, 1)), "filenames": ["a.csv"]*2 + ["b.csv"]*3, "column_headers": [0]})
+    sample_dataset = pickle.loads(pickle.dumps(sample_dataset))
+    assert sample_dataset.file_offsets == [["a.csv", 0], ["b.csv", 2]]
+    assert sample_dataset.get_filenames(0, 5) == ["a.csv"]*2 + ["b.csv"]*3
@@ -0,0 +1,89 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+import equine as eq
+import pandas as pd
+import pytest
+import torch
+
+from equine_webapp.inference_batcher import InferenceBatcher
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+
+class CountingModel:
+    """Wraps a model to count the number of forward passes and record their batch sizes"""
+    def __init__(self, model):
+        self.model = model
+        self.num_predict_calls = 0
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def predict(self, X):
+        with self.lock:
+            self.num_predict_calls += 1
+            self.batch_sizes.append(len(X))
+        return self.model.predict(X)
+
+
+def load_test_model_and_data():
+    model = eq.load_equine_model(os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, TEST_MODEL_CONFIG["model_name"]))
+    test_df = pd.read_csv(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "test_no_labels.csv"))
+    return model, torch.tensor(test_df.to_numpy(), dtype=torch.float32)
+
+
+def test_inference_batcher_coalesces_concurrent_calls():
+    model, X = load_test_model_and_data()
+    counting_model = CountingModel(model)
+    # a long delay makes sure that all the concurrent calls land in the same batch
+    batcher = InferenceBatcher(counting_model, max_batch_size=len(X), max_delay=1.0)
+
+    chunks = list(torch.split(X, len(X)//8))
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        results = list(executor.map(batcher.predict, chunks))
+    batcher.close()
+
+    assert counting_model.num_predict_calls < len(chunks)
+    assert sum(counting_model.batch_sizes) == len(X)
+    assert max(counting_model.batch_sizes) <= len(X)
+    for chunk, result in zip(chunks, results):
+        expected = model.predict(chunk)
+        assert torch.allclose(result.classes, expected.classes, atol=1e-6)
+        assert torch.allclose(result.ood_scores, expected.ood_scores, atol=1e-6)
+        assert torch.allclose(result.embeddings, expected.embeddings, atol=1e-6)
+
+
+def test_inference_batcher_respects_max_batch_size():
+    model, X = load_test_model_and_data()
+    counting_model = CountingModel(model)
+    max_batch_size = 16
+    batcher = InferenceBatcher(counting_model, max_batch_size=max_batch_size, max_delay=0.5)
+
+    # small calls around one call that is larger than a whole batch
+    calls = [X[:6], X[6:12], X[:len(X)], X[12:18], X[18:24]]
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        results = list(executor.map(batcher.predict, calls))
+    batcher.close()
+
+    # the large call runs by itself and every other batch stays within the limit
+    assert sorted(counting_model.batch_sizes)[-1] == len(X)
+    assert all(batch_size <= max_batch_size for batch_size in sorted(counting_model.batch_sizes)[:-1])
+    assert sum(counting_model.batch_sizes) == sum(len(call) for call in calls)
+    for call, result in zip(calls, results):
+        assert len(result.classes) == len(call)
+
+
+def test_inference_batcher_raises_errors_in_caller():
+    model, _ = load_test_model_and_data()
+    batcher = InferenceBatcher(model, max_batch_size=16, max_delay=0.0)
+
+    with pytest.raises(RuntimeError):
+        batcher.predict(torch.zeros((4, TEST_MODEL_CONFIG["tensor_dim"] + 1)))
+
+    # the batcher keeps working after an error
+    assert batcher.predict(torch.zeros((4, TEST_MODEL_CONFIG["tensor_dim"]))).classes.shape[0] == 4
+    batcher.close()
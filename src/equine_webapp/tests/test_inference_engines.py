@@ -0,0 +1,100 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import io
+import os
+import shutil
+import time
+
+import pandas as pd
+import pytest
+import torch
+
+from equine_webapp.content_store import content_store, get_content_hash
+from equine_webapp.inference_engines import get_engine_path
+from equine_webapp.inference_profiles import get_profiled_model
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.model_manager import model_manager
+from equine_webapp.model_metadata import get_metadata_path, read_model_metadata
+from equine_webapp.utils import SERVER_CONFIG, get_model_path
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+NUM_BENCHMARK_REPEATS = 20
+
+
+def time_predict(model, X):
+    model.predict(X) # warm up
+    start_time = time.perf_counter()
+    for _ in range(NUM_BENCHMARK_REPEATS):
+        predictions = model.predict(X)
+    return predictions, (time.perf_counter() - start_time) / NUM_BENCHMARK_REPEATS
+
+
+@pytest.mark.parametrize("inference_engine", ["torchscript", "onnx"])
+def test_inference_engines(inference_engine, record_property):
+    if inference_engine == "onnx":
+        pytest.importorskip("onnxruntime")
+
+    model_path = get_model_path(TEST_MODEL_CONFIG["model_name"])
+    test_df = pd.read_csv(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "test_no_labels.csv"))
+    X = torch.tensor(test_df.to_numpy(), dtype=torch.float32)
+
+    eager_predictions, eager_seconds = time_predict(get_profiled_model(model_path, "fast", "eager"), X)
+    engine_predictions, engine_seconds = time_predict(get_profiled_model(model_path, "fast", inference_engine), X)
+
+    # the compiled artifact is cached by the content of the .eq file
+    assert os.path.isfile(get_engine_path(model_path, inference_engine))
+
+    assert torch.allclose(engine_predictions.classes, eager_predictions.classes, atol=1e-4)
+    assert torch.allclose(engine_predictions.ood_scores, eager_predictions.ood_scores, atol=1e-4)
+    assert torch.allclose(engine_predictions.embeddings, eager_predictions.embeddings, atol=1e-4)
+
+    record_property(f"{inference_engine}_seconds", engine_seconds)
+    record_property("eager_seconds", eager_seconds)
+    print(f"eager: {eager_seconds*1000:.2f}ms, {inference_engine}: {engine_seconds*1000:.2f}ms per {len(X)} samples")
+
+
+def test_inference_engine_rejects_reduced_precision():
+    model_path = get_model_path(TEST_MODEL_CONFIG["model_name"])
+    with pytest.raises(ValueError, match="only supports fp32"):
+        get_profiled_model(model_path, "int8", "torchscript")
+
+
+def test_caches_follow_replaced_content():
+    # two different model files, where the one stored first is older
+    model_path = get_model_path(TEST_MODEL_CONFIG["model_name"])
+    buffer = io.BytesIO()
+    torch.save(torch.load(model_path, weights_only=False), buffer)
+    old_content = buffer.getvalue()
+    old_hash, _, _ = content_store.store_stream(io.BytesIO(old_content), os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "cache_test_old.eq"))
+    os.utime(content_store.get_object_path(old_hash), (0, 0))
+
+    alias_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "cache_test.eq")
+    temp_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "cache_test.eq.copy")
+    shutil.copyfile(model_path, temp_path)
+    new_hash, _, _ = content_store.store_file(temp_path, alias_path)
+    assert new_hash != old_hash
+    alias_path = get_model_path("cache_test.eq")
+    try:
+        model_catalog.upsert_model(alias_path)
+        get_profiled_model(alias_path, "fast", "torchscript")
+        model = model_manager.get_model(alias_path, load_equine_model)
+        assert read_model_metadata(alias_path)["content_hash"] == new_hash
+
+        # re-uploading the older content links the alias to an object with an older mtime than the caches,
+        # which must still be rebuilt from it
+        content_store.store_stream(io.BytesIO(old_content), alias_path)
+        model_catalog.upsert_model(alias_path)
+        assert get_content_hash(alias_path) == old_hash
+        assert get_engine_path(alias_path, "torchscript") != get_engine_path(model_path, "torchscript")
+        assert read_model_metadata(alias_path)["content_hash"] == old_hash
+        assert model_manager.get_model(alias_path, load_equine_model) is not model
+    finally:
+        for name in ["cache_test.eq", "cache_test_old.eq"]:
+            path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, name)
+            model_catalog.remove_model(name)
+            model_manager.unload_model_file(path)
+            for file_path in [path, get_metadata_path(path)]:
+                if os.path.isfile(file_path):
+                    os.remove(file_path)
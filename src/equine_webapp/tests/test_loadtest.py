@@ -0,0 +1,39 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+import socket
+
+from equine_webapp.loadtest import run_load_test
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+from equine_webapp.utils import SERVER_CONFIG
+
+
+def get_free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_load_test_smoke():
+    # the server process has to read the same output folder as this process
+    testing = "True" if os.path.basename(os.path.normpath(SERVER_CONFIG.OUTPUT_FOLDER)) == "temp" else "False"
+    stages = run_load_test(
+        TEST_MODEL_CONFIG["model_name"],
+        os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "test_no_labels.csv"),
+        # one short stage, since most of the time is the server starting
+        concurrency_stages=[1],
+        stage_seconds=0.5,
+        num_hovers=1,
+        dr_methods=["pca"],
+        port=get_free_port(),
+        server_env={"TESTING": testing, "CATALOG_POLL_SECONDS": "0"},
+    )
+
+    assert [stage["concurrency"] for stage in stages] == [1]
+    for stage in stages:
+        assert stage["requests_per_second"] > 0
+        for operation in ["models", "modelSummary", "getPrototypeSupportEmbeddings", "runInference", "renderInferenceFeatureData", "dimensionalityReduction/pca"]:
+            assert stage["operations"][operation]["errors"] == 0, stage["operations"][operation]["error_messages"]
+            assert stage["operations"][operation]["count"] > 0
+            assert stage["operations"][operation]["p50"] <= stage["operations"][operation]["p99"]
@@ -0,0 +1,51 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+import os
+
+import pytest
+import torch
+import equine as eq
+
+from equine_webapp.model_loading import load_equine_model
+from equine_webapp.training import train_equine_model
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+
+def assert_same_predictions(model_path):
+    expected_model = eq.load_equine_model(model_path)
+    model = load_equine_model(model_path)
+    assert type(model) is type(expected_model)
+    assert model.get_label_names() == expected_model.get_label_names()
+    assert model.train_summary == expected_model.train_summary
+
+    X = torch.cat(list(expected_model.get_support().values()))
+    expected_output = expected_model.predict(X)
+    output = model.predict(X)
+    assert torch.allclose(output.classes, expected_output.classes)
+    assert torch.allclose(output.ood_scores, expected_output.ood_scores)
+    assert torch.allclose(output.embeddings, expected_output.embeddings)
+
+
+def test_load_protonet():
+    assert_same_predictions(os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, TEST_MODEL_CONFIG["model_name"]))
+
+
+def test_load_gp(tmp_path):
+    torch.manual_seed(52)
+    X = torch.randn(200, 4)
+    Y = (X[:, 0] > 0).long()
+    model = train_equine_model(torch.nn.Linear(4, 8), torch.utils.data.TensorDataset(X, Y), "EquineGP", episodes=2, emb_out_dim=8)
+    model_path = str(tmp_path / "gp_test_model.eq")
+    model.save(model_path)
+    assert_same_predictions(model_path)
+
+
+def test_load_legacy_format(tmp_path):
+    # files saved without torch's zip format can't be memory-mapped, and are loaded normally
+    model_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, TEST_MODEL_CONFIG["model_name"])
+    legacy_path = str(tmp_path / "legacy_test_model.eq")
+    torch.save(torch.load(model_path, weights_only=False), legacy_path, _use_new_zipfile_serialization=False)
+    with pytest.raises(RuntimeError):
+        torch.load(legacy_path, mmap=True, weights_only=False)
+    assert_same_predictions(legacy_path)
@@ -1,11 +1,14 @@
 # Copyright (c) 2026 Massachusetts Institute of Technology
 # SPDX-License-Identifier: MIT
 
+import hashlib
+import io
 import json
 import numpy as np
 import os
 from pathlib import Path
 
+from equine_webapp.content_store import UPLOAD_CHUNK_BYTES, content_store, get_content_hash
 from equine_webapp.utils import SERVER_CONFIG
 
 
@@ -37,4 +40,59 @@ def test_mutation_uploadFile(client):
     uploaded_df = pd.read_csv(
         os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "test_upload_data_file.csv"),
     )
-    assert np.array_equal(test_df.values,uploaded_df.values)
\ No newline at end of file
+    assert np.array_equal(test_df.values,uploaded_df.values)
+
+UPLOAD_FILE_MUTATION = """mutation UploadSampleFile($file: Upload!) {
+  uploadFile(file:$file) {
+    success
+    contentHash
+    size
+    deduplicated
+  }
+}"""
+
+
+def upload_file(client, name, content: bytes):
+    response = client.post("/graphql", data={
+        "map": json.dumps({name: ["variables.file"]}),
+        name: (io.BytesIO(content), name),
+        "operations": json.dumps({"query": UPLOAD_FILE_MUTATION, "variables": {"file": None}}),
+    })
+    return response.json["data"]["uploadFile"]
+
+
+def test_mutation_uploadFile_deduplicates(client):
+    content = os.urandom(3*UPLOAD_CHUNK_BYTES + 17)
+    names = ["dedup_test_a.bin", "dedup_test_b.bin"]
+    first = upload_file(client, names[0], content)
+    second = upload_file(client, names[1], content)
+
+    assert first["contentHash"] == second["contentHash"] == hashlib.sha256(content).hexdigest()
+    assert first["size"] == len(content)
+    assert not first["deduplicated"]
+    assert second["deduplicated"]
+
+    # both names read the same content from one stored object
+    paths = [os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, name) for name in names]
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read() == content
+        assert get_content_hash(path) == first["contentHash"]
+    assert os.path.samefile(paths[0], paths[1])
+    object_path = content_store.get_object_path(first["contentHash"])
+    assert os.path.samefile(paths[0], object_path)
+
+    # replacing both aliases with new content removes the object that nothing links to anymore
+    results = [upload_file(client, name, b"new content") for name in names]
+    assert [result["deduplicated"] for result in results] == [False, True]
+    assert not os.path.exists(object_path)
+
+    # a file that is replaced by other means is hashed again rather than trusted
+    os.remove(paths[0])
+    with open(paths[0], "wb") as f:
+        f.write(b"changed")
+    assert content_store.get_content_hash(paths[0]) is None
+    assert get_content_hash(paths[0]) == hashlib.sha256(b"changed").hexdigest()
+
+    for path in paths:
+        os.remove(path)
@@ -58,4 +58,90 @@ def test_query_models(client):
     assert len(response_data["scree"]) == 5
     all(isinstance(item, float) for item in response_data["scree"])
     all(item >= 0 for item in response_data["scree"])
-    all(item <= 1 for item in response_data["scree"])
\ No newline at end of file
+    all(item <= 1 for item in response_data["scree"])
+
+def test_query_dimensionalityReduction_landmarks(client, monkeypatch):
+    from equine_webapp.utils import SERVER_CONFIG
+    monkeypatch.setattr(SERVER_CONFIG, "DR_LANDMARK_THRESHOLD", 50)
+    monkeypatch.setattr(SERVER_CONFIG, "DR_NUM_LANDMARKS", 40)
+    monkeypatch.setattr(SERVER_CONFIG, "DR_METRIC_SAMPLE_SIZE", 60)
+
+    NUM_VECTORS = 80
+    VECTOR_SIZE = 10
+    data = [[random.uniform(-100, 100) for _ in range(VECTOR_SIZE)] for _ in range(NUM_VECTORS)]
+
+    query = """
+      query DimensionalityReduction($method: String!, $data:[[Float!]!]!, $nNeighbors: Int!) {
+        dimensionalityReduction(method: $method, data:$data, nNeighbors:$nNeighbors) {
+          approximation
+          embeddings
+          metricSampleSize
+          numLandmarks
+          trustworthiness
+        }
+      }
+    """
+
+    # t-SNE above the threshold is fit on landmarks and the metrics are sampled
+    response = client.post("/graphql", json={"query": query, "variables": {"method": "tsne", "data": data, "nNeighbors": 5}})
+    response_data = response.json["data"]["dimensionalityReduction"]
+    assert response_data["approximation"] == "landmark"
+    assert response_data["numLandmarks"] == 40
+    assert response_data["metricSampleSize"] == 60
+    assert len(response_data["embeddings"]) == NUM_VECTORS
+    assert response_data["trustworthiness"] >= 0.0
+    assert response_data["trustworthiness"] <= 1.0
+
+    # PCA scales linearly so it is always exact
+    response = client.post("/graphql", json={"query": query, "variables": {"method": "pca", "data": data, "nNeighbors": 5}})
+    response_data = response.json["data"]["dimensionalityReduction"]
+    assert response_data["approximation"] == "exact"
+    assert response_data["numLandmarks"] is None
+    assert len(response_data["embeddings"]) == NUM_VECTORS
+
+
+class StubUMAP:
+    """Stands in for umap.UMAP, which JIT compiles its numba functions on the first fit"""
+    def __init__(self, random_state=None, **kwargs):
+        self.random_state = random_state
+
+    def fit_transform(self, data):
+        return data[:, :2]
+
+def test_query_dimensionalityReduction_reports_unseeded_umap(client, monkeypatch):
+    import types
+    from equine_webapp import umap_runtime
+    from equine_webapp.utils import SERVER_CONFIG
+    # make_umap still decides whether the seed is used, only the fit is stubbed
+    monkeypatch.setattr(umap_runtime, "import_umap", lambda: types.SimpleNamespace(UMAP=StubUMAP))
+    data = [[random.uniform(-100, 100) for _ in range(10)] for _ in range(30)]
+    query = """
+      query DimensionalityReduction($method: String!, $data:[[Float!]!]!, $nNeighbors: Int!) {
+        dimensionalityReduction(method: $method, data:$data, nNeighbors:$nNeighbors) {
+          reproducible
+        }
+      }
+    """
+    variables = {"method": "umap", "data": data, "nNeighbors": 5}
+
+    response = client.post("/graphql", json={"query": query, "variables": variables})
+    assert response.json["data"]["dimensionalityReduction"]["reproducible"] is True
+
+    # point sets at or above UMAP_PARALLEL_MIN_SAMPLES drop the seed to run in parallel
+    monkeypatch.setattr(SERVER_CONFIG, "UMAP_PARALLEL_MIN_SAMPLES", 20)
+    response = client.post("/graphql", json={"query": query, "variables": variables})
+    assert response.json["data"]["dimensionalityReduction"]["reproducible"] is False
+
+def test_metric_sample_is_independent_of_landmarks(monkeypatch):
+    import numpy as np
+    from equine_webapp.dr_approximation import sample_for_metrics, select_landmarks
+    from equine_webapp.utils import SERVER_CONFIG
+    monkeypatch.setattr(SERVER_CONFIG, "DR_METRIC_SAMPLE_SIZE", 1000)
+
+    # with the same seed, about 1000 * 500 / 20000 = 25 landmarks are expected in the metric sample, not all 500
+    landmark_idxs = select_landmarks(20000, 500, 42)
+    metric_idxs = sample_for_metrics(20000, 42)
+    assert len(np.intersect1d(landmark_idxs, metric_idxs)) < 100
+    # both stay reproducible
+    assert np.array_equal(select_landmarks(20000, 500, 42), landmark_idxs)
+    assert np.array_equal(sample_for_metrics(20000, 42), metric_idxs)
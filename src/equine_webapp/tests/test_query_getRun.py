@@ -0,0 +1,120 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+from unittest import mock
+
+from equine_webapp.model_manager import model_manager
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+RUN_INFERENCE_QUERY = """
+    mutation RunInference($modelName: String!) {
+      runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"]) {
+        runId
+        samples { coordinates ood labels { label confidence } inputData { file dataIndex } }
+      }
+    }
+"""
+GET_RUN_QUERY = """
+    query GetRun($runId: Int!, $first: Int, $after: String) {
+      getRun(runId: $runId, first: $first, after: $after) {
+        runId
+        modelName
+        labels
+        totalCount
+        samples { coordinates ood labels { label confidence } inputData { file dataIndex } }
+        pageInfo { endCursor hasNextPage }
+      }
+    }
+"""
+
+
+def test_query_getRun(client):
+    response = client.post("/graphql", json={"query": RUN_INFERENCE_QUERY, "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]}})
+    run_inference_result = response.json["data"]["runInference"]
+    run_id = run_inference_result["runId"]
+
+    # page through the saved run without touching the model
+    samples = []
+    after = None
+    with mock.patch.object(model_manager, "get_model", side_effect=AssertionError("getRun loaded a model")):
+        while True:
+            response = client.post("/graphql", json={"query": GET_RUN_QUERY, "variables": {"runId": run_id, "first": 150, "after": after}})
+            run = response.json["data"]["getRun"]
+            assert run["runId"] == run_id
+            assert run["modelName"] == TEST_MODEL_CONFIG["model_name"]
+            assert run["totalCount"] == len(run_inference_result["samples"])
+            assert len(run["samples"]) <= 150
+            samples += run["samples"]
+            if not run["pageInfo"]["hasNextPage"]:
+                break
+            after = run["pageInfo"]["endCursor"]
+
+    assert len(samples) == len(run_inference_result["samples"])
+    assert len(run["labels"]) == TEST_MODEL_CONFIG["num_classes"]
+    for saved, original in zip(samples, run_inference_result["samples"]):
+        assert saved["inputData"] == original["inputData"]
+        assert [label["label"] for label in saved["labels"]] == [label["label"] for label in original["labels"]]
+        assert np.allclose(saved["coordinates"], original["coordinates"], atol=1e-5)
+        assert np.allclose([label["confidence"] for label in saved["labels"]], [label["confidence"] for label in original["labels"]], atol=1e-5)
+        assert np.isclose(saved["ood"], original["ood"], atol=1e-5)
+
+
+def test_query_getRun_missing_run(client):
+    response = client.post("/graphql", json={"query": GET_RUN_QUERY, "variables": {"runId": 12345}})
+    assert response.json["data"] is None
+    assert "has no saved predictions" in response.json["errors"][0]["message"]
+
+
+FILTERED_RUN_QUERY = """
+    query GetRun($runId: Int!, $first: Int, $minOod: Float, $predictedLabels: [String!], $maxConfidence: Float, $condition: String, $sortBy: String, $descending: Boolean) {
+      getRun(runId: $runId, first: $first, minOod: $minOod, predictedLabels: $predictedLabels, maxConfidence: $maxConfidence, condition: $condition, sortBy: $sortBy, descending: $descending, histogramBins: 4) {
+        totalCount
+        samples { ood labels { label confidence } inputData { dataIndex } }
+        oodHistogram { binEdges counts }
+        confidenceHistogram { binEdges counts }
+      }
+    }
+"""
+
+
+def get_predicted_label(sample):
+    return max(sample["labels"], key=lambda label: label["confidence"])
+
+
+def test_query_getRun_filters(client):
+    response = client.post("/graphql", json={"query": RUN_INFERENCE_QUERY, "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]}})
+    run_inference_result = response.json["data"]["runInference"]
+    run_id = run_inference_result["runId"]
+    samples = run_inference_result["samples"]
+
+    def get_run(**variables):
+        response = client.post("/graphql", json={"query": FILTERED_RUN_QUERY, "variables": {"runId": run_id, **variables}})
+        assert "errors" not in response.json, response.json["errors"]
+        return response.json["data"]["getRun"]
+
+    # the 50 most OOD samples, ties broken by data index
+    run = get_run(first=50, sortBy="ood", descending=True)
+    expected = sorted(samples, key=lambda sample: (-np.float32(sample["ood"]), sample["inputData"]["dataIndex"]))[:50]
+    assert [sample["inputData"]["dataIndex"] for sample in run["samples"]] == [sample["inputData"]["dataIndex"] for sample in expected]
+    assert run["totalCount"] == len(samples)
+    assert sum(run["oodHistogram"]["counts"]) == len(samples)
+    assert run["oodHistogram"]["binEdges"] == [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    # the least confident samples that are predicted as one label
+    label = get_predicted_label(samples[0])["label"]
+    run = get_run(predictedLabels=[label], maxConfidence=0.9, sortBy="confidence")
+    expected = [sample for sample in samples if get_predicted_label(sample)["label"] == label and get_predicted_label(sample)["confidence"] <= 0.9 + 1e-6]
+    assert run["totalCount"] == len(expected)
+    assert sum(run["confidenceHistogram"]["counts"]) == len(expected)
+    confidences = [get_predicted_label(sample)["confidence"] for sample in run["samples"]]
+    assert confidences == sorted(confidences)
+    assert all(get_predicted_label(sample)["label"] == label for sample in run["samples"])
+
+    # the ScatterUQ conditions partition the run
+    counts = {condition: get_run(first=0, condition=condition)["totalCount"] for condition in ["ood", "confident", "confused_class"]}
+    assert sum(counts.values()) == len(samples)
+    assert counts["ood"] == get_run(first=0, minOod=0.5)["totalCount"] - sum(np.isclose(sample["ood"], 0.5) for sample in samples)
+
+    response = client.post("/graphql", json={"query": FILTERED_RUN_QUERY, "variables": {"runId": run_id, "sortBy": "label"}})
+    assert "sortBy must be one of" in response.json["errors"][0]["message"]
@@ -0,0 +1,83 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+from equine_webapp.tests.utils import assert_confidence_labels_are_valid
+
+
+@pytest.mark.parametrize("inference_profile", ["fast", "int8", "bf16"])
+def test_query_inferenceProfileReport(client, inference_profile):
+    response = client.post("/graphql", json={
+        "query": """
+            query InferenceProfileReport($modelName: String!, $inferenceProfile: String!) {
+              inferenceProfileReport(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"], inferenceProfile: $inferenceProfile) {
+                inferenceProfile
+                numSamples
+                maxConfidenceDelta
+                meanConfidenceDelta
+                maxOodDelta
+                meanOodDelta
+                predictedLabelAgreement
+                referenceSeconds
+                profileSeconds
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"], "inferenceProfile": inference_profile},
+    })
+    report = response.json["data"]["inferenceProfileReport"]
+
+    assert report["inferenceProfile"] == inference_profile
+    test_data_size = int(TEST_MODEL_CONFIG["examples_per_class"]*TEST_MODEL_CONFIG["num_classes"]*TEST_MODEL_CONFIG["test_ratio"])
+    assert report["numSamples"] == test_data_size
+    assert report["referenceSeconds"] > 0.0
+    assert report["profileSeconds"] > 0.0
+
+    if inference_profile == "fast": # same fp32 weights, so the predictions should not change
+        assert report["maxConfidenceDelta"] < 1e-6
+        assert report["maxOodDelta"] < 1e-6
+        assert report["predictedLabelAgreement"] == 1.0
+    else: # reduced precision trades a small amount of accuracy
+        assert report["meanConfidenceDelta"] < 0.05
+        assert report["meanOodDelta"] < 0.1
+        assert report["predictedLabelAgreement"] > 0.9
+
+
+def test_mutation_runInference_with_inferenceProfile(client):
+    response = client.post("/graphql", json={
+        "query": """
+            mutation Test($modelName: String!) {
+              runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"], inferenceProfile: "int8") {
+                samples {
+                  coordinates
+                  labels {
+                    label
+                    confidence
+                  }
+                  ood
+                }
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    for sample in response.json["data"]["runInference"]["samples"]:
+        assert len(sample["coordinates"]) == TEST_MODEL_CONFIG["emb_out_dim"]
+        assert 0.0 <= sample["ood"] <= 1.0
+        assert_confidence_labels_are_valid(sample["labels"])
+
+
+def test_mutation_runInference_with_invalid_inferenceProfile(client):
+    response = client.post("/graphql", json={
+        "query": """
+            mutation Test($modelName: String!) {
+              runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"], inferenceProfile: "fp4") {
+                runId
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    assert "inference profile 'fp4' is not valid" in response.json["errors"][0]["message"]
@@ -0,0 +1,112 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+import shutil
+
+from equine_webapp.model_catalog import ModelCatalog, model_catalog
+from equine_webapp.model_metadata import get_metadata_path
+from equine_webapp.utils import SERVER_CONFIG, get_model_path
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+MODEL_CATALOG_QUERY = """
+    query ModelCatalog($first: Int, $after: String, $modelType: String, $nameContains: String, $modifiedAfter: Float) {
+      modelCatalog(first: $first, after: $after, modelType: $modelType, nameContains: $nameContains, modifiedAfter: $modifiedAfter) {
+        edges {
+          cursor
+          node {
+            name
+            lastModified
+            modelType
+            numClasses
+            numFeatures
+            embOutDim
+            numTrainExamples {
+              label
+              numExamples
+            }
+          }
+        }
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+        totalCount
+      }
+    }
+"""
+
+# copies of the test model, named so that they sort after the test model
+CATALOG_TEST_MODELS = ["zz_catalog_test_a.eq", "zz_catalog_test_b.eq", "zz_catalog_test_c.eq"]
+
+
+def query_model_catalog(client, **variables):
+    response = client.post("/graphql", json={"query": MODEL_CATALOG_QUERY, "variables": variables})
+    return response.json["data"]["modelCatalog"]
+
+
+def test_query_modelCatalog(client):
+    test_model_path = get_model_path(TEST_MODEL_CONFIG["model_name"])
+    for model_name in CATALOG_TEST_MODELS:
+        shutil.copy(test_model_path, os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, model_name))
+    model_catalog.sync() # the watcher would pick these files up in the background
+
+    try:
+        # filter by name and page through the results one model at a time
+        names = []
+        after = None
+        while True:
+            catalog = query_model_catalog(client, first=1, after=after, nameContains="zz_catalog_test")
+            assert catalog["totalCount"] == len(CATALOG_TEST_MODELS)
+            assert len(catalog["edges"]) == 1
+            node = catalog["edges"][0]["node"]
+            names.append(node["name"])
+
+            assert node["modelType"] == "EquineProtonet"
+            assert node["numFeatures"] == TEST_MODEL_CONFIG["tensor_dim"]
+            assert node["embOutDim"] == TEST_MODEL_CONFIG["emb_out_dim"]
+            assert len(node["numTrainExamples"]) == TEST_MODEL_CONFIG["num_classes"]
+
+            if not catalog["pageInfo"]["hasNextPage"]:
+                break
+            after = catalog["pageInfo"]["endCursor"]
+        assert names == CATALOG_TEST_MODELS
+
+        # filter by type and date
+        catalog = query_model_catalog(client, modelType="EquineGP")
+        assert catalog["totalCount"] == 0
+        catalog = query_model_catalog(client, modelType="EquineProtonet", modifiedAfter=0.0)
+        assert catalog["totalCount"] == len(CATALOG_TEST_MODELS) + 1 # including the test model
+    finally:
+        for model_name in CATALOG_TEST_MODELS:
+            model_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, model_name)
+            os.remove(model_path)
+            os.remove(get_metadata_path(model_path))
+
+    # removed files are dropped from the catalog
+    model_catalog.sync()
+    catalog = query_model_catalog(client, nameContains="zz_catalog_test")
+    assert catalog["totalCount"] == 0
+    assert catalog["edges"] == []
+    assert catalog["pageInfo"] == {"endCursor": None, "hasNextPage": False}
+
+
+def test_model_catalog_remembers_failed_files(tmp_path, monkeypatch):
+    catalog = ModelCatalog(str(tmp_path / "catalog.sqlite3"), str(tmp_path))
+    model_path = tmp_path / f"broken{SERVER_CONFIG.MODEL_EXT}"
+    model_path.write_bytes(b"not a model")
+
+    upserted = []
+    upsert_model = catalog.upsert_model
+    def count_upserts(path):
+        upserted.append(path)
+        return upsert_model(path)
+    monkeypatch.setattr(catalog, "upsert_model", count_upserts)
+
+    # a file that fails to load is only tried again once it changes
+    catalog.sync()
+    catalog.sync()
+    assert len(upserted) == 1
+    os.utime(model_path, (0, 0))
+    catalog.sync()
+    assert len(upserted) == 2
@@ -0,0 +1,74 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+
+import torch
+
+from equine_webapp.model_metadata import extract_model_metadata, get_metadata_path
+from equine_webapp.utils import get_model_path
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+MODEL_SUMMARY_QUERY = """
+    query ModelSummary($modelName: String!) {
+      modelSummary(modelName: $modelName) {
+        dateTrained
+        embOutDim
+        featureNames
+        featureShape
+        labelNames
+        lastModified
+        modelType
+        numFeatures
+        numTrainExamples {
+          label
+          numExamples
+        }
+      }
+    }
+"""
+
+def test_query_modelSummary(client, monkeypatch):
+    model_path = get_model_path(TEST_MODEL_CONFIG["model_name"])
+
+    response = client.post("/graphql", json={
+        "query": MODEL_SUMMARY_QUERY,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    summary = response.json["data"]["modelSummary"]
+
+    assert summary["modelType"] == "EquineProtonet"
+    assert summary["embOutDim"] == TEST_MODEL_CONFIG["emb_out_dim"]
+    assert summary["numFeatures"] == TEST_MODEL_CONFIG["tensor_dim"]
+    assert summary["featureShape"] == [TEST_MODEL_CONFIG["tensor_dim"]]
+    assert summary["lastModified"] == os.path.getmtime(model_path)
+    assert len(summary["numTrainExamples"]) == TEST_MODEL_CONFIG["num_classes"]
+    num_train_examples = sum(label["numExamples"] for label in summary["numTrainExamples"])
+    assert num_train_examples > 0
+
+    # the metadata sidecar was written next to the model
+    assert os.path.isfile(get_metadata_path(model_path))
+
+    # now the summary must be answered without loading the model file
+    def fail_torch_load(*args, **kwargs):
+        raise AssertionError("modelSummary should not load the model")
+    monkeypatch.setattr(torch, "load", fail_torch_load)
+
+    response = client.post("/graphql", json={
+        "query": MODEL_SUMMARY_QUERY,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    assert response.json["data"]["modelSummary"] == summary
+
+
+def test_model_metadata_image_support(tmp_path):
+    # the features of image support examples are every pixel, not just the last dimension
+    model_path = str(tmp_path / "images.eq")
+    torch.save({
+        "support": {0: torch.zeros((3, 1, 28, 28)), 1: torch.zeros((3, 1, 28, 28))},
+        "settings": {},
+        "train_summary": {},
+    }, model_path)
+    metadata = extract_model_metadata(model_path)
+    assert metadata["feature_shape"] == [1, 28, 28]
+    assert metadata["num_features"] == 784
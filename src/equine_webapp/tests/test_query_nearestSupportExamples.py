@@ -0,0 +1,99 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+NEAREST_SUPPORT_EXAMPLES_QUERY = """
+    query NearestSupportExamples($modelName: String!, $k: Int, $runId: Int, $dataIndex: Int, $embedding: [Float!]) {
+      nearestSupportExamples(modelName: $modelName, k: $k, runId: $runId, dataIndex: $dataIndex, embedding: $embedding) {
+        dataIndex
+        label
+        distance
+        coordinates
+      }
+    }
+"""
+
+PROTOTYPE_SUPPORT_EMBEDDINGS_QUERY = """
+    query GetPrototypeSupportEmbeddings($modelName: String!) {
+      getPrototypeSupportEmbeddings(modelName: $modelName) {
+        label
+        trainingExamples {
+          coordinates
+          inputData {
+            dataIndex
+          }
+        }
+      }
+    }
+"""
+
+
+def query_nearest_support_examples(client, **variables):
+    variables["modelName"] = TEST_MODEL_CONFIG["model_name"]
+    return client.post("/graphql", json={"query": NEAREST_SUPPORT_EXAMPLES_QUERY, "variables": variables}).json
+
+
+def test_query_nearestSupportExamples_embedding(client):
+    response = client.post("/graphql", json={
+        "query": PROTOTYPE_SUPPORT_EMBEDDINGS_QUERY,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    support_examples = [
+        (example["inputData"]["dataIndex"], label_points["label"], example["coordinates"])
+        for label_points in response.json["data"]["getPrototypeSupportEmbeddings"]
+        for example in label_points["trainingExamples"]
+    ]
+
+    # a support example's own embedding is its nearest neighbour, with the same data index as getPrototypeSupportEmbeddings
+    data_index, label, coordinates = support_examples[3]
+    nearest = query_nearest_support_examples(client, k=1, embedding=coordinates)["data"]["nearestSupportExamples"]
+    assert len(nearest) == 1
+    assert nearest[0]["dataIndex"] == data_index
+    assert nearest[0]["label"] == label
+    assert nearest[0]["distance"] < 1e-4
+
+    # the neighbours match a brute force search
+    k = 7
+    nearest = query_nearest_support_examples(client, k=k, embedding=coordinates)["data"]["nearestSupportExamples"]
+    all_coordinates = np.array([example[2] for example in support_examples])
+    distances = np.linalg.norm(all_coordinates - np.array(coordinates), axis=1)
+    assert np.allclose([n["distance"] for n in nearest], np.sort(distances)[:k], atol=1e-4)
+
+    # k is capped at the number of support examples
+    num_support_examples = TEST_MODEL_CONFIG["support_size"]*TEST_MODEL_CONFIG["num_classes"]
+    nearest = query_nearest_support_examples(client, k=num_support_examples + 10, embedding=coordinates)["data"]["nearestSupportExamples"]
+    assert sorted(n["dataIndex"] for n in nearest) == list(range(num_support_examples))
+
+
+def test_query_nearestSupportExamples_inference_sample(client):
+    response = client.post("/graphql", json={
+        "query": """
+            mutation Test($modelName: String!) {
+              runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"]) {
+                runId
+                samples {
+                  coordinates
+                }
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    run = response.json["data"]["runInference"]
+
+    k = 5
+    by_sample = query_nearest_support_examples(client, k=k, runId=run["runId"], dataIndex=2)["data"]["nearestSupportExamples"]
+    by_embedding = query_nearest_support_examples(client, k=k, embedding=run["samples"][2]["coordinates"])["data"]["nearestSupportExamples"]
+    assert len(by_sample) == k
+    assert [n["dataIndex"] for n in by_sample] == [n["dataIndex"] for n in by_embedding]
+    distances = [n["distance"] for n in by_sample]
+    assert distances == sorted(distances)
+
+
+def test_query_nearestSupportExamples_requires_query(client):
+    response = query_nearest_support_examples(client, k=3, runId=0)
+    assert response["data"] is None
+    assert "Either an embedding or both a runId and a dataIndex are required" in response["errors"][0]["message"]
@@ -0,0 +1,104 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from equine_webapp.support_projection import get_support_projection
+from equine_webapp.utils import SERVER_CONFIG, get_model_path
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+PROJECT_SUPPORT_LAYOUT_QUERY = """
+    query ProjectSupportLayout($modelName: String!, $method: String!, $labels: [String!]!, $runId: Int, $startIndex: Int, $endIndex: Int, $embeddings: [[Float!]!]) {
+      projectSupportLayout(modelName: $modelName, method: $method, labels: $labels, runId: $runId, startIndex: $startIndex, endIndex: $endIndex, embeddings: $embeddings) {
+        method
+        labels
+        prototypes
+        supportExamples {
+          dataIndex
+          label
+          coordinates
+        }
+        samples {
+          dataIndex
+          coordinates
+        }
+        scree
+        reproducible
+      }
+    }
+"""
+
+
+def project_support_layout(client, **variables):
+    variables["modelName"] = TEST_MODEL_CONFIG["model_name"]
+    return client.post("/graphql", json={"query": PROJECT_SUPPORT_LAYOUT_QUERY, "variables": variables}).json
+
+
+def run_inference(client):
+    response = client.post("/graphql", json={
+        "query": """
+            mutation Test($modelName: String!) {
+              runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"]) {
+                runId
+                samples {
+                  coordinates
+                }
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    return response.json["data"]["runInference"]
+
+
+def test_query_projectSupportLayout(client):
+    run = run_inference(client)
+    labels = ["1", "0"]
+
+    layout = project_support_layout(client, method="pca", labels=labels, runId=run["runId"], startIndex=0, endIndex=4)["data"]["projectSupportLayout"]
+    assert layout["method"] == "pca"
+    assert layout["labels"] == ["0", "1"]
+    assert len(layout["prototypes"]) == 2
+    assert len(layout["supportExamples"]) == 2*TEST_MODEL_CONFIG["support_size"]
+    assert set(example["label"] for example in layout["supportExamples"]) == {"0", "1"}
+    assert [sample["dataIndex"] for sample in layout["samples"]] == [0, 1, 2, 3]
+    assert all(len(sample["coordinates"]) == 2 for sample in layout["samples"])
+    assert layout["scree"] is not None
+    assert layout["reproducible"] is True
+
+    # the fitted layout is cached, so a later request for the same class set gets the same support layout
+    projection = get_support_projection(get_model_path(TEST_MODEL_CONFIG["model_name"]), "pca", labels)
+    assert get_support_projection(get_model_path(TEST_MODEL_CONFIG["model_name"]), "pca", ["0", "1"]) is projection
+    embeddings = [sample["coordinates"] for sample in run["samples"][0:4]]
+    layout_from_embeddings = project_support_layout(client, method="pca", labels=labels, embeddings=embeddings)["data"]["projectSupportLayout"]
+    assert layout_from_embeddings["supportExamples"] == layout["supportExamples"]
+    assert np.allclose(
+        [sample["coordinates"] for sample in layout_from_embeddings["samples"]],
+        [sample["coordinates"] for sample in layout["samples"]],
+        atol=1e-4
+    )
+
+
+def test_support_projection_cache_is_bounded(monkeypatch):
+    # the class sets come from the client, so only the most recently used layouts stay cached
+    monkeypatch.setattr(SERVER_CONFIG, "SUPPORT_PROJECTION_CACHE_SIZE", 2)
+    model_path = get_model_path(TEST_MODEL_CONFIG["model_name"])
+    projections = [get_support_projection(model_path, "pca", [label]) for label in ["0", "1", "2"]]
+    assert get_support_projection(model_path, "pca", ["2"]) is projections[2]
+    assert get_support_projection(model_path, "pca", ["1"]) is projections[1]
+    assert get_support_projection(model_path, "pca", ["0"]) is not projections[0]
+
+
+def test_query_projectSupportLayout_umap(client):
+    run = run_inference(client)
+    layout = project_support_layout(client, method="umap", labels=["0", "2"], embeddings=[sample["coordinates"] for sample in run["samples"][0:3]])["data"]["projectSupportLayout"]
+    assert len(layout["samples"]) == 3
+    assert all(np.all(np.isfinite(sample["coordinates"])) for sample in layout["samples"])
+    assert layout["scree"] is None
+
+
+def test_query_projectSupportLayout_invalid(client):
+    response = project_support_layout(client, method="tsne", labels=["0"])
+    assert "Given projection method 'tsne' is not valid" in response["errors"][0]["message"]
+    response = project_support_layout(client, method="pca", labels=["not a label"])
+    assert "Given label 'not a label' is not one of the model's labels" in response["errors"][0]["message"]
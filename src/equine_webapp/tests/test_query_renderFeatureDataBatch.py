@@ -0,0 +1,113 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import equine as eq
+import numpy as np
+import os
+import pandas as pd
+
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+
+def test_query_renderInferenceFeatureDataBatch(client):
+    response = client.post("/graphql", json={
+        "query": """
+            mutation Test($modelName: String!) {
+              runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"]) {
+                runId
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    run_id = response.json["data"]["runInference"]["runId"]
+    test_df = pd.read_csv(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, "test_no_labels.csv"))
+
+    response = client.post("/graphql", json={
+        "query": """
+            query RenderInferenceFeatureDataBatch($runId: Int!, $modelName: String!, $dataIndices: [Int!], $startIndex: Int, $endIndex: Int) {
+              renderInferenceFeatureDataBatch(runId: $runId, modelName: $modelName, dataIndices: $dataIndices, startIndex: $startIndex, endIndex: $endIndex) {
+                columnHeaders
+                dataIndices
+                featureData
+              }
+            }
+        """,
+        "variables": {
+            "runId": run_id,
+            "modelName": TEST_MODEL_CONFIG["model_name"],
+            "dataIndices": [5, 2],
+            "startIndex": 10,
+            "endIndex": 20,
+        },
+    })
+    result = response.json["data"]["renderInferenceFeatureDataBatch"]
+
+    # the explicit indices come first, followed by the range
+    expected_indices = [5, 2] + list(range(10, 20))
+    assert result["dataIndices"] == expected_indices
+    assert result["columnHeaders"] == ["0", "1"]
+    assert np.allclose(
+        np.array(result["featureData"]),
+        test_df.iloc[expected_indices].to_numpy(),
+        atol=1e-6
+    )
+
+
+def test_query_renderSupportFeatureDataBatch(client):
+    model_path = os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, TEST_MODEL_CONFIG["model_name"])
+    model_support = eq.load_equine_model(model_path).model.support
+
+    num_support_examples = TEST_MODEL_CONFIG["support_size"]*TEST_MODEL_CONFIG["num_classes"]
+    response = client.post("/graphql", json={
+        "query": """
+            query RenderSupportFeatureDataBatch($modelName: String!, $startIndex: Int, $endIndex: Int) {
+              renderSupportFeatureDataBatch(modelName: $modelName, startIndex: $startIndex, endIndex: $endIndex) {
+                columnHeaders
+                dataIndices
+                featureData
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"], "startIndex": 0, "endIndex": num_support_examples},
+    })
+    result = response.json["data"]["renderSupportFeatureDataBatch"]
+
+    assert result["dataIndices"] == list(range(num_support_examples))
+    assert result["columnHeaders"] == ["0", "1"]
+    for data_index, feature_data in zip(result["dataIndices"], result["featureData"]):
+        label_idx = data_index // TEST_MODEL_CONFIG["support_size"]
+        support_idx = data_index % TEST_MODEL_CONFIG["support_size"]
+        assert np.allclose(np.array(feature_data), np.array(model_support[label_idx][support_idx]), atol=1e-6)
+
+
+def test_query_renderFeatureDataBatch_requires_indices(client):
+    response = client.post("/graphql", json={
+        "query": """
+            query RenderSupportFeatureDataBatch($modelName: String!) {
+              renderSupportFeatureDataBatch(modelName: $modelName) {
+                dataIndices
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"]},
+    })
+    assert response.json["data"] is None
+    assert "No data indices were requested" in response.json["errors"][0]["message"]
+
+
+def test_query_renderFeatureDataBatch_rejects_range_past_end(client):
+    num_support_examples = TEST_MODEL_CONFIG["support_size"]*TEST_MODEL_CONFIG["num_classes"]
+    response = client.post("/graphql", json={
+        "query": """
+            query RenderSupportFeatureDataBatch($modelName: String!, $startIndex: Int, $endIndex: Int) {
+              renderSupportFeatureDataBatch(modelName: $modelName, startIndex: $startIndex, endIndex: $endIndex) {
+                dataIndices
+              }
+            }
+        """,
+        "variables": {"modelName": TEST_MODEL_CONFIG["model_name"], "startIndex": 0, "endIndex": 2**31 - 1},
+    })
+    assert response.json["data"] is None
+    assert f"for {num_support_examples} rows" in response.json["errors"][0]["message"]
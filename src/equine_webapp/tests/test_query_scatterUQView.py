@@ -0,0 +1,84 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+RUN_INFERENCE_QUERY = """
+    mutation RunInference($modelName: String!) {
+      runInference(modelName: $modelName, sampleFilenames: ["test_no_labels.csv"]) {
+        runId
+        samples { coordinates ood labels { label confidence } }
+      }
+    }
+"""
+SUPPORT_EMBEDDINGS_QUERY = """
+    query GetPrototypeSupportEmbeddings($modelName: String!) {
+      getPrototypeSupportEmbeddings(modelName: $modelName) {
+        label
+        prototype
+        trainingExamples { coordinates inputData { dataIndex } }
+      }
+    }
+"""
+SCATTERUQ_VIEW_QUERY = """
+    query ScatterUQView($runId: Int!, $dataIndex: Int!, $method: String!, $outlierTolerance: Float, $classConfidenceThreshold: Float) {
+      scatterUQView(runId: $runId, dataIndex: $dataIndex, method: $method, outlierTolerance: $outlierTolerance, classConfidenceThreshold: $classConfidenceThreshold) {
+        condition
+        labels
+        points { kind label dataIndex coordinates }
+        reduction { trustworthiness continuity }
+      }
+    }
+"""
+DIMENSIONALITY_REDUCTION_QUERY = """
+    query DimensionalityReduction($method: String!, $data: [[Float!]!]!) {
+      dimensionalityReduction(method: $method, data: $data, nNeighbors: 5) { trustworthiness continuity }
+    }
+"""
+
+
+def test_query_scatterUQView(client):
+    model_name = TEST_MODEL_CONFIG["model_name"]
+    response = client.post("/graphql", json={"query": RUN_INFERENCE_QUERY, "variables": {"modelName": model_name}})
+    run_inference_result = response.json["data"]["runInference"]
+    support = client.post("/graphql", json={"query": SUPPORT_EMBEDDINGS_QUERY, "variables": {"modelName": model_name}}).json["data"]["getPrototypeSupportEmbeddings"]
+    support_by_label = {label_points["label"]: label_points for label_points in support}
+
+    # a low confidence threshold makes the sample confident, and a high one makes the model confused between two classes
+    for class_confidence_threshold, condition, num_labels in [(0.0, "confident", 1), (1.0, "confused_class", 2)]:
+        data_index = 3
+        sample = run_inference_result["samples"][data_index]
+        response = client.post("/graphql", json={"query": SCATTERUQ_VIEW_QUERY, "variables": {
+            "runId": run_inference_result["runId"],
+            "dataIndex": data_index,
+            "method": "pca",
+            "outlierTolerance": 1.0,
+            "classConfidenceThreshold": class_confidence_threshold,
+        }})
+        assert "errors" not in response.json, response.json["errors"]
+        view = response.json["data"]["scatterUQView"]
+
+        assert view["condition"] == condition
+        expected_labels = [label["label"] for label in sorted(sample["labels"], key=lambda label: -label["confidence"])[:num_labels]]
+        assert view["labels"] == expected_labels
+
+        # the sample, then each class's prototype and support examples, as the client would gather them
+        points = view["points"]
+        assert points[0] == {**points[0], "kind": "sample", "dataIndex": data_index}
+        expected_points = []
+        data = [sample["coordinates"]]
+        for label in expected_labels:
+            expected_points.append(("prototype", label, None))
+            expected_points += [("support", label, example["inputData"]["dataIndex"]) for example in support_by_label[label]["trainingExamples"]]
+            data.append(support_by_label[label]["prototype"])
+            data += [example["coordinates"] for example in support_by_label[label]["trainingExamples"]]
+        assert [(point["kind"], point["label"], point["dataIndex"]) for point in points[1:]] == expected_points
+        assert all(len(point["coordinates"]) == 2 for point in points)
+
+        # the layout has the same quality as the client's round trip through dimensionalityReduction
+        response = client.post("/graphql", json={"query": DIMENSIONALITY_REDUCTION_QUERY, "variables": {"method": "pca", "data": data}})
+        client_reduction = response.json["data"]["dimensionalityReduction"]
+        assert np.isclose(view["reduction"]["trustworthiness"], client_reduction["trustworthiness"], atol=1e-3)
+        assert np.isclose(view["reduction"]["continuity"], client_reduction["continuity"], atol=1e-3)
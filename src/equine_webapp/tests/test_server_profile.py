@@ -0,0 +1,56 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+import os
+
+from equine_webapp.server_profile import SERVER_PROFILE_FIELDS, calibrate_torch_threads, get_balanced_server_profile, resolve_server_profile
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+
+def test_balanced_server_profile():
+    # a 64 core node runs 8 computations of 8 torch threads at once
+    profile = get_balanced_server_profile(64)
+    assert profile["torch_threads"] == 8
+    assert profile["inference_max_concurrent"] == 8
+    # every admitted computation and a full admission queue get a thread, with some left for requests that don't compute
+    assert profile["server_threads"] == 8 + SERVER_CONFIG.DR_MAX_CONCURRENT + SERVER_CONFIG.TRAINING_MAX_CONCURRENT + SERVER_CONFIG.ADMISSION_MAX_QUEUED + 4
+    assert profile["dr_n_jobs"] == 64 // SERVER_CONFIG.DR_MAX_CONCURRENT
+
+    # a small machine still has enough server threads for requests that don't compute
+    profile = get_balanced_server_profile(2)
+    assert profile["torch_threads"] * profile["inference_max_concurrent"] <= 2
+    assert profile["server_threads"] >= profile["inference_max_concurrent"] + SERVER_CONFIG.ADMISSION_MAX_QUEUED + 4
+
+
+def test_resolve_server_profile():
+    profile = resolve_server_profile({"server_threads": 12, "torch_threads": 2, "dr_n_jobs": None}, num_cores=16)
+    assert set(profile.keys()) == set(SERVER_PROFILE_FIELDS)
+    assert profile["server_threads"] == 12
+    # the rest of the profile is balanced around the given torch threads
+    assert profile["torch_threads"] == 2
+    assert profile["inference_max_concurrent"] == 8
+
+    # the server threads follow a configured inference limit
+    profile = resolve_server_profile({"torch_threads": 2, "inference_max_concurrent": 6}, num_cores=16)
+    assert profile["server_threads"] == resolve_server_profile({"torch_threads": 2}, num_cores=16)["server_threads"] - 2
+
+
+def test_resolve_server_profile_inference_num_threads(monkeypatch):
+    # INFERENCE_NUM_THREADS sets the torch threads once at startup, unless TORCH_NUM_THREADS is set
+    monkeypatch.setattr(SERVER_CONFIG, "INFERENCE_NUM_THREADS", 3)
+    monkeypatch.setattr(SERVER_CONFIG, "TORCH_NUM_THREADS", None)
+    assert resolve_server_profile({}, num_cores=16)["torch_threads"] == 3
+    monkeypatch.setattr(SERVER_CONFIG, "TORCH_NUM_THREADS", 2)
+    assert resolve_server_profile({}, num_cores=16)["torch_threads"] == 2
+
+
+def test_calibrate_torch_threads():
+    model_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, TEST_MODEL_CONFIG["model_name"])
+    torch_threads, measurements = calibrate_torch_threads(model_path, num_cores=2, seconds=0.1)
+    assert [measurement["torch_threads"] for measurement in measurements] == [1, 2]
+    assert [measurement["num_workers"] for measurement in measurements] == [2, 1]
+    assert all(measurement["samples_per_second"] > 0 for measurement in measurements)
+    assert torch_threads == max(measurements, key=lambda measurement: measurement["samples_per_second"])["torch_threads"]
+
+    profile = resolve_server_profile({}, calibrate=True, calibration_model=TEST_MODEL_CONFIG["model_name"], num_cores=2)
+    assert profile["torch_threads"] in [1, 2]
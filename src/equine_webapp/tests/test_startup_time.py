@@ -0,0 +1,72 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import subprocess
+import sys
+
+# modules that should only be imported when a request needs them
+LAZY_MODULES = ["umap", "zadu", "faiss", "sklearn.manifold", "sklearn.decomposition"]
+
+# this script runs in a fresh python process so that we measure a true cold start
+STARTUP_SCRIPT = """
+import json
+import sys
+import time
+
+start_time = time.time()
+from equine_webapp.flask_server import app
+import_time = time.time() - start_time
+
+response = app.test_client().post("/graphql", json={
+    "query": "query { models { name lastModified } }",
+})
+first_response_time = time.time() - start_time
+assert response.status_code == 200
+
+print(json.dumps({
+    "import_time": import_time,
+    "first_response_time": first_response_time,
+    "loaded_lazy_modules": [m for m in LAZY_MODULES if m in sys.modules],
+}))
+"""
+
+def run_startup_script():
+    result = subprocess.run(
+        [sys.executable, "-c", f"LAZY_MODULES = {LAZY_MODULES!r}\n" + STARTUP_SCRIPT],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "TESTING": "True"},
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_startup_time(record_property):
+    startup = run_startup_script()
+
+    # track the cold start benchmark in the test report (ex pytest --junitxml)
+    record_property("import_time", startup["import_time"])
+    record_property("first_response_time", startup["first_response_time"])
+    print(f"Import time: {startup['import_time']:.2f}s, time to first response: {startup['first_response_time']:.2f}s")
+
+    # the dimensionality reduction stack should not be imported to answer a models query
+    assert startup["loaded_lazy_modules"] == []
+    assert startup["first_response_time"] >= startup["import_time"]
+
+
+def test_warm_up_imports():
+    result = subprocess.run(
+        [sys.executable, "-c", (
+            "import sys\n"
+            "from equine_webapp.warm_up import start_warm_up_thread\n"
+            "start_warm_up_thread().join()\n"
+            f"print(all(m in sys.modules for m in {LAZY_MODULES!r}))\n"
+        )],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "TESTING": "True"},
+        check=True,
+    )
+    assert result.stdout.strip().splitlines()[-1] == "True"
@@ -0,0 +1,94 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+
+import numpy as np
+
+from equine_webapp.inference_stream import stream_inference
+from equine_webapp.run_results import get_run_folder, load_run_predictions
+from equine_webapp.tests.utils import assert_confidence_labels_are_valid
+from equine_webapp.tests.train_model_for_testing import TEST_MODEL_CONFIG
+
+
+def parse_server_sent_events(body: str):
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_inference(client):
+    batch_size = 7
+    response = client.get(
+        f"/api/stream/inference/{TEST_MODEL_CONFIG['model_name']}",
+        query_string={"sampleFilenames": "test_no_labels.csv", "batchSize": batch_size},
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = parse_server_sent_events(response.get_data(as_text=True))
+
+    test_data_size = int(TEST_MODEL_CONFIG["examples_per_class"]*TEST_MODEL_CONFIG["num_classes"]*TEST_MODEL_CONFIG["test_ratio"])
+    event_name, start = events[0]
+    assert event_name == "start"
+    assert start["numSamples"] == test_data_size
+    assert events[-1] == ("done", {"runId": start["runId"]})
+
+    # the samples arrive in order, batch by batch
+    sample_events = events[1:-1]
+    assert all(event_name == "samples" for event_name, _ in sample_events)
+    assert [data["startIndex"] for _, data in sample_events] == list(range(0, test_data_size, batch_size))
+    samples = [sample for _, data in sample_events for sample in data["samples"]]
+    assert [sample["inputData"]["dataIndex"] for sample in samples] == list(range(test_data_size))
+    for sample in samples:
+        assert len(sample["coordinates"]) == TEST_MODEL_CONFIG["emb_out_dim"]
+        assert 0.0 <= sample["ood"] <= 1.0
+        assert_confidence_labels_are_valid(sample["labels"])
+
+    # the run data was saved, so the streamed samples can be rendered
+    response = client.post("/graphql", json={
+        "query": """
+            query RenderInferenceFeatureData($runId: Int!, $modelName: String!, $dataIndex: Int!) {
+              renderInferenceFeatureData(runId:$runId, modelName: $modelName, dataIndex: $dataIndex){
+                featureData
+              }
+            }
+        """,
+        "variables": {"dataIndex": test_data_size - 1, "modelName": TEST_MODEL_CONFIG["model_name"], "runId": start["runId"]},
+    })
+    assert len(response.json["data"]["renderInferenceFeatureData"]["featureData"]) == 2
+
+    # and the streamed predictions were saved for getRun
+    run = load_run_predictions(start["runId"])
+    assert run.num_samples == test_data_size
+    assert np.allclose(run.ood_scores, [sample["ood"] for sample in samples], atol=1e-5)
+
+
+def test_stream_inference_stops_when_closed():
+    events = stream_inference(TEST_MODEL_CONFIG["model_name"], ["test_no_labels.csv"], batch_size=1)
+    start = parse_server_sent_events(next(events))[0][1]
+    assert next(events).startswith("event: samples")
+    # a client disconnecting closes the generator, which stops predicting the remaining batches
+    events.close()
+    assert list(events) == []
+    # the partial predictions are discarded
+    assert not os.path.exists(get_run_folder(start["runId"]))
+
+
+def test_stream_inference_requires_files(client):
+    response = client.get(f"/api/stream/inference/{TEST_MODEL_CONFIG['model_name']}")
+    assert response.status_code == 400
+
+
+def test_stream_inference_rejects_bad_requests_before_streaming(client):
+    # bad requests are answered with 400 instead of a 200 event stream that aborts
+    for url in [
+        "/api/stream/inference/not_a_model.eq?sampleFilenames=test_no_labels.csv",
+        f"/api/stream/inference/{TEST_MODEL_CONFIG['model_name']}?sampleFilenames=not_a_file.csv",
+        f"/api/stream/inference/{TEST_MODEL_CONFIG['model_name']}?sampleFilenames=test_no_labels.csv&batchSize=0",
+    ]:
+        response = client.get(url)
+        assert response.status_code == 400
+        assert "error" in response.json
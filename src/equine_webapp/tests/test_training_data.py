@@ -0,0 +1,144 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.datasets import make_blobs
+
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_metadata import get_metadata_path
+from equine_webapp.data_files import get_npy_labels_path
+from equine_webapp.training_data import load_training_dataset, open_training_split, remove_training_split, write_training_split
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.tests.train_model_for_testing import EmbeddingModel, TEST_MODEL_CONFIG
+
+SHARD_NAMES = ["train_shard.csv", "train_shard.npy", "train_shard.pt"]
+
+
+def write_training_shards():
+    """Split some labelled blobs into one training shard of each supported file type"""
+    X, Y = make_blobs(n_samples=600, n_features=TEST_MODEL_CONFIG["tensor_dim"], centers=TEST_MODEL_CONFIG["num_classes"], random_state=52)
+    X_shards = np.array_split(X, len(SHARD_NAMES))
+    Y_shards = np.array_split(Y, len(SHARD_NAMES))
+
+    csv_df = pd.DataFrame(X_shards[0])
+    csv_df["labels"] = Y_shards[0]
+    csv_df.to_csv(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, SHARD_NAMES[0]), index=False)
+
+    npy_path = os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, SHARD_NAMES[1])
+    np.save(npy_path, X_shards[1])
+    np.save(get_npy_labels_path(npy_path), Y_shards[1])
+
+    torch.save(
+        torch.utils.data.TensorDataset(torch.from_numpy(X_shards[2]), torch.from_numpy(Y_shards[2])),
+        os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, SHARD_NAMES[2])
+    )
+    return X, Y
+
+
+def test_load_training_dataset():
+    X, Y = write_training_shards()
+
+    # a small chunk size so that every shard is read in several chunks
+    dataset = load_training_dataset(SHARD_NAMES, torch.float32, chunk_rows=37)
+    X_loaded, Y_loaded = dataset.tensors
+    assert X_loaded.dtype == torch.float32
+    assert X_loaded.shape == X.shape
+    assert np.allclose(X_loaded.numpy(), X, atol=1e-6)
+    assert np.array_equal(Y_loaded.numpy(), Y)
+
+
+def test_write_training_split():
+    X, Y = write_training_shards()
+    split = write_training_split(SHARD_NAMES, torch.float32, 0.2)
+    try:
+        train_X, train_Y = open_training_split(split, "train").tensors
+        validation_X, validation_Y = open_training_split(split, "validation").tensors
+        assert len(validation_Y) == int(len(Y)*0.2)
+        assert len(train_Y) + len(validation_Y) == len(Y)
+
+        # the two parts are a shuffle of every row
+        combined_X = torch.cat([train_X, validation_X]).numpy()
+        order = np.lexsort(combined_X.T)
+        assert np.allclose(combined_X[order], X[np.lexsort(X.T)], atol=1e-6)
+    finally:
+        remove_training_split(split)
+    assert not os.path.exists(split["folder"])
+
+
+def test_mutation_startTraining(client):
+    write_training_shards()
+    embed_model = torch.nn.Sequential(*list(EmbeddingModel().children())[0][:-1])
+    torch.jit.save(torch.jit.script(embed_model), os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "train_shard_embedding.jit"))
+
+    response = client.post("/graphql", json={
+        "query": """
+            mutation StartTraining($sampleFilenames: [Upload]!, $embOutDim: Int) {
+              startTraining(episodes: 5, sampleFilenames: $sampleFilenames, embedModelName: "train_shard_embedding", newModelName: "train_shard_model", trainModelType: "EquineProtonet", embOutDim: $embOutDim) {
+                success
+              }
+            }
+        """,
+        "variables": {"sampleFilenames": SHARD_NAMES, "embOutDim": TEST_MODEL_CONFIG["emb_out_dim"]},
+    })
+    model_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "train_shard_model" + SERVER_CONFIG.MODEL_EXT)
+    try:
+        assert response.json["data"]["startTraining"]["success"]
+        assert os.path.isfile(model_path)
+    finally:
+        # keep the other tests' view of the model folder unchanged
+        os.remove(model_path)
+        os.remove(get_metadata_path(model_path))
+        os.remove(os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "train_shard_embedding.jit"))
+        model_catalog.remove_model(os.path.basename(model_path))
+
+
+def test_mutation_startTrainingSweep(client):
+    write_training_shards()
+    embed_model = torch.nn.Sequential(*list(EmbeddingModel().children())[0][:-1])
+    torch.jit.save(torch.jit.script(embed_model), os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "sweep_embedding.jit"))
+
+    response = client.post("/graphql", json={
+        "query": """
+            mutation StartTrainingSweep($sampleFilenames: [Upload]!, $embOutDims: [Int!], $supportSizes: [Int!]) {
+              startTrainingSweep(sampleFilenames: $sampleFilenames, embedModelName: "sweep_embedding", newModelName: "sweep_model", trainModelTypes: ["EquineProtonet"], episodes: [3], embOutDims: $embOutDims, supportSizes: $supportSizes, maxWorkers: 2) {
+                success
+                comparisonFile
+                variants {
+                  modelName
+                  embOutDim
+                  supportSize
+                  validationAccuracy
+                }
+              }
+            }
+        """,
+        "variables": {"sampleFilenames": SHARD_NAMES, "embOutDims": [TEST_MODEL_CONFIG["emb_out_dim"]], "supportSizes": [10, 15]},
+    })
+    result = response.json["data"]["startTrainingSweep"]
+    model_paths = [os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, f"sweep_model_{idx}{SERVER_CONFIG.MODEL_EXT}") for idx in range(2)]
+    table_path = os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "sweep_model_sweep.csv")
+    try:
+        assert result["success"]
+        assert result["comparisonFile"] == "sweep_model_sweep.csv"
+        assert sorted(variant["modelName"] for variant in result["variants"]) == ["sweep_model_0", "sweep_model_1"]
+        assert sorted(variant["supportSize"] for variant in result["variants"]) == [10, 15]
+        accuracies = [variant["validationAccuracy"] for variant in result["variants"]]
+        assert accuracies == sorted(accuracies, reverse=True)
+        assert all(os.path.isfile(model_path) for model_path in model_paths)
+
+        # the comparison table has one row per variant in the same order
+        table = pd.read_csv(table_path)
+        assert table["model_name"].tolist() == [variant["modelName"] for variant in result["variants"]]
+    finally:
+        for model_path in model_paths:
+            if os.path.isfile(model_path):
+                os.remove(model_path)
+                os.remove(get_metadata_path(model_path))
+            model_catalog.remove_model(os.path.basename(model_path))
+        if os.path.isfile(table_path):
+            os.remove(table_path)
+        os.remove(os.path.join(SERVER_CONFIG.MODEL_FOLDER_PATH, "sweep_embedding.jit"))
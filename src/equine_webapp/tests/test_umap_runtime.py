@@ -0,0 +1,42 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+import subprocess
+import sys
+
+from equine_webapp.umap_runtime import make_umap
+from equine_webapp.utils import SERVER_CONFIG
+
+
+def test_make_umap_parallelism(monkeypatch):
+    monkeypatch.setattr(SERVER_CONFIG, "UMAP_N_JOBS", 4)
+    monkeypatch.setattr(SERVER_CONFIG, "UMAP_PARALLEL_MIN_SAMPLES", 100)
+
+    # small point sets stay seeded, which umap only supports on one core
+    reducer = make_umap(99, random_state=42)
+    assert reducer.n_jobs == 1
+    assert reducer.random_state == 42
+
+    # large point sets drop the seed to run in parallel
+    reducer = make_umap(100, random_state=42)
+    assert reducer.n_jobs == 4
+    assert reducer.random_state is None
+
+    reducer = make_umap(10, random_state=None)
+    assert reducer.n_jobs == 4
+
+
+def test_umap_warm_up_uses_numba_cache(tmp_path):
+    # the warm up fit fills the persistent numba cache in a fresh process
+    env = {**os.environ, "TESTING": "True", "NUMBA_CACHE_DIR": str(tmp_path)}
+    env.pop("UMAP_WARM_UP", None)
+    subprocess.run(
+        [sys.executable, "-c", "from equine_webapp.umap_runtime import warm_up_umap\nwarm_up_umap()\n"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cache_files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert any(name.endswith(".nbi") for name in cache_files)
@@ -0,0 +1,204 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import csv
+import functools
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+import equine as eq
+
+from equine_webapp.data_files import get_data_file_path
+from equine_webapp.model_catalog import model_catalog
+from equine_webapp.model_metadata import write_model_metadata
+from equine_webapp.training_data import open_training_split, remove_training_split, write_training_split
+from equine_webapp.utils import SERVER_CONFIG
+
+TRAIN_MODEL_TYPES = ["EquineProtonet", "EquineGP"]
+
+# the fraction of the training data that each sweep variant is evaluated on instead of trained on
+SWEEP_VALIDATION_FRACTION = 0.2
+
+SWEEP_TABLE_COLUMNS = [
+    "model_name",
+    "train_model_type",
+    "episodes",
+    "emb_out_dim",
+    "support_size",
+    "learning_rate",
+    "validation_accuracy",
+    "mean_validation_ood",
+    "train_seconds",
+]
+
+
+def get_embed_model_path(embed_model_name: str) -> str:
+    model_file = embed_model_name if ".jit" in embed_model_name else embed_model_name + ".jit"
+    return os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, model_file)
+
+def train_equine_model(embed_model, dataset, train_model_type, episodes, emb_out_dim=0, support_size=None, learning_rate=None):
+    """
+    Train a new EQUINE model on top of an embedding model.
+    support_size and learning_rate default to EquineProtonet's own defaults and to support_size=10, lr=0.001 for EquineGP.
+    """
+    num_classes = len(torch.unique(dataset.tensors[1]))
+    if emb_out_dim == 0: emb_out_dim = num_classes
+
+    if train_model_type == "EquineProtonet":
+        model = eq.EquineProtonet(embed_model, emb_out_dim)
+        train_kwargs = {}
+        if support_size is not None:
+            train_kwargs["support_size"] = support_size
+        if learning_rate is not None:
+            train_kwargs["opt_class"] = functools.partial(torch.optim.Adam, lr=learning_rate)
+        model.train_model(dataset, num_episodes=episodes, **train_kwargs)
+    elif train_model_type == "EquineGP":
+        model = eq.EquineGP(embed_model, emb_out_dim, num_classes)
+
+        loss_fn = torch.nn.CrossEntropyLoss()
+        optimizer = torch.optim.SGD(
+            model.parameters(),
+            lr=learning_rate if learning_rate is not None else 0.001,
+            momentum=0.9,
+            weight_decay=0.0001,
+        )
+        model.train_model(dataset, num_epochs=episodes, loss_fn=loss_fn, opt=optimizer, vis_support=True, support_size=support_size if support_size is not None else 10)
+    else:
+        raise ValueError(f"Given train_model_type '{train_model_type}' is not valid.")
+    return model
+
+def get_trained_model_path(model_name: str) -> str:
+    return os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, model_name+SERVER_CONFIG.MODEL_EXT)
+
+def save_trained_model(model, model_save_path: str) -> str:
+    # an uploaded model is a hard link into the content store, so replace the link instead of writing through it
+    if os.path.lexists(model_save_path):
+        os.remove(model_save_path)
+    model.save(model_save_path)
+    write_model_metadata(model_save_path)
+    return model_save_path
+
+
+def init_sweep_worker(num_threads: int):
+    # cap each worker's torch threads so that the workers don't oversubscribe the cores
+    torch.set_num_threads(num_threads)
+
+def train_sweep_variant(variant: dict, split: dict, embed_model_path: str, model_save_path: str) -> dict:
+    """
+    Train, evaluate, and save one sweep variant. Runs in a worker process, so every path is
+    resolved by the server rather than by the worker's own SERVER_CONFIG.
+    The variants share the train and validation memory maps of one split (see training_data.write_training_split)
+    """
+    embed_model = torch.jit.load(embed_model_path)
+    train_dataset = open_training_split(split, "train")
+    X_validation, Y_validation = open_training_split(split, "validation").tensors
+    if variant["emb_out_dim"] == 0: # report the embedding size that is actually trained
+        variant = {**variant, "emb_out_dim": split["num_classes"]}
+
+    start_time = time.time()
+    model = train_equine_model(
+        embed_model,
+        train_dataset,
+        variant["train_model_type"],
+        variant["episodes"],
+        emb_out_dim=variant["emb_out_dim"],
+        support_size=variant["support_size"],
+        learning_rate=variant["learning_rate"],
+    )
+    train_seconds = time.time() - start_time
+
+    # predict the validation rows a chunk at a time, so that they are never all in memory
+    num_correct = 0
+    ood_sum = 0.0
+    with torch.no_grad():
+        for start in range(0, len(Y_validation), SERVER_CONFIG.TRAIN_CHUNK_ROWS):
+            predictions = model.predict(X_validation[start:start + SERVER_CONFIG.TRAIN_CHUNK_ROWS])
+            num_correct += (predictions.classes.argmax(dim=1) == Y_validation[start:start + SERVER_CONFIG.TRAIN_CHUNK_ROWS]).sum().item()
+            ood_sum += predictions.ood_scores.double().sum().item()
+    save_trained_model(model, model_save_path)
+
+    return {
+        **variant,
+        "validation_accuracy": num_correct/len(Y_validation),
+        "mean_validation_ood": ood_sum/len(Y_validation),
+        "train_seconds": train_seconds,
+    }
+
+def get_sweep_variants(new_model_name, train_model_types, episodes, emb_out_dims, support_sizes, learning_rates):
+    """Expand the grid of settings into one variant per combination"""
+    for train_model_type in train_model_types:
+        if train_model_type not in TRAIN_MODEL_TYPES:
+            raise ValueError(f"Given train_model_type '{train_model_type}' is not valid.")
+    grid = itertools.product(train_model_types, episodes, emb_out_dims, support_sizes, learning_rates)
+    return [{
+        "model_name": f"{new_model_name}_{variant_idx}",
+        "train_model_type": train_model_type,
+        "episodes": num_episodes,
+        "emb_out_dim": emb_out_dim,
+        "support_size": support_size,
+        "learning_rate": learning_rate,
+    } for variant_idx, (train_model_type, num_episodes, emb_out_dim, support_size, learning_rate) in enumerate(grid)]
+
+def train_sweep(
+    sample_filenames,
+    embed_model_name: str,
+    new_model_name: str,
+    train_model_types,
+    episodes,
+    emb_out_dims=(0,),
+    support_sizes=(None,),
+    learning_rates=(None,),
+    max_workers: int = None,
+):
+    """
+    Train every combination of the given settings in a process pool and save each variant as
+    {new_model_name}_{idx}.eq, plus a comparison table {new_model_name}_sweep.csv sorted by validation accuracy
+    """
+    variants = get_sweep_variants(new_model_name, train_model_types, episodes, emb_out_dims, support_sizes, learning_rates)
+    if len(variants) == 0:
+        raise ValueError("The sweep has no variants to train")
+
+    sample_paths = [get_data_file_path(filename) for filename in sample_filenames]
+    embed_model_path = get_embed_model_path(embed_model_name)
+    input_dtype = next(torch.jit.load(embed_model_path).parameters()).dtype
+    max_workers = max_workers if max_workers is not None else SERVER_CONFIG.SWEEP_MAX_WORKERS
+    num_workers = max(1, min(max_workers, len(variants)))
+    num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+
+    # hold out the same validation split for every variant so that they can be compared,
+    # and write it once for all the workers instead of each worker converting the training data
+    split = write_training_split(sample_paths, input_dtype, SWEEP_VALIDATION_FRACTION)
+    try:
+        # spawn fresh interpreters rather than forking the server, which has torch and server threads running
+        with ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_sweep_worker,
+            initargs=(num_threads,),
+        ) as executor:
+            futures = [executor.submit(
+                train_sweep_variant,
+                variant,
+                split,
+                embed_model_path,
+                get_trained_model_path(variant["model_name"])
+            ) for variant in variants]
+            results = [future.result() for future in futures]
+    finally:
+        remove_training_split(split)
+
+    for result in results:
+        model_catalog.upsert_model(get_trained_model_path(result["model_name"]))
+
+    results.sort(key=lambda result: result["validation_accuracy"], reverse=True)
+    table_path = os.path.join(os.getcwd(), SERVER_CONFIG.MODEL_FOLDER_PATH, f"{new_model_name}_sweep.csv")
+    with open(table_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    return results, table_path
@@ -0,0 +1,98 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+import torch
+from torch.utils.data import TensorDataset
+
+from equine_webapp.data_files import check_row_shapes, read_data_file_header, read_data_file_into
+from equine_webapp.utils import SERVER_CONFIG
+
+
+def get_numpy_dtype(dtype: torch.dtype) -> np.dtype:
+    try:
+        return torch.empty(0, dtype=dtype).numpy().dtype
+    except TypeError: # ex bfloat16 has no numpy equivalent
+        raise ValueError(f"Training data can't be stored as {dtype}")
+
+def load_training_dataset(filename_list, input_dtype: torch.dtype, chunk_rows: int = None) -> TensorDataset:
+    """
+    Combine training shards (.csv with a labels column, .npy with a .labels.npy file, or a saved TensorDataset .pt)
+    into one TensorDataset without holding every file in memory.
+    The samples are converted to input_dtype one chunk at a time and written into a disk backed memory map,
+    so memory use is bounded by the chunk size rather than the size of the training data.
+    The labels (one integer per row) are kept in memory.
+    """
+    # first pass: size the memory map
+    headers = [read_data_file_header(filename, is_train=True) for filename in filename_list]
+    row_shape = check_row_shapes(filename_list, headers)
+    num_rows = sum(header["num_rows"] for header in headers)
+
+    # the temporary file is already unlinked, so its space is freed as soon as the dataset is garbage collected
+    Path(SERVER_CONFIG.TRAIN_CACHE_PATH).mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryFile(dir=SERVER_CONFIG.TRAIN_CACHE_PATH) as f:
+        X = np.memmap(f, dtype=get_numpy_dtype(input_dtype), mode="w+", shape=(num_rows, *row_shape))
+    X_tensor = torch.from_numpy(X)
+    Y = torch.empty(num_rows, dtype=torch.int64)
+
+    # second pass: convert and copy one chunk at a time
+    start_row = 0
+    for header in headers:
+        end_row = start_row + header["num_rows"]
+        read_data_file_into(header, X_tensor[start_row:end_row], Y[start_row:end_row], chunk_rows)
+        start_row = end_row
+    X.flush()
+
+    return TensorDataset(X_tensor, Y)
+
+def write_training_split(filename_list, input_dtype: torch.dtype, validation_fraction: float, seed: int = 0) -> dict:
+    """
+    Shuffle the training data once and write its train and validation rows into memory map files in a new folder
+    of TRAIN_CACHE_PATH, so that several processes can train on them without each holding or converting its own copy.
+    The rows are gathered TRAIN_CHUNK_ROWS at a time. Delete the files with remove_training_split.
+    """
+    dataset = load_training_dataset(filename_list, input_dtype)
+    X, Y = dataset.tensors
+    permutation = torch.randperm(len(Y), generator=torch.Generator().manual_seed(seed))
+    num_validation = int(len(Y)*validation_fraction)
+    if num_validation == 0 or num_validation == len(Y):
+        raise ValueError(f"The training data has too few rows ({len(Y)}) to hold out a validation split")
+
+    split = {
+        "folder": tempfile.mkdtemp(dir=SERVER_CONFIG.TRAIN_CACHE_PATH),
+        "row_shape": tuple(X.shape[1:]),
+        "dtype": get_numpy_dtype(input_dtype).str,
+        "num_classes": len(torch.unique(Y)),
+    }
+    for split_name, idxs in [("validation", permutation[:num_validation]), ("train", permutation[num_validation:])]:
+        X_path = os.path.join(split["folder"], f"{split_name}_samples.dat")
+        Y_path = os.path.join(split["folder"], f"{split_name}_labels.dat")
+        X_split = np.memmap(X_path, dtype=split["dtype"], mode="w+", shape=(len(idxs), *split["row_shape"]))
+        Y_split = np.memmap(Y_path, dtype=np.int64, mode="w+", shape=(len(idxs),))
+        for start in range(0, len(idxs), SERVER_CONFIG.TRAIN_CHUNK_ROWS):
+            chunk_idxs = idxs[start:start + SERVER_CONFIG.TRAIN_CHUNK_ROWS]
+            X_split[start:start + len(chunk_idxs)] = X[chunk_idxs].numpy()
+            Y_split[start:start + len(chunk_idxs)] = Y[chunk_idxs].numpy()
+        X_split.flush()
+        Y_split.flush()
+        split[split_name] = {"samples_path": X_path, "labels_path": Y_path, "num_rows": len(idxs)}
+    return split
+
+def open_training_split(split: dict, split_name: str) -> TensorDataset:
+    """Memory map one part ("train" or "validation") of a split from write_training_split, read-only"""
+    part = split[split_name]
+    X = np.memmap(part["samples_path"], dtype=split["dtype"], mode="r", shape=(part["num_rows"], *split["row_shape"]))
+    Y = np.memmap(part["labels_path"], dtype=np.int64, mode="r", shape=(part["num_rows"],))
+    with warnings.catch_warnings():
+        # torch warns that the arrays aren't writable, but training only reads them
+        warnings.simplefilter("ignore", UserWarning)
+        return TensorDataset(torch.from_numpy(X), torch.from_numpy(Y))
+
+def remove_training_split(split: dict):
+    shutil.rmtree(split["folder"], ignore_errors=True)
@@ -0,0 +1,49 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from equine_webapp.utils import SERVER_CONFIG
+
+
+def configure_numba_cache():
+    """
+    Point numba's on-disk JIT cache at a persistent folder.
+    numba reads NUMBA_CACHE_DIR when it is imported, so this must run before umap is imported.
+    """
+    os.environ.setdefault("NUMBA_CACHE_DIR", SERVER_CONFIG.NUMBA_CACHE_DIR)
+    Path(os.environ["NUMBA_CACHE_DIR"]).mkdir(parents=True, exist_ok=True)
+
+def import_umap():
+    configure_numba_cache()
+    import umap
+    return umap
+
+def get_umap_n_jobs(num_samples: int, random_state: Optional[int]) -> int:
+    """
+    umap overrides n_jobs to 1 whenever random_state is set, so only large point sets,
+    which are run without a seed, can use more than one core
+    """
+    if random_state is None or num_samples >= SERVER_CONFIG.UMAP_PARALLEL_MIN_SAMPLES:
+        return SERVER_CONFIG.UMAP_N_JOBS
+    return 1
+
+def make_umap(num_samples: int, random_state: Optional[int] = None, **kwargs):
+    """Build a UMAP reducer for num_samples points with the server's parallelism settings"""
+    umap = import_umap()
+    n_jobs = get_umap_n_jobs(num_samples, random_state)
+    return umap.UMAP(random_state=random_state if n_jobs == 1 else None, n_jobs=n_jobs, **kwargs)
+
+def warm_up_umap():
+    """Compile UMAP's numba functions with a small fit so that the first request doesn't pay for it"""
+    start_time = time.time()
+    data = np.random.default_rng(0).normal(size=(64, 8))
+    # cover the code paths used by dimensionalityReduction (densMAP) and projectSupportLayout (transform)
+    make_umap(len(data), random_state=42, densmap=True, n_neighbors=5).fit_transform(data)
+    make_umap(len(data), random_state=None, n_neighbors=5).fit(data).transform(data[:4])
+    print(f"UMAP warm up finished in {time.time() - start_time:.2f}s")
@@ -1,96 +1,162 @@
 # Copyright (c) 2026 Massachusetts Institute of Technology
 # SPDX-License-Identifier: MIT
 
+import json
 import os
 import sys
+import tempfile
+import threading
+import time
 
+import numpy as np
 import torch
-from torch.utils.data import TensorDataset
-import equine as eq
 from pathlib import Path
 from typing import Optional
 
+from equine_webapp.model_loading import load_equine_model
 from equine_webapp.model_manager import model_manager
 
 class Config:
     MODEL_EXT: str = ".eq"
     OUTPUT_FOLDER: str
     SCHEMA_PATH: str
+    WARM_UP: bool
+    INFERENCE_MAX_BATCH_SIZE: int
+    INFERENCE_MAX_DELAY_MS: float
+    INFERENCE_PROFILE: str
+    INFERENCE_NUM_THREADS: Optional[int]
+    INFERENCE_ENGINE: str
+    CATALOG_POLL_SECONDS: float
+    UMAP_N_JOBS: int
+    UMAP_PARALLEL_MIN_SAMPLES: int
+    UMAP_WARM_UP: bool
+    NUMBA_CACHE_DIR: str
+    DR_LANDMARK_THRESHOLD: int
+    DR_NUM_LANDMARKS: int
+    DR_METRIC_SAMPLE_SIZE: int
+    SUPPORT_PROJECTION_CACHE_SIZE: int
+    TRAIN_CHUNK_ROWS: int
+    DATA_LOAD_MAX_WORKERS: int
+    SWEEP_MAX_WORKERS: int
+    PORT: int
+    INFERENCE_MAX_CONCURRENT: int
+    DR_MAX_CONCURRENT: int
+    TRAINING_MAX_CONCURRENT: int
+    MODEL_MAX_CONCURRENT: int
+    MODEL_CONCURRENCY_LIMITS: dict
+    ADMISSION_MAX_QUEUED: int
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float
+    SERVER_THREADS: Optional[int]
+    TORCH_NUM_THREADS: Optional[int]
+    TORCH_NUM_INTEROP_THREADS: Optional[int]
+    SERVER_PROFILE_CALIBRATE: bool
+    SERVER_PROFILE_CALIBRATION_MODEL: Optional[str]
 
     def __init__(self):
         dir_path = os.path.dirname(os.path.realpath(__file__))
         self.SCHEMA_PATH = os.path.join(dir_path, "graphql/types")
+        # load the dimensionality reduction and imaging modules in a background thread at startup
+        self.WARM_UP = os.environ.get('WARM_UP', 'False').lower() in ['true', '1', 't']
+        # the port that equine_webapp.main serves on
+        self.PORT = int(os.environ.get('PORT', 8080))
+        # concurrent runInference calls on the same model are coalesced into batches of up to
+        # INFERENCE_MAX_BATCH_SIZE rows, waiting at most INFERENCE_MAX_DELAY_MS for more calls to arrive
+        self.INFERENCE_MAX_BATCH_SIZE = int(os.environ.get('INFERENCE_MAX_BATCH_SIZE', 4096))
+        self.INFERENCE_MAX_DELAY_MS = float(os.environ.get('INFERENCE_MAX_DELAY_MS', 5))
+        # the default inference profile (see equine_webapp.inference_profiles)
+        self.INFERENCE_PROFILE = os.environ.get('INFERENCE_PROFILE', 'default')
+        # the torch intra-op threads that inference runs with. this is set once at startup as the server profile's
+        # torch threads, and TORCH_NUM_THREADS takes precedence over it
+        self.INFERENCE_NUM_THREADS = int(os.environ['INFERENCE_NUM_THREADS']) if 'INFERENCE_NUM_THREADS' in os.environ else None
+        # the default inference engine (see equine_webapp.inference_engines)
+        self.INFERENCE_ENGINE = os.environ.get('INFERENCE_ENGINE', 'eager')
+        # how often the model catalog watcher rescans the model folder (0 disables the watcher)
+        self.CATALOG_POLL_SECONDS = float(os.environ.get('CATALOG_POLL_SECONDS', 30))
+        # UMAP runs on UMAP_N_JOBS cores (-1 for all cores) for point sets of at least UMAP_PARALLEL_MIN_SAMPLES points.
+        # umap can only run seeded on one core, so these runs are not reproducible. smaller point sets stay seeded
+        self.UMAP_N_JOBS = int(os.environ.get('UMAP_N_JOBS', -1))
+        self.UMAP_PARALLEL_MIN_SAMPLES = int(os.environ.get('UMAP_PARALLEL_MIN_SAMPLES', 2000))
+        # compile UMAP's numba functions with a small fit in the warm up thread (see equine_webapp.umap_runtime)
+        self.UMAP_WARM_UP = os.environ.get('UMAP_WARM_UP', 'False').lower() in ['true', '1', 't']
+        # t-SNE and MDS requests with more than DR_LANDMARK_THRESHOLD points are fit on DR_NUM_LANDMARKS landmarks,
+        # and the quality metrics are computed on at most DR_METRIC_SAMPLE_SIZE points (see equine_webapp.dr_approximation)
+        self.DR_LANDMARK_THRESHOLD = int(os.environ.get('DR_LANDMARK_THRESHOLD', 1000))
+        self.DR_NUM_LANDMARKS = int(os.environ.get('DR_NUM_LANDMARKS', 500))
+        self.DR_METRIC_SAMPLE_SIZE = int(os.environ.get('DR_METRIC_SAMPLE_SIZE', 1000))
+        # the fitted support layouts that are cached per model (see equine_webapp.support_projection)
+        self.SUPPORT_PROJECTION_CACHE_SIZE = int(os.environ.get('SUPPORT_PROJECTION_CACHE_SIZE', 16))
+        # sample and training data files are read and converted this many rows at a time (see equine_webapp.data_files)
+        self.TRAIN_CHUNK_ROWS = int(os.environ.get('TRAIN_CHUNK_ROWS', 65536))
+        # the number of sample files that data_files.combine_data_files reads at once, at most one per core
+        self.DATA_LOAD_MAX_WORKERS = int(os.environ.get('DATA_LOAD_MAX_WORKERS', 8))
+        # the number of processes that train sweep variants at once (see equine_webapp.training)
+        self.SWEEP_MAX_WORKERS = int(os.environ.get('SWEEP_MAX_WORKERS', os.cpu_count() or 1))
+        # at most this many inference, dimensionality reduction, and training computations run at once (0 for no limit).
+        # MODEL_MAX_CONCURRENT limits the computations on any one model, and MODEL_CONCURRENCY_LIMITS overrides it
+        # per model file as JSON, ex {"big_model.eq": 1} (see equine_webapp.admission)
+        self.INFERENCE_MAX_CONCURRENT = int(os.environ.get('INFERENCE_MAX_CONCURRENT', 8))
+        self.DR_MAX_CONCURRENT = int(os.environ.get('DR_MAX_CONCURRENT', 2))
+        self.TRAINING_MAX_CONCURRENT = int(os.environ.get('TRAINING_MAX_CONCURRENT', 1))
+        self.MODEL_MAX_CONCURRENT = int(os.environ.get('MODEL_MAX_CONCURRENT', 0))
+        self.MODEL_CONCURRENCY_LIMITS = json.loads(os.environ.get('MODEL_CONCURRENCY_LIMITS', '{}'))
+        # requests past a limit wait in a queue of at most ADMISSION_MAX_QUEUED requests for at most ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        # and are rejected with 429 Too Many Requests when the queue is full or the wait times out
+        self.ADMISSION_MAX_QUEUED = int(os.environ.get('ADMISSION_MAX_QUEUED', 32))
+        self.ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_SECONDS', 30))
+        # the waitress threads and torch intra/inter-op threads of the server (see equine_webapp.server_profile).
+        # unset values are balanced against the number of cores, or calibrated on a model with SERVER_PROFILE_CALIBRATE
+        self.SERVER_THREADS = int(os.environ['SERVER_THREADS']) if 'SERVER_THREADS' in os.environ else None
+        self.TORCH_NUM_THREADS = int(os.environ['TORCH_NUM_THREADS']) if 'TORCH_NUM_THREADS' in os.environ else None
+        self.TORCH_NUM_INTEROP_THREADS = int(os.environ['TORCH_NUM_INTEROP_THREADS']) if 'TORCH_NUM_INTEROP_THREADS' in os.environ else None
+        self.SERVER_PROFILE_CALIBRATE = os.environ.get('SERVER_PROFILE_CALIBRATE', 'False').lower() in ['true', '1', 't']
+        self.SERVER_PROFILE_CALIBRATION_MODEL = os.environ.get('SERVER_PROFILE_CALIBRATION_MODEL')
         if os.environ.get('TESTING') == "True":
             self.OUTPUT_FOLDER = os.path.join(dir_path, "tests/temp")
         else:
             self.OUTPUT_FOLDER = os.path.join(dir_path, "webapp-output")
+        # numba's on-disk JIT cache persists across restarts so that UMAP is only compiled once
+        self.NUMBA_CACHE_DIR = os.environ.get('NUMBA_CACHE_DIR', os.path.join(self.OUTPUT_FOLDER, "numba_cache"))
             
         self.MODEL_FOLDER_PATH = os.path.join(self.OUTPUT_FOLDER, "models/") #pylint: disable=no-member
         self.UPLOAD_FOLDER_PATH = os.path.join(self.OUTPUT_FOLDER, "uploads/") #pylint: disable=no-member
+        self.TRAIN_CACHE_PATH = os.path.join(self.OUTPUT_FOLDER, "train_cache/") #pylint: disable=no-member
+        # uploaded files are stored once per distinct content, and linked into the upload and model folders (see equine_webapp.content_store)
+        self.CONTENT_STORE_PATH = os.path.join(self.OUTPUT_FOLDER, "content_store/") #pylint: disable=no-member
+        # compiled inference engines are cached by the SHA-256 of the model they were exported from (see equine_webapp.inference_engines)
+        self.ENGINE_CACHE_PATH = os.path.join(self.OUTPUT_FOLDER, "engine_cache/") #pylint: disable=no-member
         Path(self.MODEL_FOLDER_PATH).mkdir(parents=True, exist_ok=True)
         Path(self.UPLOAD_FOLDER_PATH).mkdir(parents=True, exist_ok=True)
 
 SERVER_CONFIG = Config()
 
+def get_file_offsets(filenames):
+    """Compress the filename of every row into [[filename, first row], ...], one entry per consecutive file"""
+    file_offsets = []
+    for row, filename in enumerate(filenames):
+        if len(file_offsets) == 0 or file_offsets[-1][0] != filename:
+            file_offsets.append([filename, row])
+    return file_offsets
+
+
 class SampleDataset:
-    def __init__(self, tensor_dataset, filenames, column_headers):
+    def __init__(self, tensor_dataset, file_offsets, column_headers):
         self.dataset = tensor_dataset
-        self.filenames = filenames
+        # [[filename, first row], ...] for each file, in the order that their rows were combined
+        self.file_offsets = file_offsets
         self.column_headers = column_headers
 
+    def __setstate__(self, state):
+        # runs saved before file offsets have the filename of every row instead
+        if "filenames" in state:
+            state["file_offsets"] = get_file_offsets(state.pop("filenames"))
+        self.__dict__.update(state)
 
-def combine_data_files(filename_list, is_train=False):
-    dataset_list = []
-    dataset_filenames = []
-    column_headers = []
-
-    for filename in filename_list:
-        file_path = os.path.join(os.getcwd(), SERVER_CONFIG.UPLOAD_FOLDER_PATH, filename)
-        if not os.path.isfile(file_path):
-            raise ValueError(f"Data File '{file_path}' not found")
-        
-        file_ext = os.path.splitext(filename)[1]
-        if file_ext == ".csv":
-            dataframe = pd.read_csv(file_path)
-            if is_train:
-                data_labels = dataframe["labels"].to_numpy()
-                dataframe = dataframe.drop(["labels"], axis=1)
-                torch_labels = torch.from_numpy(data_labels)
-            
-            data_array = dataframe.to_numpy()
-            torch_data = torch.from_numpy(data_array)
-            if is_train:
-                tensor_dataset = TensorDataset(torch_data, torch_labels)
-            else:
-                tensor_dataset = TensorDataset(torch_data)
-
-            column_headers = dataframe.columns
-            
-        elif file_ext == ".pt":
-            data = torch.load(file_path)
-            if isinstance(data, TensorDataset):
-                tensor_dataset = data
-            elif isinstance(data, torch.Tensor): # this is a Tensor
-                tensor_dataset = TensorDataset(data) # convert this to a TensorDataset
-            else:
-                raise ValueError(f"We do not support data type {type(data)}. Please package your data as a Tensor or TensorDataset")
-        else:
-            raise ValueError(f"Given file '{filename} has unsupported file type '{file_ext}'")
-        dataset_filenames += [filename]*len(tensor_dataset.tensors[0])
-        dataset_list.append(tensor_dataset)
-
-    dataset = torch.concat([data.tensors[0] for data in dataset_list], dim=0)
-    
-    if is_train:
-        dataset_labels = torch.concat([data[1] for data in dataset_list], dim=0)
-        tensor_dataset = TensorDataset(dataset, dataset_labels) #TODO Typechecking?
-    else:
-        tensor_dataset = TensorDataset(dataset) #TODO Typechecking?
-
-    if len(column_headers) == 0:
-        column_headers = [x for x in range(0, tensor_dataset.tensors[0].shape[1])]
-    
-    return SampleDataset(tensor_dataset, dataset_filenames, column_headers)
+    def get_filenames(self, start_index: int, end_index: int) -> list:
+        """The filename of each row from start_index up to end_index"""
+        file_names = [filename for filename, _ in self.file_offsets]
+        file_starts = np.array([start for _, start in self.file_offsets], dtype=np.int64)
+        file_idxs = np.searchsorted(file_starts, np.arange(start_index, end_index), side="right") - 1
+        return [file_names[file_idx] for file_idx in file_idxs]
 
 
 def get_support_example_from_data_index(model_name, data_index):
@@ -100,20 +166,28 @@ def get_support_example_from_data_index(model_name, data_index):
     model_path = get_model_path(model_name)
     model = model_manager.get_model(
         model_path,
-        eq.load_equine_model
+        load_equine_model
     )
     support = model.get_support()
     feature_names = model.get_feature_names()
 
+    class_idx, support_idx = get_support_position_from_data_index(support, data_index)
+
+    # inverse transform support[class_idx][support_idx] if necessary here
+    return support[class_idx][support_idx], support, feature_names
+
+def get_support_position_from_data_index(support, data_index:int):
+    """Convert a flat support example data index into its (class index, support index) position"""
+    data_index = int(data_index)
+    assert data_index >= 0
+
     num_classes = len(support)
     num_support_per_class = support[0].shape[0]
     assert num_classes*num_support_per_class > data_index
 
     support_idx = data_index % num_support_per_class
     class_idx = int(data_index / num_support_per_class)
-
-    # inverse transform support[class_idx][support_idx] if necessary here
-    return support[class_idx][support_idx], support, feature_names
+    return class_idx, support_idx
 
 def get_sample_from_data_index(run_id, data_index, model_name:Optional[str]=None):
     data_index = int(data_index)
@@ -124,16 +198,53 @@ def get_sample_from_data_index(run_id, data_index, model_name:Optional[str]=None
         model_path = get_model_path(model_name)
         model = model_manager.get_model(
             model_path,
-            eq.load_equine_model
+            load_equine_model
         )
         feature_names = model.get_feature_names()
 
-    run_id = int(run_id)
-    sample_dataset = torch.load(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, f"{run_id}_run_data.pt"))
+    sample_dataset = load_run_dataset(run_id)
     assert len(sample_dataset.dataset) > data_index
     
     return sample_dataset.dataset[data_index][0], sample_dataset, feature_names
 
+_run_id_lock = threading.Lock()
+_last_run_id = 0
+
+def new_run_id() -> int:
+    """A run ID from the current time in seconds, bumped so that runs started in the same second don't share an ID"""
+    global _last_run_id
+    with _run_id_lock:
+        _last_run_id = max(int(time.time()), _last_run_id + 1)
+        return _last_run_id
+
+def save_run_dataset(run_id, sample_dataset):
+    """Write the run data to a temporary file and rename it, so that concurrent requests never read a partial file"""
+    run_id = int(run_id)
+    fd, temp_path = tempfile.mkstemp(dir=SERVER_CONFIG.UPLOAD_FOLDER_PATH, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        torch.save(sample_dataset, f)
+    os.replace(temp_path, os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, f"{run_id}_run_data.pt"))
+
+def load_run_dataset(run_id):
+    run_id = int(run_id)
+    return torch.load(os.path.join(SERVER_CONFIG.UPLOAD_FOLDER_PATH, f"{run_id}_run_data.pt"))
+
+def get_data_indices(num_rows, data_indices=None, start_index=None, end_index=None):
+    """
+    Combine an explicit list of data indices and/or a [start_index, end_index) range into one list of data indices.
+    The range is checked against the num_rows that can be indexed before it is expanded
+    """
+    indices = list(data_indices) if data_indices is not None else []
+    if start_index is not None or end_index is not None:
+        if start_index is None or end_index is None:
+            raise ValueError("Both startIndex and endIndex are required to request a range of data indices")
+        if start_index < 0 or end_index < start_index or end_index > num_rows:
+            raise ValueError(f"Invalid data index range [{start_index}, {end_index}) for {num_rows} rows")
+        indices += list(range(start_index, end_index))
+    if len(indices) == 0:
+        raise ValueError("No data indices were requested")
+    return indices
+
 def get_model_path(model_name:str):
     model_file = model_name if SERVER_CONFIG.MODEL_EXT in model_name else model_name + SERVER_CONFIG.MODEL_EXT
     # we want to allow files from where the user is running equine-webapp (i.e. os.getcwd())
@@ -0,0 +1,36 @@
+# Copyright (c) 2026 Massachusetts Institute of Technology
+# SPDX-License-Identifier: MIT
+
+import importlib
+import threading
+import time
+
+from equine_webapp.utils import SERVER_CONFIG
+from equine_webapp.umap_runtime import configure_numba_cache, warm_up_umap
+
+# heavy modules that the server only needs for dimensionality reduction and rendering images
+# torch is listed first because it must be imported before zadu (which imports faiss)
+WARM_UP_MODULES = [
+    "torch",
+    "sklearn.decomposition",
+    "sklearn.manifold",
+    "umap",
+    "zadu.zadu",
+    "torchvision.transforms",
+]
+
+def warm_up_imports():
+    """Import the lazily loaded modules so that the first request that needs them doesn't pay the import time"""
+    start_time = time.time()
+    configure_numba_cache() # before umap imports numba
+    for module_name in WARM_UP_MODULES:
+        importlib.import_module(module_name)
+    print(f"Warm up finished in {time.time() - start_time:.2f}s")
+    if SERVER_CONFIG.UMAP_WARM_UP:
+        warm_up_umap()
+
+def start_warm_up_thread() -> threading.Thread:
+    """Run warm_up_imports in a daemon thread so that the server can start answering requests immediately"""
+    thread = threading.Thread(target=warm_up_imports, name="equine-webapp-warm-up", daemon=True)
+    thread.start()
+    return thread